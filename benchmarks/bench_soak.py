@@ -0,0 +1,189 @@
+"""
+Soak / fault-injection load test for ``ModbusTCPResiliente``.
+
+Starts a local ``ModbusSimulator`` with N devices, each following a
+deterministic fault script chosen by ``device index % 5``:
+
+- ``ok``:        no faults
+- ``outage``:    listener down between 20% and 40% of the run
+- ``slow``:      replies delayed by ``--slow-delay`` between 20% and 60%
+- ``half_open``: requests silently discarded between 30% and 40%
+- ``illegal``:   addresses 900..999 answer Illegal Data Address (whole run)
+
+Worker threads poll every device once per ``--interval`` seconds and the run
+reports, per fault class:
+
+- recovery time: first successful read after the fault window ends;
+- request amplification: requests seen by the devices (pings included) per
+  read issued by the load generator, plus extra pings and reconnects;
+- memory stability: traced memory and ``fleet_memory_usage`` sampled during
+  the run, comparing the first and last samples after warm-up.
+
+With ``--profile RATE`` every client samples that fraction of its calls and
+the run ends with the ``format_profile`` report (costliest devices and
+operations, time split by phase).
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_soak.py --devices 2000 --duration 120
+"""
+
+import argparse
+import logging
+import threading
+import time
+import tracemalloc
+
+from pyModbusTCPtools import ModbusTCPResiliente, fleet_memory_usage, fleet_profile, format_profile
+from pyModbusTCPtools.simulator import Fault, ModbusSimulator
+
+KINDS = ("ok", "outage", "slow", "half_open", "illegal")
+ILLEGAL_RANGE = (900, 1000)
+
+
+def fault_script(kind: str, duration: float, slow_delay: float):
+    """Roteiro de falhas (e fim da janela de falha) para uma classe."""
+    if kind == "outage":
+        return [Fault("outage", 0.2 * duration, 0.4 * duration)], 0.4 * duration
+    if kind == "slow":
+        return [Fault("slow", 0.2 * duration, 0.6 * duration, delay=slow_delay)], 0.6 * duration
+    if kind == "half_open":
+        return [Fault("half_open", 0.3 * duration, 0.4 * duration)], 0.4 * duration
+    if kind == "illegal":
+        return [Fault("illegal_address", 0.0, duration, addr_range=ILLEGAL_RANGE)], None
+    return [], None
+
+
+class DeviceRun:
+    __slots__ = ("kind", "device", "client", "fault_end", "reads", "ok", "recovered_at")
+
+    def __init__(self, kind, device, client, fault_end):
+        self.kind = kind
+        self.device = device
+        self.client = client
+        self.fault_end = fault_end
+        self.reads = 0
+        self.ok = 0
+        self.recovered_at = None
+
+
+def worker(runs, sim, duration, interval, stop):
+    while not stop.is_set():
+        cycle = time.monotonic()
+        for run in runs:
+            if stop.is_set() or sim.elapsed() >= duration:
+                return
+            data = run.client.read_holding_registers_safe(10, 10)
+            run.reads += 1
+            if data is not None:
+                run.ok += 1
+                elapsed = sim.elapsed()
+                if run.fault_end is not None and run.recovered_at is None and elapsed >= run.fault_end:
+                    run.recovered_at = elapsed
+            if run.kind == "illegal":
+                run.client.read_holding_registers_safe(950, 1)
+                run.reads += 1
+        stop.wait(max(0.0, interval - (time.monotonic() - cycle)))
+
+
+def percentile(values, p):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--devices", type=int, default=500)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--interval", type=float, default=1.0)
+    parser.add_argument("--workers", type=int, default=32)
+    parser.add_argument("--timeout", type=float, default=0.5)
+    parser.add_argument("--slow-delay", type=float, default=0.2)
+    parser.add_argument("--retry-delay", type=float, default=0.2)
+    parser.add_argument("--max-retry-delay", type=float, default=2.0)
+    parser.add_argument("--backend", default="pymodbustcp")
+    parser.add_argument("--sample", type=float, default=5.0, help="período de amostragem de memória (s)")
+    parser.add_argument("--profile", type=float, default=None, help="fração de chamadas perfiladas (ex.: 0.05)")
+    args = parser.parse_args()
+
+    logging.getLogger("ModbusTCP").addHandler(logging.NullHandler())
+    tracemalloc.start()
+
+    sim = ModbusSimulator()
+    runs = []
+    for i in range(args.devices):
+        kind = KINDS[i % len(KINDS)]
+        faults, fault_end = fault_script(kind, args.duration, args.slow_delay)
+        device = sim.add_device(faults=faults)
+        client = ModbusTCPResiliente(
+            host=device.host, port=device.port, timeout=args.timeout,
+            retry_delay=args.retry_delay, max_retry_delay=args.max_retry_delay,
+            log_file=None, lightweight=True, backend=args.backend,
+            profile_sample_rate=args.profile,
+        )
+        runs.append(DeviceRun(kind, device, client, fault_end))
+    clients = [r.client for r in runs]
+
+    stop = threading.Event()
+    threads = [
+        threading.Thread(target=worker, args=(runs[i::args.workers], sim, args.duration, args.interval, stop))
+        for i in range(args.workers)
+    ]
+    sim.start()
+    for t in threads:
+        t.start()
+
+    samples = []
+    try:
+        while sim.elapsed() < args.duration:
+            time.sleep(min(args.sample, max(0.0, args.duration - sim.elapsed())))
+            traced, _ = tracemalloc.get_traced_memory()
+            samples.append((sim.elapsed(), traced, fleet_memory_usage(clients, top=0)["total"]))
+    finally:
+        stop.set()
+        for t in threads:
+            t.join()
+        for client in clients:
+            client.close()
+        sim.stop()
+
+    print(f"devices={args.devices} duration={args.duration}s backend={args.backend} workers={args.workers}")
+    header = f"{'class':<10}{'reads':>8}{'ok %':>7}{'reqs/read':>10}{'pings':>8}{'reconn':>8}{'rec p50':>9}{'rec max':>9}{'unrec':>7}"
+    print(header)
+    print("-" * len(header))
+    for kind in KINDS:
+        group = [r for r in runs if r.kind == kind]
+        if not group:
+            continue
+        reads = sum(r.reads for r in group)
+        ok = sum(r.ok for r in group)
+        requests = sum(r.device.stats.requests for r in group)
+        pings = sum(r.device.stats.pings for r in group)
+        reconnects = sum(max(0, r.device.stats.connections - 1) for r in group)
+        recovery = [r.recovered_at - r.fault_end for r in group if r.recovered_at is not None]
+        unrecovered = sum(1 for r in group if r.fault_end is not None and r.recovered_at is None)
+        p50, worst = percentile(recovery, 50), percentile(recovery, 100)
+        print(
+            f"{kind:<10}{reads:>8}{100.0 * ok / max(1, reads):>7.1f}{requests / max(1, reads):>10.2f}"
+            f"{pings:>8}{reconnects:>8}"
+            f"{'-' if p50 is None else f'{p50:.2f}':>9}{'-' if worst is None else f'{worst:.2f}':>9}"
+            f"{unrecovered:>7}"
+        )
+
+    print()
+    print(f"{'t (s)':>8}{'traced MB':>11}{'clients KB':>12}")
+    for elapsed, traced, fleet in samples:
+        print(f"{elapsed:>8.1f}{traced / 1e6:>11.2f}{fleet / 1e3:>12.1f}")
+    steady = [s for s in samples if s[0] >= 0.5 * args.duration]
+    if len(steady) >= 2:
+        growth = (steady[-1][1] - steady[0][1]) / max(1, steady[0][1]) * 100
+        print(f"crescimento de memória na segunda metade: {growth:+.1f}%")
+
+    if args.profile:
+        print()
+        print(format_profile(fleet_profile(clients, top=10)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Startup benchmark: construction time, memory and open file descriptors
+for fleets of ``ModbusTCPResiliente`` clients.
+
+Each scenario runs in a fresh interpreter so loggers/handlers created by one
+scenario do not leak into the next.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_startup.py [N ...]
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+SCENARIOS = {
+    "default": {},
+    "default_no_log": {"log_file": None},
+    "lightweight": {"lightweight": True},
+}
+
+
+def _open_fds() -> int:
+    try:
+        return len(os.listdir("/proc/self/fd"))
+    except OSError:
+        return -1
+
+
+def _child_env() -> dict:
+    """Ambiente dos filhos com ``PYTHONPATH`` absoluto.
+
+    Os filhos rodam em um diretório temporário: um ``src`` relativo deixaria
+    de resolver, então as entradas viram caminhos absolutos e o ``src`` do
+    repositório é incluído.
+    """
+    src = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src")
+    paths = [os.path.abspath(p) for p in os.environ.get("PYTHONPATH", "").split(os.pathsep) if p]
+    paths.append(os.path.normpath(src))
+    return {**os.environ, "PYTHONPATH": os.pathsep.join(paths)}
+
+
+def run_scenario(name: str, count: int) -> dict:
+    """Constrói ``count`` clientes no processo atual e mede o custo."""
+    kwargs = SCENARIOS[name]
+    fds_before = _open_fds()
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    t_import = time.perf_counter()
+    from pyModbusTCPtools import ModbusTCPResiliente
+    import_time = time.perf_counter() - t_import
+
+    clients = []
+    error = None
+    try:
+        for i in range(count):
+            host = f"10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}"
+            clients.append(ModbusTCPResiliente(host=host, **kwargs))
+    except OSError as exc:
+        error = str(exc)
+    elapsed = time.perf_counter() - started
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "scenario": name,
+        "clients": len(clients),
+        "import_s": round(import_time, 4),
+        "total_s": round(elapsed, 4),
+        "per_client_us": round(elapsed / max(1, len(clients)) * 1e6, 1),
+        "memory_mb": round(current / 1e6, 2),
+        "peak_mb": round(peak / 1e6, 2),
+        "open_fds": _open_fds() - fds_before,
+        "error": error,
+    }
+
+
+def main(argv) -> None:
+    if len(argv) == 3 and argv[0] == "--child":
+        print(json.dumps(run_scenario(argv[1], int(argv[2]))))
+        return
+
+    counts = [int(a) for a in argv] or [1000, 10000]
+    header = f"{'scenario':<16}{'clients':>9}{'total s':>10}{'us/client':>11}{'mem MB':>9}{'peak MB':>9}{'fds':>7}"
+    print(header)
+    print("-" * len(header))
+    env = _child_env()
+    with tempfile.TemporaryDirectory() as cwd:
+        for count in counts:
+            for name in SCENARIOS:
+                out = subprocess.run(
+                    [sys.executable, os.path.abspath(__file__), "--child", name, str(count)],
+                    cwd=cwd, capture_output=True, text=True, env=env,
+                )
+                if out.returncode != 0:
+                    print(f"{name:<16}{count:>9}  falhou: {out.stderr.strip().splitlines()[-1]}")
+                    continue
+                r = json.loads(out.stdout)
+                line = (
+                    f"{r['scenario']:<16}{r['clients']:>9}{r['total_s']:>10.3f}{r['per_client_us']:>11.1f}"
+                    f"{r['memory_mb']:>9.2f}{r['peak_mb']:>9.2f}{r['open_fds']:>7}"
+                )
+                if r["error"]:
+                    line += f"  ({r['error']})"
+                print(line)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
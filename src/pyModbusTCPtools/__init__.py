@@ -1,9 +1,67 @@
 from .modbustools import ModbusTCPResiliente
-from .enums import Endian, ModbusDataType
+from .units import ModbusUnit
+from .enums import Endian, ErrorAction, ModbusDataType, Priority
+from .policy import ErrorPolicy, ErrorRule
+from .memory import MemoryBudget, fleet_memory_usage
+from .health import FleetHealth
 from .exceptions import *
 
+# Módulos opcionais importados apenas no primeiro acesso (startup mais rápido)
+_LAZY_EXPORTS = {
+    "Tag": ".tagmap",
+    "ReadBlock": ".tagmap",
+    "ReadPlan": ".tagmap",
+    "compile_read_plan": ".tagmap",
+    "load_read_plan": ".tagmap",
+    "load_tag_map": ".tagmap",
+    "Snapshot": ".snapshot",
+    "BlockReading": ".snapshot",
+    "AdaptivePoller": ".adaptive",
+    "RequestScheduler": ".scheduler",
+    "VerifiedWriteReport": ".verify",
+    "WriteMismatch": ".verify",
+    "Scaling": ".scaling",
+    "fleet_profile": ".profiling",
+    "format_profile": ".profiling",
+}
+
+
+def __getattr__(name):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
 __all__ = [
     "ModbusTCPResiliente",
+    "ModbusUnit",
     "Endian",
     "ModbusDataType",
+    "ErrorAction",
+    "Priority",
+    "ErrorPolicy",
+    "ErrorRule",
+    "MemoryBudget",
+    "fleet_memory_usage",
+    "FleetHealth",
+    "fleet_profile",
+    "format_profile",
+    "Tag",
+    "ReadBlock",
+    "ReadPlan",
+    "compile_read_plan",
+    "load_read_plan",
+    "load_tag_map",
+    "Snapshot",
+    "BlockReading",
+    "AdaptivePoller",
+    "RequestScheduler",
+    "VerifiedWriteReport",
+    "WriteMismatch",
+    "Scaling",
 ]
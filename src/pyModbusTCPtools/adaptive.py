@@ -0,0 +1,287 @@
+"""
+Adaptive polling on top of the typed read API.
+
+``AdaptivePoller`` keeps a poll interval per tag and moves it between the
+configured ``min_interval`` and ``max_interval``: tags that do not change are
+polled less often (the interval grows by ``slowdown``), tags that change are
+polled faster (the interval shrinks by ``speedup``, or drops straight to the
+minimum on a step larger than the tag's recent standard deviation). Change
+frequency and variance are tracked with exponentially weighted averages.
+
+A token bucket enforces a requests-per-second budget for the device, so a slow
+PLC is never polled faster than it can answer; when the budget is short the
+most overdue tags go first. The budget counts what the device actually
+receives (each ``*_safe`` read is preceded by the ``is_connected`` ping) and is
+shared by every poller of the same ``host:port``. ``stats()`` reports the effective rate per tag and
+the requests and bytes saved compared to fixed-rate polling at each tag's
+``scan_rate``.
+"""
+
+import math
+import time
+import weakref
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional
+
+from .tagmap import BIT_AREAS, Tag
+
+if TYPE_CHECKING:
+    from .modbustools import ModbusTCPResiliente
+
+# Tamanho (bytes) de requisição e resposta Modbus TCP (MBAP + PDU)
+REQUEST_BYTES = 12
+RESPONSE_HEADER_BYTES = 9
+
+# Requisições recebidas pelo dispositivo por leitura: ping de is_connected + leitura
+REQUESTS_PER_READ = 2
+
+
+def request_bytes(tag: Tag) -> int:
+    """Bytes trafegados (requisição + resposta) para ler uma tag."""
+    if tag.area in BIT_AREAS:
+        payload = (tag.count + 7) // 8
+    else:
+        payload = 2 * tag.count
+    return REQUEST_BYTES + RESPONSE_HEADER_BYTES + payload
+
+
+class _TagState:
+    """Estado adaptativo de uma tag."""
+
+    __slots__ = (
+        "tag", "interval", "next_due", "last_value", "mean", "variance",
+        "change_rate", "reads", "changes", "failures", "bytes_per_read",
+    )
+
+    def __init__(self, tag: Tag, interval: float, now: float) -> None:
+        self.tag = tag
+        self.interval = interval
+        self.next_due = now
+        self.last_value = None
+        self.mean = 0.0
+        self.variance = 0.0
+        self.change_rate = 0.0
+        self.reads = 0
+        self.changes = 0
+        self.failures = 0
+        self.bytes_per_read = request_bytes(tag)
+
+
+class RequestBudget:
+    """Token bucket de requisições por segundo de um dispositivo.
+
+    A capacidade é de 1 segundo de orçamento (no mínimo o custo de uma leitura).
+    """
+
+    __slots__ = ("rate", "tokens", "updated_at", "__weakref__")
+
+    def __init__(self, rate: float, now: float) -> None:
+        self.rate = rate
+        self.tokens = self.capacity
+        self.updated_at = now
+
+    @property
+    def capacity(self) -> float:
+        return max(self.rate, float(REQUESTS_PER_READ))
+
+    def refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self.updated_at)
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.updated_at = now
+
+    def take(self, cost: float, now: float) -> bool:
+        """Consome ``cost`` requisições se houver orçamento."""
+        self.refill(now)
+        if self.tokens < cost:
+            return False
+        self.tokens -= cost
+        return True
+
+    def wait(self, cost: float) -> float:
+        """Segundos até haver orçamento para ``cost`` requisições."""
+        return max(0.0, (cost - self.tokens) / self.rate)
+
+
+# Orçamentos por dispositivo, compartilhados pelos pollers enquanto existirem
+_BUDGETS: "weakref.WeakValueDictionary" = weakref.WeakValueDictionary()
+
+
+def device_budget(client: "ModbusTCPResiliente", max_rps: float, now: float) -> RequestBudget:
+    """Orçamento compartilhado do dispositivo ``host:port`` (o menor ``max_rps`` vale)."""
+    key = (client.host, client.port)
+    budget = _BUDGETS.get(key)
+    if budget is None:
+        budget = _BUDGETS[key] = RequestBudget(max_rps, now)
+    elif max_rps < budget.rate:
+        budget.rate = max_rps
+        budget.tokens = min(budget.tokens, budget.capacity)
+    return budget
+
+
+class AdaptivePoller:
+    """Controlador de taxa de varredura por tag para um dispositivo."""
+
+    def __init__(
+        self,
+        client: "ModbusTCPResiliente",
+        tags: Iterable[Tag],
+        min_interval: float = 0.1,
+        max_interval: float = 60.0,
+        max_rps: Optional[float] = None,
+        deadband: float = 0.0,
+        speedup: float = 0.5,
+        slowdown: float = 1.5,
+        alpha: float = 0.2,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if not 0 < min_interval <= max_interval:
+            raise ValueError("Intervalos inválidos: use 0 < min_interval <= max_interval")
+        if max_rps is not None and max_rps <= 0:
+            raise ValueError("max_rps deve ser positivo")
+        if not (0 < speedup <= 1 <= slowdown):
+            raise ValueError("Use 0 < speedup <= 1 <= slowdown")
+
+        self.client = client
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.max_rps = max_rps
+        self.deadband = deadband
+        self.speedup = speedup
+        self.slowdown = slowdown
+        self.alpha = alpha
+        self.clock = clock
+
+        now = clock()
+        self.started = now
+        self.states: Dict[str, _TagState] = {
+            tag.name: _TagState(tag, self._clamp(tag.scan_rate), now) for tag in tags
+        }
+        self.budget = device_budget(client, max_rps, now) if max_rps is not None else None
+        self.requests = 0
+        self.throttled = 0
+
+    def _clamp(self, interval: float) -> float:
+        return min(self.max_interval, max(self.min_interval, interval))
+
+    # ================== LEITURA ==================
+    def _read(self, tag: Tag):
+        client = self.client
+        if tag.area == "hr":
+            value = client.read_holding_typed_safe(tag.addr, tag.dtype, tag.endian)
+        elif tag.area == "ir":
+            value = client.read_input_typed_safe(tag.addr, tag.dtype, tag.endian)
+        else:
+            reader = client.read_coils_safe if tag.area == "c" else client.read_discrete_inputs_safe
+            bits = reader(tag.addr, 1)
+            value = None if bits is None else bool(bits[0])
+        if value is None:
+            return None
+        return tag.apply_scale(value)
+
+    def _update(self, state: _TagState, value) -> None:
+        """Atualiza estatísticas da tag e ajusta o intervalo."""
+        state.reads += 1
+        previous = state.last_value
+        state.last_value = value
+        if previous is None:
+            state.mean = float(value)
+            return
+
+        x = float(value)
+        diff = x - state.mean
+        state.mean += self.alpha * diff
+        state.variance = (1 - self.alpha) * (state.variance + self.alpha * diff * diff)
+
+        step = abs(x - float(previous))
+        changed = step > self.deadband
+        state.change_rate += self.alpha * ((1.0 if changed else 0.0) - state.change_rate)
+        if changed:
+            state.changes += 1
+            if step > math.sqrt(state.variance):
+                state.interval = self.min_interval
+            else:
+                state.interval = self._clamp(state.interval * self.speedup)
+        else:
+            state.interval = self._clamp(state.interval * self.slowdown)
+
+    def due(self, now: Optional[float] = None) -> List[str]:
+        """Tags com leitura vencida, da mais atrasada para a menos atrasada."""
+        now = self.clock() if now is None else now
+        ready = [s for s in self.states.values() if s.next_due <= now]
+        ready.sort(key=lambda s: s.next_due)
+        return [s.tag.name for s in ready]
+
+    def poll(self) -> Dict[str, object]:
+        """Lê as tags vencidas respeitando o orçamento de requisições.
+
+        Retorna ``{nome: valor}`` das tags lidas neste ciclo (``None`` em falha).
+        Tags não atendidas por falta de orçamento continuam vencidas.
+        """
+        now = self.clock()
+        budget = self.budget
+        values = {}
+        for name in self.due(now):
+            if budget is not None and not budget.take(REQUESTS_PER_READ, now):
+                self.throttled += 1
+                continue
+            state = self.states[name]
+            value = self._read(state.tag)
+            self.requests += 1
+            values[name] = value
+            if value is None:
+                state.failures += 1
+            else:
+                self._update(state, value)
+            # Agenda com o intervalo já ajustado por esta leitura
+            state.next_due = now + state.interval
+        return values
+
+    def next_poll_in(self) -> float:
+        """Segundos até a próxima tag vencer (ou até haver orçamento)."""
+        now = self.clock()
+        wait = min((s.next_due for s in self.states.values()), default=now) - now
+        if self.budget is not None:
+            self.budget.refill(now)
+            wait = max(wait, self.budget.wait(REQUESTS_PER_READ))
+        return max(0.0, wait)
+
+    def run(self, duration: float, sleep: Callable[[float], None] = time.sleep) -> None:
+        """Executa ``poll`` continuamente durante ``duration`` segundos."""
+        end = self.clock() + duration
+        while self.clock() < end:
+            self.poll()
+            sleep(min(self.next_poll_in(), max(0.0, end - self.clock())))
+
+    # ================== RELATÓRIO ==================
+    def stats(self) -> dict:
+        """Taxas efetivas por tag e economia em relação à varredura fixa."""
+        elapsed = max(self.clock() - self.started, 1e-9)
+        tags = {}
+        baseline_requests = 0.0
+        bytes_used = bytes_baseline = 0.0
+        for name, s in self.states.items():
+            fixed = elapsed / s.tag.scan_rate
+            baseline_requests += fixed
+            bytes_used += s.reads * s.bytes_per_read
+            bytes_baseline += fixed * s.bytes_per_read
+            tags[name] = {
+                "interval": s.interval,
+                "effective_rate": s.reads / elapsed,
+                "fixed_rate": 1.0 / s.tag.scan_rate,
+                "change_rate": s.change_rate,
+                "variance": s.variance,
+                "reads": s.reads,
+                "changes": s.changes,
+                "failures": s.failures,
+            }
+        return {
+            "elapsed": elapsed,
+            "requests": self.requests,
+            "effective_rps": self.requests / elapsed,
+            "device_rps": self.requests * REQUESTS_PER_READ / elapsed,
+            "throttled": self.throttled,
+            "baseline_requests": baseline_requests,
+            "requests_saved": max(0.0, baseline_requests - self.requests),
+            "bytes_used": bytes_used,
+            "bytes_saved": max(0.0, bytes_baseline - bytes_used),
+            "tags": tags,
+        }
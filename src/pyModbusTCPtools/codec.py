@@ -0,0 +1,220 @@
+"""
+Vectorized register codecs for batches of typed values.
+
+All values of one ``(dtype, endian)`` group are packed with a single
+``struct`` call and reinterpreted as 16-bit words with a second one, so the
+per-value Python work of the scalar converters disappears. The four
+``Endian`` variants map to struct byte orders:
+
+=========  ===========  ==========
+Endian     value order  word order
+=========  ===========  ==========
+BE         ``>``        ``>``
+BE_SWAP    ``>``        ``<``
+LE         ``<``        ``<``
+LE_SWAP    ``<``        ``>``
+=========  ===========  ==========
+
+which matches the scalar ``_*_to_regs`` / ``_regs_to_*`` helpers of
+``ModbusTCPResiliente``. 16-bit types are never swapped, as in the scalar API.
+Ranges are validated for the whole batch before anything is encoded.
+Entries carrying a ``Scaling`` are converted from engineering units to raw
+values in one pass per ``(dtype, endian, scaling)`` group.
+"""
+
+import math
+import struct
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from .enums import Endian, ModbusDataType
+from .exceptions import ModbusConversionError
+
+_FORMAT = {
+    ModbusDataType.INT16: "h",
+    ModbusDataType.UINT16: "H",
+    ModbusDataType.INT32: "i",
+    ModbusDataType.UINT32: "I",
+    ModbusDataType.INT64: "q",
+    ModbusDataType.UINT64: "Q",
+    ModbusDataType.FLOAT32: "f",
+    ModbusDataType.FLOAT64: "d",
+}
+
+_BYTE_ORDERS = {
+    Endian.BE: (">", ">"),
+    Endian.BE_SWAP: (">", "<"),
+    Endian.LE: ("<", "<"),
+    Endian.LE_SWAP: ("<", ">"),
+}
+
+FLOAT32_MAX = 3.4028234663852886e38
+
+# Limites por requisição definidos pela especificação Modbus
+# (definidos só aqui; tagmap, verify e o cliente importam deste módulo)
+MAX_READ_REGISTERS = 125    # FC03/FC04
+MAX_READ_BITS = 2000        # FC01/FC02
+MAX_WRITE_REGISTERS = 123   # FC16
+MAX_FC23_WRITE = 121        # FC23 (escrita)
+
+# Tamanho do espaço de endereços Modbus (endereços 0..0xFFFF)
+ADDRESS_SPACE = 0x10000
+
+
+def _orders(dtype: ModbusDataType, endian: Endian) -> Tuple[str, str]:
+    if dtype.registers == 1:
+        return ">", ">"
+    return _BYTE_ORDERS[Endian(endian)]
+
+
+def _int_range(dtype: ModbusDataType) -> Tuple[int, int]:
+    bits = dtype.bits
+    if dtype.signed:
+        return -(1 << (bits - 1)), (1 << (bits - 1)) - 1
+    return 0, (1 << bits) - 1
+
+
+def validate_values(values: Sequence, dtype: ModbusDataType) -> List:
+    """Valida (e normaliza) todos os valores antes de codificar.
+
+    Inteiros aceitam ``int`` ou ``float`` sem parte fracionária; floats devem
+    ser numéricos e, em FLOAT32, caber no formato (``inf``/``nan`` são aceitos).
+    """
+    name = dtype.name
+    if dtype.is_float:
+        try:
+            out = [float(v) for v in values]
+        except (TypeError, ValueError) as exc:
+            raise ModbusConversionError(f"Valor inválido para {name}") from exc
+        if dtype == ModbusDataType.FLOAT32 and out:
+            finite = [v for v in out if math.isfinite(v)]
+            if finite and max(abs(min(finite)), abs(max(finite))) > FLOAT32_MAX:
+                bad = next(v for v in finite if abs(v) > FLOAT32_MAX)
+                raise ModbusConversionError(f"{name} fora do range: {bad}")
+        return out
+
+    out = []
+    for v in values:
+        if isinstance(v, int):
+            out.append(v)
+        elif isinstance(v, float) and v.is_integer():
+            out.append(int(v))
+        else:
+            raise ModbusConversionError(f"Valor inválido para {name}: {v!r}")
+    if out:
+        lo, hi = _int_range(dtype)
+        if min(out) < lo or max(out) > hi:
+            bad = next(v for v in out if not lo <= v <= hi)
+            raise ModbusConversionError(f"{name} fora do range: {bad}")
+    return out
+
+
+def encode_values(values: Sequence, dtype: ModbusDataType, endian: Endian = Endian.BE) -> List[int]:
+    """Codifica uma sequência homogênea em registradores (lista plana)."""
+    values = validate_values(values, dtype)
+    if not values:
+        return []
+    value_order, word_order = _orders(dtype, endian)
+    n = len(values)
+    raw = struct.pack(f"{value_order}{n}{_FORMAT[dtype]}", *values)
+    return list(struct.unpack(f"{word_order}{n * dtype.registers}H", raw))
+
+
+def decode_values(regs: Sequence[int], dtype: ModbusDataType, endian: Endian = Endian.BE) -> List:
+    """Decodifica registradores contíguos em uma lista de valores do mesmo tipo."""
+    width = dtype.registers
+    if len(regs) % width:
+        raise ModbusConversionError(f"{dtype.name} requer múltiplos de {width} registradores")
+    n = len(regs) // width
+    if not n:
+        return []
+    value_order, word_order = _orders(dtype, endian)
+    try:
+        raw = struct.pack(f"{word_order}{len(regs)}H", *regs)
+    except struct.error as exc:
+        raise ModbusConversionError(f"Registrador inválido para {dtype.name}") from exc
+    return list(struct.unpack(f"{value_order}{n}{_FORMAT[dtype]}", raw))
+
+
+def scale_to_raw(values: Sequence, scaling, dtype: ModbusDataType) -> List:
+    """Converte valores em EU para brutos (inteiros arredondados se ``dtype`` for inteiro)."""
+    try:
+        return scaling.to_raw(values, integer=not dtype.is_float)
+    except (TypeError, ValueError, OverflowError) as exc:
+        raise ModbusConversionError(f"Valor inválido para scaling de {dtype.name}") from exc
+
+
+def encode_entries(entries: Iterable[Sequence]) -> List[Tuple[int, List[int]]]:
+    """Codifica ``(addr, value, dtype[, endian[, scaling]])`` agrupando por tipo e endian.
+
+    Retorna ``(addr, regs)`` na mesma ordem das entradas. Qualquer entrada
+    malformada, tipo/endian desconhecido, endereço fora de ``0..0xFFFF`` (o
+    valor inteiro deve caber no espaço de endereços) ou valor inválido gera
+    ``ModbusConversionError`` antes de qualquer resultado.
+    """
+    addrs: List[int] = []
+    values: List = []
+    # Agrupa pelo valor dos enums (hash de str em C, mais barato que o de Enum)
+    groups: Dict[Tuple, List[int]] = {}
+    for i, entry in enumerate(entries):
+        try:
+            scaling = None
+            if len(entry) == 3:
+                addr, value, dtype = entry
+                endian = Endian.BE
+            elif len(entry) == 4:
+                addr, value, dtype, endian = entry
+            else:
+                addr, value, dtype, endian, scaling = entry
+            addrs.append(int(addr))
+            key = (getattr(dtype, "_value_", dtype), getattr(endian, "_value_", endian), scaling)
+            group = groups.get(key)
+        except (TypeError, ValueError):
+            raise ModbusConversionError(f"Entrada inválida: {entry!r}") from None
+        values.append(value)
+        if group is None:
+            group = groups[key] = []
+        group.append(i)
+
+    out: List[Tuple[int, List[int]]] = [None] * len(addrs)  # type: ignore[list-item]
+    for (dtype_key, endian_key, scaling), indexes in groups.items():
+        try:
+            dtype, endian = ModbusDataType(dtype_key), Endian(endian_key)
+        except ValueError:
+            raise ModbusConversionError(f"Tipo/endian inválido: {dtype_key!r}/{endian_key!r}") from None
+        width = dtype.registers
+        for i in indexes:
+            if not 0 <= addrs[i] <= ADDRESS_SPACE - width:
+                raise ModbusConversionError(f"Endereço fora do range para {dtype.value}: {addrs[i]}")
+        group_values = [values[i] for i in indexes]
+        try:
+            if scaling is not None:
+                group_values = scale_to_raw(group_values, scaling, dtype)
+            regs = encode_values(group_values, dtype, endian)
+        except ModbusConversionError as exc:
+            raise ModbusConversionError(f"{exc} ({dtype.value}/{endian.value})") from exc
+        for j, i in enumerate(indexes):
+            out[i] = (addrs[i], regs[j * width:(j + 1) * width])
+    return out
+
+
+def build_image(
+    encoded: Iterable[Tuple[int, List[int]]],
+    limit: int = MAX_WRITE_REGISTERS,
+) -> List[Tuple[int, List[int]]]:
+    """Monta a imagem de registradores e a divide em requisições FC16.
+
+    Entradas contíguas formam um único intervalo, dividido em blocos de até
+    ``limit`` registradores sem separar um valor entre duas requisições.
+    Entradas sobrepostas geram ``ModbusConversionError``.
+    """
+    requests: List[Tuple[int, List[int]]] = []
+    end = None
+    for addr, regs in sorted(encoded, key=lambda e: e[0]):
+        if end is not None and addr < end:
+            raise ModbusConversionError(f"Entradas sobrepostas no endereço {addr}")
+        if end == addr and len(requests[-1][1]) + len(regs) <= limit:
+            requests[-1][1].extend(regs)
+        else:
+            requests.append((addr, list(regs)))
+        end = addr + len(regs)
+    return requests
@@ -1,6 +1,6 @@
 """Enumerations used by Modbus tools."""
 
-from enum import Enum
+from enum import Enum, IntEnum
 
 
 class Endian(Enum):
@@ -55,4 +55,21 @@ class ModbusDataType(Enum):
         return self in {
             self.FLOAT32,
             self.FLOAT64,
-        }
\ No newline at end of file
+        }
+
+class ErrorAction(Enum):
+    """Reação do cliente a um erro Modbus (ver ``ErrorPolicy``)."""
+
+    RETRY = "retry"             # repete no mesmo socket, sem reconectar
+    QUARANTINE = "quarantine"   # coloca o endereço em quarentena
+    BACKOFF = "backoff"         # coloca apenas o unit ID em backoff
+    RECONNECT = "reconnect"     # fecha o socket e aumenta o backoff da conexão
+
+
+class Priority(IntEnum):
+    """Classe de prioridade de uma requisição (menor valor = atendida antes)."""
+
+    URGENT = 0  # escritas do operador, comandos
+    ALARM = 1   # leitura de alarmes
+    NORMAL = 2  # leituras pontuais
+    BULK = 3    # varredura em massa
@@ -4,6 +4,14 @@
 class ModbusError(Exception):
     """Base exception for all Modbus-related errors."""
 
+    # Context filled in by the client when the error comes from a device reply
+    unit_id = None
+    cache_key = None
+    exception_code = 0
+    # True when the request was refused before being sent (quarantine, unit
+    # backoff, no connection): such errors are not counted in the statistics
+    rejected = False
+
 
 class ModbusConnectionError(ModbusError):
     """Raised when a Modbus connection cannot be established or is lost."""
@@ -25,3 +33,17 @@ class ModbusWriteError(ModbusError):
 
 class ModbusConversionError(ModbusError):
     """Raised when data type conversion fails (INT/FLOAT/Endian)."""
+
+
+class ModbusTagMapError(ModbusError):
+    """Raised when a tag map is invalid (duplicate names, overlaps, bad fields)."""
+
+
+class ModbusUnitError(ModbusProtocolError):
+    """Raised when a single unit ID behind a gateway is unavailable or in backoff,
+    while the TCP connection to the gateway remains usable.
+    """
+
+
+class ModbusDeadlineError(ModbusError):
+    """Raised when a queued request expires before it could be sent."""
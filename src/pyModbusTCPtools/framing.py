@@ -0,0 +1,338 @@
+"""
+Native Modbus TCP framing backend.
+
+``NativeModbusClient`` builds MBAP/PDU frames in preallocated buffers, reads
+replies with ``recv_into`` and tunes the socket (``TCP_NODELAY`` and TCP
+keepalive). It exposes the subset of ``pyModbusTCP.client.ModbusClient``
+used by ``ModbusTCPResiliente`` (same method names, same ``last_error`` /
+``last_except`` codes), so it plugs in behind the same ``_safe_read`` /
+``_safe_write`` contract. Errors are plain attributes set on every request,
+and ``last_result`` carries the structured ``(last_error, last_except)`` pair.
+"""
+
+import socket
+import struct
+from typing import List, Optional, Sequence
+
+from pyModbusTCP.constants import (
+    EXP_NONE,
+    MB_CONNECT_ERR,
+    MB_EXCEPT_ERR,
+    MB_NO_ERR,
+    MB_RECV_ERR,
+    MB_SEND_ERR,
+    MB_TIMEOUT_ERR,
+    READ_COILS,
+    READ_DISCRETE_INPUTS,
+    READ_HOLDING_REGISTERS,
+    READ_INPUT_REGISTERS,
+    WRITE_MULTIPLE_COILS,
+    WRITE_MULTIPLE_REGISTERS,
+    WRITE_READ_MULTIPLE_REGISTERS,
+    WRITE_SINGLE_COIL,
+    WRITE_SINGLE_REGISTER,
+)
+
+from .codec import ADDRESS_SPACE
+
+# Tamanho máximo de uma ADU Modbus TCP: MBAP (7) + PDU (253)
+MAX_ADU_SIZE = 260
+MBAP_SIZE = 7
+
+_MBAP = struct.Struct(">HHHB")
+_ADDR_COUNT = struct.Struct(">BHH")
+_ADDR_COUNT_BYTES = struct.Struct(">BHHB")
+_WRITE_READ = struct.Struct(">BHHHHB")
+
+# Parâmetros de TCP keepalive (aplicados quando a plataforma suporta)
+KEEPALIVE_OPTIONS = (
+    ("TCP_KEEPIDLE", 10),
+    ("TCP_KEEPINTVL", 5),
+    ("TCP_KEEPCNT", 3),
+)
+
+_word_structs = {}
+
+
+def _check_range(addr: int, count: int, operation: str) -> None:
+    """Mesmas validações de endereço do ``pyModbusTCP`` (``ValueError``)."""
+    if not 0 <= addr < ADDRESS_SPACE:
+        raise ValueError("endereço fora do range (válido de 0 a 65535)")
+    if addr + count > ADDRESS_SPACE:
+        raise ValueError(f"{operation} após o fim do espaço de endereços Modbus")
+
+
+def _words(count: int) -> struct.Struct:
+    st = _word_structs.get(count)
+    if st is None:
+        st = _word_structs[count] = struct.Struct(f">{count}H")
+    return st
+
+
+class NativeModbusClient:
+    """Cliente Modbus TCP com buffers pré-alocados e códigos de erro diretos."""
+
+    __slots__ = (
+        "host", "port", "unit_id", "timeout", "keepalive", "nodelay",
+        "last_error", "last_except",
+        "_sock", "_tid", "_tx", "_rx", "_tx_view", "_rx_view",
+    )
+
+    def __init__(
+        self,
+        host: str,
+        port: int = 502,
+        unit_id: int = 1,
+        timeout: float = 3.0,
+        keepalive: bool = True,
+        nodelay: bool = True,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.unit_id = unit_id
+        self.timeout = timeout
+        self.keepalive = keepalive
+        self.nodelay = nodelay
+
+        self.last_error = MB_NO_ERR
+        self.last_except = EXP_NONE
+
+        self._sock = None
+        self._tid = 0
+        self._tx = bytearray(MAX_ADU_SIZE)
+        self._rx = bytearray(MAX_ADU_SIZE)
+        self._tx_view = memoryview(self._tx)
+        self._rx_view = memoryview(self._rx)
+
+    def __repr__(self) -> str:
+        return f"NativeModbusClient(host={self.host!r}, port={self.port}, unit_id={self.unit_id})"
+
+    @property
+    def is_open(self) -> bool:
+        return self._sock is not None
+
+    @property
+    def last_result(self):
+        """Par estruturado ``(last_error, last_except)`` da última requisição."""
+        return self.last_error, self.last_except
+
+    @property
+    def buffer_bytes(self) -> int:
+        """Bytes dos buffers de envio/recepção pré-alocados."""
+        return len(self._tx) + len(self._rx)
+
+    # ================== SOCKET ==================
+    def _tune_socket(self, sock) -> None:
+        if self.nodelay:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        if self.keepalive:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            for name, value in KEEPALIVE_OPTIONS:
+                option = getattr(socket, name, None)
+                if option is not None:
+                    try:
+                        sock.setsockopt(socket.IPPROTO_TCP, option, value)
+                    except OSError:
+                        pass
+
+    def open(self) -> bool:
+        """Abre a conexão TCP (fecha a anterior, se houver)."""
+        self.close()
+        try:
+            sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        except OSError:
+            self.last_error = MB_CONNECT_ERR
+            return False
+        try:
+            self._tune_socket(sock)
+        except OSError:
+            pass
+        self._sock = sock
+        self.last_error = MB_NO_ERR
+        return True
+
+    def close(self) -> None:
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            finally:
+                self._sock = None
+
+    def _fail(self, error: int) -> None:
+        self.last_error = error
+        self.close()
+        return None
+
+    def _recv_exact(self, start: int, size: int) -> None:
+        view = self._rx_view
+        pos, end = start, start + size
+        recv_into = self._sock.recv_into
+        while pos < end:
+            got = recv_into(view[pos:end])
+            if not got:
+                raise ConnectionError("socket fechado pelo servidor")
+            pos += got
+
+    def _transact(self, pdu_size: int) -> Optional[int]:
+        """Envia o PDU já montado em ``_tx[7:]`` e retorna o tamanho do PDU recebido.
+
+        Retorna ``None`` em erro (``last_error``/``last_except`` preenchidos).
+        """
+        self.last_error = MB_NO_ERR
+        self.last_except = EXP_NONE
+
+        if self._sock is None and not self.open():
+            return None
+
+        self._tid = (self._tid + 1) & 0xFFFF
+        _MBAP.pack_into(self._tx, 0, self._tid, 0, pdu_size + 1, self.unit_id)
+
+        try:
+            self._sock.sendall(self._tx_view[:MBAP_SIZE + pdu_size])
+        except socket.timeout:
+            return self._fail(MB_TIMEOUT_ERR)
+        except OSError:
+            return self._fail(MB_SEND_ERR)
+
+        try:
+            self._recv_exact(0, MBAP_SIZE)
+            tid, protocol, length, unit = _MBAP.unpack_from(self._rx, 0)
+            if tid != self._tid or protocol != 0 or not (3 <= length <= MAX_ADU_SIZE - 6) or unit != self.unit_id:
+                return self._fail(MB_RECV_ERR)
+            self._recv_exact(MBAP_SIZE, length - 1)
+        except socket.timeout:
+            return self._fail(MB_TIMEOUT_ERR)
+        except OSError:
+            return self._fail(MB_RECV_ERR)
+
+        function = self._tx[MBAP_SIZE]
+        reply = self._rx[MBAP_SIZE]
+        if reply == function | 0x80:
+            self.last_error = MB_EXCEPT_ERR
+            self.last_except = self._rx[MBAP_SIZE + 1]
+            return None
+        if reply != function:
+            return self._fail(MB_RECV_ERR)
+        return length - 1
+
+    # ================== LEITURA ==================
+    def _read_words(self, function: int, addr: int, count: int) -> Optional[List[int]]:
+        if not (1 <= count <= 125):
+            raise ValueError("count deve estar entre 1 e 125")
+        _check_range(addr, count, "leitura")
+        _ADDR_COUNT.pack_into(self._tx, MBAP_SIZE, function, addr, count)
+        size = self._transact(5)
+        if size is None:
+            return None
+        if size != 2 + 2 * count or self._rx[MBAP_SIZE + 1] != 2 * count:
+            return self._fail(MB_RECV_ERR)
+        return list(_words(count).unpack_from(self._rx, MBAP_SIZE + 2))
+
+    def _read_bits(self, function: int, addr: int, count: int) -> Optional[List[bool]]:
+        if not (1 <= count <= 2000):
+            raise ValueError("count deve estar entre 1 e 2000")
+        _check_range(addr, count, "leitura")
+        _ADDR_COUNT.pack_into(self._tx, MBAP_SIZE, function, addr, count)
+        size = self._transact(5)
+        if size is None:
+            return None
+        nbytes = (count + 7) // 8
+        if size != 2 + nbytes or self._rx[MBAP_SIZE + 1] != nbytes:
+            return self._fail(MB_RECV_ERR)
+        rx, base = self._rx, MBAP_SIZE + 2
+        return [bool((rx[base + (i >> 3)] >> (i & 7)) & 1) for i in range(count)]
+
+    def read_coils(self, bit_addr: int, bit_nb: int = 1) -> Optional[List[bool]]:
+        return self._read_bits(READ_COILS, bit_addr, bit_nb)
+
+    def read_discrete_inputs(self, bit_addr: int, bit_nb: int = 1) -> Optional[List[bool]]:
+        return self._read_bits(READ_DISCRETE_INPUTS, bit_addr, bit_nb)
+
+    def read_holding_registers(self, reg_addr: int, reg_nb: int = 1) -> Optional[List[int]]:
+        return self._read_words(READ_HOLDING_REGISTERS, reg_addr, reg_nb)
+
+    def read_input_registers(self, reg_addr: int, reg_nb: int = 1) -> Optional[List[int]]:
+        return self._read_words(READ_INPUT_REGISTERS, reg_addr, reg_nb)
+
+    # ================== ESCRITA ==================
+    def _write_echo(self, function: int, addr: int, value: int) -> bool:
+        _check_range(addr, 1, "escrita")
+        _ADDR_COUNT.pack_into(self._tx, MBAP_SIZE, function, addr, value)
+        size = self._transact(5)
+        if size is None:
+            return False
+        if size != 5 or self._rx[MBAP_SIZE:MBAP_SIZE + 5] != self._tx[MBAP_SIZE:MBAP_SIZE + 5]:
+            self._fail(MB_RECV_ERR)
+            return False
+        return True
+
+    def write_single_coil(self, bit_addr: int, bit_value: bool) -> bool:
+        return self._write_echo(WRITE_SINGLE_COIL, bit_addr, 0xFF00 if bit_value else 0x0000)
+
+    def write_single_register(self, reg_addr: int, reg_value: int) -> bool:
+        if not (0 <= reg_value <= 0xFFFF):
+            raise ValueError("reg_value deve estar entre 0 e 65535")
+        return self._write_echo(WRITE_SINGLE_REGISTER, reg_addr, reg_value)
+
+    def _write_multiple_ack(self, addr: int, count: int, pdu_size: int) -> bool:
+        size = self._transact(pdu_size)
+        if size is None:
+            return False
+        if size != 5 or struct.unpack_from(">HH", self._rx, MBAP_SIZE + 1) != (addr, count):
+            self._fail(MB_RECV_ERR)
+            return False
+        return True
+
+    def write_multiple_coils(self, bits_addr: int, bits_value: Sequence[bool]) -> bool:
+        count = len(bits_value)
+        if not (1 <= count <= 1968):
+            raise ValueError("quantidade de coils deve estar entre 1 e 1968")
+        _check_range(bits_addr, count, "escrita")
+        nbytes = (count + 7) // 8
+        _ADDR_COUNT_BYTES.pack_into(self._tx, MBAP_SIZE, WRITE_MULTIPLE_COILS, bits_addr, count, nbytes)
+        base = MBAP_SIZE + 6
+        self._tx[base:base + nbytes] = bytes(nbytes)
+        for i, bit in enumerate(bits_value):
+            if bit:
+                self._tx[base + (i >> 3)] |= 1 << (i & 7)
+        return self._write_multiple_ack(bits_addr, count, 6 + nbytes)
+
+    def write_multiple_registers(self, regs_addr: int, regs_value: Sequence[int]) -> bool:
+        count = len(regs_value)
+        if not (1 <= count <= 123):
+            raise ValueError("quantidade de registradores deve estar entre 1 e 123")
+        _check_range(regs_addr, count, "escrita")
+        _ADDR_COUNT_BYTES.pack_into(self._tx, MBAP_SIZE, WRITE_MULTIPLE_REGISTERS, regs_addr, count, 2 * count)
+        try:
+            _words(count).pack_into(self._tx, MBAP_SIZE + 6, *regs_value)
+        except struct.error as exc:
+            raise ValueError("valores de registradores devem estar entre 0 e 65535") from exc
+        return self._write_multiple_ack(regs_addr, count, 6 + 2 * count)
+
+    def write_read_multiple_registers(
+        self,
+        write_addr: int,
+        write_values: Sequence[int],
+        read_addr: int,
+        read_nb: int = 1,
+    ) -> Optional[List[int]]:
+        write_nb = len(write_values)
+        if not (1 <= write_nb <= 121) or not (1 <= read_nb <= 125):
+            raise ValueError("quantidades inválidas para Write/Read Multiple Registers")
+        _check_range(write_addr, write_nb, "escrita")
+        _check_range(read_addr, read_nb, "leitura")
+        _WRITE_READ.pack_into(
+            self._tx, MBAP_SIZE,
+            WRITE_READ_MULTIPLE_REGISTERS, read_addr, read_nb, write_addr, write_nb, 2 * write_nb,
+        )
+        try:
+            _words(write_nb).pack_into(self._tx, MBAP_SIZE + 10, *write_values)
+        except struct.error as exc:
+            raise ValueError("valores de registradores devem estar entre 0 e 65535") from exc
+        size = self._transact(10 + 2 * write_nb)
+        if size is None:
+            return None
+        if size != 2 + 2 * read_nb or self._rx[MBAP_SIZE + 1] != 2 * read_nb:
+            return self._fail(MB_RECV_ERR)
+        return list(_words(read_nb).unpack_from(self._rx, MBAP_SIZE + 2))
+
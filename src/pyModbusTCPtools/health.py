@@ -0,0 +1,234 @@
+"""
+Connection health time-series and fleet-wide aggregation.
+
+Each client keeps a small, bounded ``ClientHealth`` record (created on the
+first event, so idle clients cost nothing):
+
+- the last connection state transitions (``connected`` / ``disconnected``);
+- a ring of fixed-width time buckets with request, error and reconnect counts,
+  from which request and error rates are derived;
+- error counts per exception type;
+- fixed-size histograms of request latency and reconnect duration.
+
+``Histogram`` uses the same log-spaced bucket bounds everywhere, so merging
+the histograms of thousands of clients is a sum of small integer lists and
+fleet percentiles never require storing individual samples. ``FleetHealth``
+builds a snapshot cheap enough to be scraped every few seconds.
+"""
+
+import bisect
+import sys
+import time
+from collections import deque
+from typing import Dict, Iterable, List, Optional
+
+# Limites dos buckets (s): 100 µs .. ~105 s, 4 buckets por década
+HISTOGRAM_BOUNDS = tuple(1e-4 * 10 ** (i / 4) for i in range(25))
+
+STATE_CONNECTED = "connected"
+STATE_DISCONNECTED = "disconnected"
+
+
+class Histogram:
+    """Histograma de buckets fixos (log) com percentis aproximados."""
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(HISTOGRAM_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value: float) -> None:
+        self.counts[bisect.bisect_left(HISTOGRAM_BOUNDS, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: "Histogram") -> None:
+        counts = self.counts
+        for i, n in enumerate(other.counts):
+            if n:
+                counts[i] += n
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, p: float) -> float:
+        """Limite superior do bucket que contém o percentil ``p`` (0-100)."""
+        if not self.count:
+            return 0.0
+        rank = p / 100.0 * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if n and seen >= rank:
+                return min(HISTOGRAM_BOUNDS[i], self.max) if i < len(HISTOGRAM_BOUNDS) else self.max
+        return self.max
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "avg": self.total / self.count if self.count else 0.0,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "max": self.max,
+        }
+
+
+class ClientHealth:
+    """Série temporal limitada de saúde da conexão de um cliente."""
+
+    __slots__ = (
+        "interval", "state", "transitions", "buckets", "errors",
+        "latency", "reconnect", "requests", "failures", "reconnects",
+    )
+
+    def __init__(self, interval: float = 10.0, history: int = 30, max_transitions: int = 32) -> None:
+        self.interval = interval
+        self.state: Optional[str] = None
+        self.transitions = deque(maxlen=max_transitions)  # (epoch, estado)
+        self.buckets = deque(maxlen=history)  # [início, requisições, erros, reconexões]
+        self.errors: Dict[str, int] = {}
+        self.latency = Histogram()
+        self.reconnect = Histogram()
+        self.requests = 0
+        self.failures = 0
+        self.reconnects = 0
+
+    def _bucket(self, now: float) -> list:
+        buckets = self.buckets
+        if not buckets or now >= buckets[-1][0] + self.interval:
+            start = now - (now % self.interval)
+            buckets.append([start, 0, 0, 0])
+        return buckets[-1]
+
+    def set_state(self, state: str, now: Optional[float] = None) -> None:
+        if state != self.state:
+            self.state = state
+            self.transitions.append((time.time() if now is None else now, state))
+
+    def record_request(self, latency: float, ok: bool, now: Optional[float] = None) -> None:
+        bucket = self._bucket(time.time() if now is None else now)
+        bucket[1] += 1
+        self.requests += 1
+        self.latency.add(latency)
+        if not ok:
+            bucket[2] += 1
+            self.failures += 1
+
+    def record_error(self, name: str) -> None:
+        self.errors[name] = self.errors.get(name, 0) + 1
+
+    def record_reconnect(self, seconds: float, now: Optional[float] = None) -> None:
+        self._bucket(time.time() if now is None else now)[3] += 1
+        self.reconnects += 1
+        self.reconnect.add(seconds)
+
+    def rates(self, window: float = 60.0, now: Optional[float] = None) -> dict:
+        """Taxas (por segundo) de requisições, erros e reconexões na janela."""
+        now = time.time() if now is None else now
+        since = now - window
+        requests = errors = reconnects = 0
+        for start, r, e, c in self.buckets:
+            if start + self.interval > since:
+                requests += r
+                errors += e
+                reconnects += c
+        return {
+            "request_rate": requests / window,
+            "error_rate": errors / window,
+            "reconnect_rate": reconnects / window,
+        }
+
+    def memory_usage(self) -> int:
+        """Bytes aproximados ocupados pela série temporal e histogramas."""
+        size = sys.getsizeof(self) + sys.getsizeof(self.transitions) + sys.getsizeof(self.buckets)
+        size += sum(sys.getsizeof(b) for b in self.buckets) + sys.getsizeof(self.errors)
+        for hist in (self.latency, self.reconnect):
+            size += sys.getsizeof(hist) + sys.getsizeof(hist.counts)
+        return size
+
+    def snapshot(self, window: float = 60.0, now: Optional[float] = None) -> dict:
+        data = {
+            "state": self.state,
+            "requests": self.requests,
+            "failures": self.failures,
+            "reconnects": self.reconnects,
+            "errors": dict(self.errors),
+            "transitions": list(self.transitions),
+            "latency": self.latency.summary(),
+            "reconnect_time": self.reconnect.summary(),
+        }
+        data.update(self.rates(window, now))
+        return data
+
+
+class FleetHealth:
+    """Agregador de saúde de vários ``ModbusTCPResiliente``."""
+
+    def __init__(self, clients: Iterable = ()) -> None:
+        self.clients: List = list(clients)
+
+    def add(self, client) -> None:
+        self.clients.append(client)
+
+    def remove(self, client) -> None:
+        self.clients.remove(client)
+
+    def snapshot(self, window: float = 60.0, top: int = 10, per_client: bool = False) -> dict:
+        """Resumo da frota: estados, taxas, erros e percentis combinados.
+
+        O custo é proporcional ao número de clientes vezes o número fixo de
+        buckets; nenhuma amostra individual é percorrida.
+        """
+        now = time.time()
+        latency = Histogram()
+        reconnect = Histogram()
+        states: Dict[str, int] = {}
+        errors: Dict[str, int] = {}
+        totals = {"request_rate": 0.0, "error_rate": 0.0, "reconnect_rate": 0.0}
+        ranked = []
+        clients = {}
+
+        for client in self.clients:
+            name = f"{client.host}:{client.port}"
+            health = client.health
+            if health is None:
+                states["idle"] = states.get("idle", 0) + 1
+                continue
+            state = health.state or "idle"
+            states[state] = states.get(state, 0) + 1
+            latency.merge(health.latency)
+            reconnect.merge(health.reconnect)
+            for err, n in health.errors.items():
+                errors[err] = errors.get(err, 0) + n
+            rates = health.rates(window, now)
+            for key, value in rates.items():
+                totals[key] += value
+            ranked.append((rates["error_rate"], rates["reconnect_rate"], name, state))
+            if per_client:
+                clients[name] = health.snapshot(window, now)
+
+        ranked.sort(reverse=True)
+        report = {
+            "timestamp": now,
+            "window": window,
+            "clients": len(self.clients),
+            "states": states,
+            "errors": errors,
+            "latency": latency.summary(),
+            "reconnect_time": reconnect.summary(),
+            "worst": [
+                {"client": name, "state": state, "error_rate": err, "reconnect_rate": rec}
+                for err, rec, name, state in ranked[:top]
+                if err or rec
+            ],
+        }
+        report.update(totals)
+        if per_client:
+            report["per_client"] = clients
+        return report
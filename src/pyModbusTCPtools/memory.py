@@ -0,0 +1,88 @@
+"""
+Memory accounting for large fleets of resilient clients.
+
+``fleet_memory_usage`` aggregates ``ModbusTCPResiliente.get_memory_usage()``
+across many clients, and ``MemoryBudget`` enforces per-client and fleet-wide
+byte caps by trimming the invalid-address quarantine and idle unit-ID state
+of the largest clients first.
+"""
+
+import sys
+from typing import Dict, Iterable, Optional
+
+
+def sizeof_cache(cache: dict) -> int:
+    """Bytes usados por um dict de cache (container + chaves + valores)."""
+    size = sys.getsizeof(cache)
+    for key, value in cache.items():
+        size += sys.getsizeof(key) + sys.getsizeof(value)
+    return size
+
+
+def sizeof_slots(obj) -> int:
+    """Bytes de um objeto com ``__slots__`` (objeto + valores float/str próprios)."""
+    size = sys.getsizeof(obj)
+    for cls in type(obj).__mro__:
+        for name in getattr(cls, "__slots__", ()):
+            value = getattr(obj, name, None)
+            if isinstance(value, (float, str)):
+                size += sys.getsizeof(value)
+    return size
+
+
+def fleet_memory_usage(clients: Iterable, top: int = 10) -> dict:
+    """Soma o uso de memória de vários clientes e lista os maiores."""
+    per_client = []
+    by_category: Dict[str, int] = {}
+    for client in clients:
+        usage = client.get_memory_usage()
+        per_client.append((f"{client.host}:{client.port}", usage))
+        for category, size in usage.items():
+            by_category[category] = by_category.get(category, 0) + size
+
+    count = len(per_client)
+    total = by_category.get("total", 0)
+    per_client.sort(key=lambda item: item[1]["total"], reverse=True)
+    return {
+        "clients": count,
+        "total": total,
+        "avg_per_client": total / count if count else 0.0,
+        "by_category": by_category,
+        "top": [{"device": device, **usage} for device, usage in per_client[:top]],
+    }
+
+
+class MemoryBudget:
+    """Limites de memória por cliente e para a frota inteira (em bytes)."""
+
+    def __init__(
+        self,
+        max_client_bytes: Optional[int] = None,
+        max_fleet_bytes: Optional[int] = None,
+    ) -> None:
+        self.max_client_bytes = max_client_bytes
+        self.max_fleet_bytes = max_fleet_bytes
+
+    def enforce(self, clients: Iterable) -> int:
+        """Reduz caches dos clientes acima do limite. Retorna os bytes liberados."""
+        clients = list(clients)
+        freed = 0
+
+        if self.max_client_bytes is not None:
+            for client in clients:
+                freed += client.trim_memory(self.max_client_bytes)
+
+        if self.max_fleet_bytes is not None and clients:
+            usage = [(client.get_memory_usage()["total"], client) for client in clients]
+            total = sum(size for size, _ in usage)
+            if total > self.max_fleet_bytes:
+                # Maiores primeiro, até a fatia justa do orçamento
+                fair_share = self.max_fleet_bytes // len(clients)
+                for size, client in sorted(usage, key=lambda item: item[0], reverse=True):
+                    if total <= self.max_fleet_bytes or size <= fair_share:
+                        break
+                    released = client.trim_memory(fair_share)
+                    total -= released
+                    freed += released
+
+        return freed
@@ -16,18 +16,29 @@ Endianness:
 - Little Endian with byte swap
 """
 
+import functools
 import logging
 import struct
+import sys
 import time
 import os
 import random
-from typing import List, Optional, Sequence, Union
-from logging.handlers import RotatingFileHandler
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Union
 
 from pyModbusTCP import utils
-from pyModbusTCP.client import ModbusClient
+from pyModbusTCP.constants import (
+    EXP_ILLEGAL_FUNCTION,
+    EXP_GATEWAY_PATH_UNAVAILABLE,
+    EXP_GATEWAY_TARGET_DEVICE_FAILED_TO_RESPOND,
+    MB_TIMEOUT_ERR,
+)
 
-from .enums import Endian, ModbusDataType
+from .enums import Endian, ErrorAction, ModbusDataType
+from .health import STATE_CONNECTED, STATE_DISCONNECTED, ClientHealth
+from .memory import sizeof_cache, sizeof_slots
+from .policy import ErrorPolicy
+from .units import ModbusUnit, _UnitState
 from .exceptions import (
     ModbusError,
     ModbusConnectionError,
@@ -35,12 +46,162 @@ from .exceptions import (
     ModbusReadError,
     ModbusWriteError,
     ModbusConversionError,
+    ModbusUnitError,
+)
+
+# Exceções Modbus emitidas por gateways quando o escravo serial não responde
+GATEWAY_EXCEPTIONS = (
+    EXP_GATEWAY_PATH_UNAVAILABLE,
+    EXP_GATEWAY_TARGET_DEVICE_FAILED_TO_RESPOND,
 )
 
+if TYPE_CHECKING:
+    from .profiling import CallProfiler
+    from .scaling import Scaling
+    from .snapshot import Snapshot
+    from .tagmap import ReadPlan
+    from .verify import VerifiedWriteReport
+
+# Backends de I/O disponíveis para o cliente interno
+BACKENDS = ("pymodbustcp", "native")
+
+# Logger compartilhado pelos clientes em modo lightweight
+SHARED_LOGGER_NAME = "ModbusTCP"
+_LOG_FORMAT = "%(asctime)s | %(levelname)s | %(message)s"
+
+
+def _configure_logger(logger: logging.Logger, log_file: Optional[str], console: bool) -> None:
+    """Adiciona handlers de arquivo/console ao logger, sem duplicá-los."""
+    logger.setLevel(logging.INFO)
+    # Evita duplicar logs via root logger caso o usuário configure logging global.
+    logger.propagate = False
+
+    if not log_file and not console:
+        return
+
+    from logging.handlers import RotatingFileHandler
+
+    formatter = logging.Formatter(_LOG_FORMAT)
+
+    if log_file:
+        abs_log_file = os.path.abspath(log_file)
+        has_file_handler = any(
+            isinstance(h, RotatingFileHandler) and getattr(h, "baseFilename", None) == abs_log_file
+            for h in logger.handlers
+        )
+        if not has_file_handler:
+            file_handler = RotatingFileHandler(
+                log_file,
+                maxBytes=1_000_000,
+                backupCount=3
+            )
+            file_handler.setFormatter(formatter)
+            logger.addHandler(file_handler)
+
+    if console:
+        has_console_handler = any(
+            isinstance(h, logging.StreamHandler) and not isinstance(h, RotatingFileHandler)
+            for h in logger.handlers
+        )
+        if not has_console_handler:
+            stream_handler = logging.StreamHandler()
+            stream_handler.setFormatter(formatter)
+            logger.addHandler(stream_handler)
+
+
+_shared_loggers: Dict[tuple, logging.Logger] = {}  # (log_file, console) -> logger
+
+
+def _get_shared_logger(log_file: Optional[str], console: bool) -> logging.Logger:
+    """Logger compartilhado pelos clientes lightweight com os mesmos destinos.
+
+    Sem destinos é o próprio logger ``ModbusTCP``. Cada combinação
+    ``(log_file, console)`` ganha um logger filho com seus handlers (criados
+    uma vez), que propaga para ``ModbusTCP``: um cliente só escreve nos seus
+    próprios destinos, e handlers adicionados a ``ModbusTCP`` veem todos.
+    """
+    config = (os.path.abspath(log_file) if log_file else None, bool(console))
+    logger = _shared_loggers.get(config)
+    if logger is not None:
+        return logger
+
+    base = logging.getLogger(SHARED_LOGGER_NAME)
+    _configure_logger(base, None, False)
+    if config == (None, False):
+        logger = base
+    else:
+        logger = base.getChild(f"shared.{len(_shared_loggers)}")
+        _configure_logger(logger, log_file, console)
+        logger.propagate = True
+    _shared_loggers[config] = logger
+    return logger
+
+
+def _profiled(func):
+    """Delimita uma chamada pública no modo de perfil (``enable_profiling``).
+
+    Sem perfil custa uma checagem de atributo. Métodos públicos chamados por
+    outro (ex.: ``is_connected``) ficam na operação mais externa.
+    """
+    name = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        profiler = self.profiler
+        if profiler is None or self._profile_frame is not None:
+            return func(self, *args, **kwargs)
+        frame = profiler.start(name)
+        # False marca uma chamada não amostrada: as chamadas internas não são contadas
+        self._profile_frame = frame if frame is not None else False
+        try:
+            return func(self, *args, **kwargs)
+        finally:
+            self._profile_frame = None
+            if frame is not None:
+                profiler.finish(name, frame)
+
+    return wrapper
+
+
+def _in_phase(phase: str):
+    """Atribui o tempo do método à fase ``phase`` (``profiling.PHASES``) quando amostrado."""
+
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            frame = self._profile_frame
+            if not frame:
+                return func(self, *args, **kwargs)
+            previous = frame.switch(phase)
+            try:
+                return func(self, *args, **kwargs)
+            finally:
+                frame.switch(previous)
+
+        return wrapper
+
+    return decorate
+
 
 class ModbusTCPResiliente:
     """Cliente Modbus TCP resiliente com reconexão, backoff e conversões de tipos."""
 
+    # Estado compacto por instância; ``__dict__`` continua disponível (criado
+    # apenas se atributos extras forem definidos) para subclasses e usuários.
+    __slots__ = (
+        "host", "port", "timeout",
+        "base_retry_delay", "max_retry_delay", "current_retry_delay",
+        "ping_addr", "ping_count", "failure_count",
+        "unit_id", "_active_unit_id", "_unit_states", "unit_states_max",
+        "error_policy",
+        "invalid_cache_ttl", "invalid_cache_max", "_invalid_addr_cache",
+        "console", "lightweight", "_log_prefix", "logger",
+        "backend", "_client",
+        "health", "track_health",
+        "profiler", "_profile_frame",
+        "__dict__", "__weakref__",
+    )
+
     def __init__(
         self,
         host: str,
@@ -56,7 +217,21 @@ class ModbusTCPResiliente:
         logger: Optional[logging.Logger] = None,
         invalid_cache_ttl: float = 600,
         invalid_cache_max: int = 500,
+        error_policy: Optional[ErrorPolicy] = None,
+        lightweight: bool = False,
+        unit_states_max: int = 256,
+        backend: str = "pymodbustcp",
+        track_health: bool = True,
+        profile_sample_rate: Optional[float] = None,
     ) -> None:
+        if backend not in BACKENDS:
+            raise ValueError(f"backend inválido: {backend!r} (use {', '.join(BACKENDS)})")
+        self.backend = backend
+
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+
         self.base_retry_delay = retry_delay
         self.max_retry_delay = max_retry_delay
         self.current_retry_delay = retry_delay
@@ -65,6 +240,14 @@ class ModbusTCPResiliente:
         self.ping_count = ping_count
         self.failure_count = 0
 
+        # Unit ID padrão (ping) e estado por unit ID para gateways
+        self.unit_id = unit_id
+        self._active_unit_id = unit_id
+        self._unit_states = {}  # unit_id -> _UnitState
+        self.unit_states_max = int(unit_states_max)
+
+        # Política de classificação de erros (retry / quarentena / backoff / reconexão)
+        self.error_policy = error_policy if error_policy is not None else ErrorPolicy()
 
         # Cache de endereços inválidos (ex.: Illegal Data Address)
         self.invalid_cache_ttl = float(invalid_cache_ttl)
@@ -73,52 +256,67 @@ class ModbusTCPResiliente:
 
         # ========== LOG ==========
         self.console = console
+        self.lightweight = lightweight
+        # Com logger compartilhado, as mensagens identificam o dispositivo
+        self._log_prefix = f"[{host}:{port}] " if lightweight and logger is None else ""
         if logger is not None:
             self.logger = logger
+        elif lightweight:
+            self.logger = _get_shared_logger(log_file, console)
         else:
-            logger_name = f"ModbusTCP.{host}:{port}"
-            self.logger = logging.getLogger(logger_name)
-            self.logger.setLevel(logging.INFO)
-            # Evita duplicar logs via root logger caso o usuário configure logging global.
-            self.logger.propagate = False
-
-            formatter = logging.Formatter("%(asctime)s | %(levelname)s | %(message)s")
-
-            if log_file:
-                abs_log_file = os.path.abspath(log_file)
-                has_file_handler = any(
-                    isinstance(h, RotatingFileHandler) and getattr(h, "baseFilename", None) == abs_log_file
-                    for h in self.logger.handlers
-                )
-                if not has_file_handler:
-                    file_handler = RotatingFileHandler(
-                        log_file,
-                        maxBytes=1_000_000,
-                        backupCount=3
-                    )
-                    file_handler.setFormatter(formatter)
-                    self.logger.addHandler(file_handler)
-
-            if console:
-                has_console_handler = any(
-                    isinstance(h, logging.StreamHandler) and not isinstance(h, RotatingFileHandler)
-                    for h in self.logger.handlers
-                )
-                if not has_console_handler:
-                    stream_handler = logging.StreamHandler()
-                    stream_handler.setFormatter(formatter)
-                    self.logger.addHandler(stream_handler)
-        self.client = ModbusClient(
-            host=host,
-            port=port,
-            unit_id=unit_id,
-            timeout=timeout,
+            self.logger = logging.getLogger(f"ModbusTCP.{host}:{port}")
+            _configure_logger(self.logger, log_file, console)
+
+        # ModbusClient é criado sob demanda (primeiro acesso a ``self.client``)
+        self._client = None
+
+        # Série temporal de saúde (criada no primeiro evento)
+        self.track_health = track_health
+        self.health: Optional[ClientHealth] = None
+
+        # Perfil amostrado por fase (desligado por padrão)
+        self.profiler: Optional["CallProfiler"] = None
+        self._profile_frame = None
+        if profile_sample_rate is not None:
+            self.enable_profiling(profile_sample_rate)
+
+    @property
+    def client(self):
+        """Cliente Modbus subjacente, criado no primeiro uso."""
+        if self._client is None:
+            self._client = self._create_client()
+        return self._client
+
+    @client.setter
+    def client(self, value) -> None:
+        self._client = value
+
+    def _create_client(self):
+        if self.backend == "native":
+            from .framing import NativeModbusClient
+
+            return NativeModbusClient(
+                host=self.host,
+                port=self.port,
+                unit_id=self.unit_id,
+                timeout=self.timeout,
+            )
+
+        from pyModbusTCP.client import ModbusClient
+
+        return ModbusClient(
+            host=self.host,
+            port=self.port,
+            unit_id=self.unit_id,
+            timeout=self.timeout,
             auto_open=True,
             auto_close=False
         )
 
+    @_in_phase("logging")
     def _log_and_print(self, level, message):
         """Registra mensagem no log e, opcionalmente, imprime no console."""
+        message = self._log_prefix + message
         if getattr(self, "console", False):
             print(message)
         getattr(self.logger, level)(message)
@@ -139,9 +337,14 @@ class ModbusTCPResiliente:
         jitter_factor = random.uniform(0.9, 1.1)
         return max(0.0, self.current_retry_delay * jitter_factor)
 
+    @_in_phase("backoff")
+    def _backoff_sleep(self) -> None:
+        """Aguarda o retry delay (com jitter) antes da próxima tentativa."""
+        time.sleep(self._get_retry_delay_with_jitter())
+
     # ================== INVALID ADDRESS CACHE ==================
     def _cache_key(self, area: str, addr: int, count: int):
-        return (area, int(addr), int(count))
+        return (self._active_unit_id, area, int(addr), int(count))
 
     def _is_invalid_cached(self, key):
         exp = self._invalid_addr_cache.get(key)
@@ -164,9 +367,13 @@ class ModbusTCPResiliente:
             self._invalid_addr_cache.pop(next(iter(self._invalid_addr_cache)), None)
         self._invalid_addr_cache[key] = now + self.invalid_cache_ttl
 
-    def clear_invalid_cache(self) -> None:
-        """Limpa o cache de endereços inválidos."""
-        self._invalid_addr_cache.clear()
+    def clear_invalid_cache(self, unit_id: Optional[int] = None) -> None:
+        """Limpa o cache de endereços inválidos (todo ou de um unit ID)."""
+        if unit_id is None:
+            self._invalid_addr_cache.clear()
+            return
+        for key in [k for k in self._invalid_addr_cache if k[0] == unit_id]:
+            self._invalid_addr_cache.pop(key, None)
 
     def get_invalid_cache_snapshot(self) -> List[tuple]:
         """Retorna uma lista de entradas do cache de endereços inválidos."""
@@ -179,6 +386,155 @@ class ModbusTCPResiliente:
             items.append((key, exp))
         return items
 
+    # ================== UNIT IDs (GATEWAYS) ==================
+    def unit(self, unit_id: int) -> ModbusUnit:
+        """Retorna uma visão do unit ID que compartilha esta conexão."""
+        if not isinstance(unit_id, int) or not (0 <= unit_id <= 255):
+            raise ValueError(f"unit_id inválido: {unit_id!r} (0..255)")
+        return ModbusUnit(self, unit_id)
+
+    @contextmanager
+    def _using_unit(self, unit_id: int):
+        previous = self._active_unit_id
+        self._active_unit_id = unit_id
+        try:
+            yield
+        finally:
+            self._active_unit_id = previous
+
+    def _unit_state(self, unit_id: int) -> _UnitState:
+        """Estado do unit ID, criado (respeitando ``unit_states_max``) se necessário."""
+        state = self._unit_states.get(unit_id)
+        if state is None:
+            if len(self._unit_states) >= self.unit_states_max:
+                self._prune_unit_states(self.unit_states_max - 1)
+            state = self._unit_states[unit_id] = _UnitState(self.base_retry_delay)
+        return state
+
+    @property
+    def fc23_supported(self) -> Optional[bool]:
+        """Suporte a FC23 do unit ID ativo (``None`` = ainda não testado).
+
+        Memorizado por unit ID: um gateway pode ter escravos com e sem FC23.
+        """
+        state = self._unit_states.get(self._active_unit_id)
+        return state.fc23_supported if state is not None else None
+
+    def _mark_unit_failure(self, unit_id: int) -> None:
+        state = self._unit_state(unit_id)
+        state.mark_failure(self.base_retry_delay, self.max_retry_delay)
+        self._log_and_print(
+            "warning",
+            f"Unit {unit_id} sem resposta (retry em {state.current_retry_delay:.1f}s)"
+        )
+
+    def _mark_unit_success(self, unit_id: int) -> None:
+        state = self._unit_states.get(unit_id)
+        if state is not None and state.failure_count:
+            state.mark_success(self.base_retry_delay)
+            self._log_and_print("info", f"Unit {unit_id} recuperado")
+
+    def _prune_unit_states(self, keep: int) -> None:
+        """Remove estados de unit IDs saudáveis primeiro, depois os mais antigos."""
+        for unit_id in [u for u, st in self._unit_states.items() if not st.failure_count]:
+            if len(self._unit_states) <= keep:
+                return
+            del self._unit_states[unit_id]
+        while len(self._unit_states) > keep:
+            del self._unit_states[next(iter(self._unit_states))]
+
+    def get_unit_states_snapshot(self) -> Dict[int, dict]:
+        """Retorna o estado de backoff (e suporte a FC23) de cada unit ID conhecido."""
+        now = time.monotonic()
+        return {
+            unit_id: {
+                "failure_count": state.failure_count,
+                "current_retry_delay": state.current_retry_delay,
+                "retry_in": max(0.0, state.retry_at - now),
+                "fc23_supported": state.fc23_supported,
+            }
+            for unit_id, state in self._unit_states.items()
+        }
+
+    # ================== MEMÓRIA ==================
+    def get_memory_usage(self) -> Dict[str, int]:
+        """Bytes usados pelo estado do cliente e por seus caches."""
+        state = sizeof_slots(self) + sizeof_slots(self.error_policy)
+        instance_dict = getattr(self, "__dict__", None)
+        if instance_dict:
+            state += sys.getsizeof(instance_dict)
+        invalid_cache = sizeof_cache(self._invalid_addr_cache)
+        unit_states = sys.getsizeof(self._unit_states) + sum(
+            sizeof_slots(st) for st in self._unit_states.values()
+        )
+        buffers = getattr(self._client, "buffer_bytes", 0) if self._client is not None else 0
+        health = self.health.memory_usage() if self.health is not None else 0
+        return {
+            "state": state,
+            "invalid_cache": invalid_cache,
+            "unit_states": unit_states,
+            "buffers": buffers,
+            "health": health,
+            "total": state + invalid_cache + unit_states + buffers + health,
+        }
+
+    # ================== SAÚDE ==================
+    def _health(self) -> Optional[ClientHealth]:
+        if self.health is None and self.track_health:
+            self.health = ClientHealth()
+        return self.health
+
+    def _set_health_state(self, state: str) -> None:
+        health = self._health()
+        if health is not None:
+            health.set_state(state)
+
+    def get_health_snapshot(self, window: float = 60.0) -> dict:
+        """Estado, transições, taxas, erros por tipo e percentis de latência."""
+        health = self._health()
+        return health.snapshot(window) if health is not None else {}
+
+    # ================== PROFILING ==================
+    def enable_profiling(self, sample_rate: float = 0.1) -> None:
+        """Liga o perfil por fase amostrando ``sample_rate`` das chamadas públicas.
+
+        Os métodos públicos (``@_profiled``) e as etapas internas
+        (``@_in_phase``) só medem tempo quando há um perfil ativo; o módulo
+        ``profiling`` é importado apenas aqui.
+        """
+        from .profiling import CallProfiler
+
+        self.profiler = CallProfiler(sample_rate)
+        self._profile_frame = None
+
+    def disable_profiling(self) -> None:
+        """Desliga o perfil e descarta os dados coletados."""
+        self.profiler = None
+        self._profile_frame = None
+
+    def get_profile_snapshot(self) -> dict:
+        """Tempo estimado por fase e por operação (vazio se o perfil estiver desligado)."""
+        return self.profiler.snapshot() if self.profiler is not None else {}
+
+    def trim_memory(self, max_bytes: int) -> int:
+        """Reduz caches até ``max_bytes`` (quarentena mais antiga primeiro).
+
+        Retorna os bytes liberados.
+        """
+        before = self.get_memory_usage()["total"]
+        self.get_invalid_cache_snapshot()  # descarta entradas expiradas
+        self._prune_unit_states(sum(1 for st in self._unit_states.values() if st.failure_count))
+        usage = self.get_memory_usage()
+        excess = usage["total"] - max_bytes
+        cache = self._invalid_addr_cache
+        if excess > 0 and cache:
+            # custo médio por entrada, incluindo a fatia do container do dict
+            per_entry = (usage["invalid_cache"] - sys.getsizeof({})) / len(cache)
+            drop = min(len(cache), int(excess // per_entry) + 1)
+            # recria o dict (um dict não encolhe ao remover chaves)
+            self._invalid_addr_cache = dict(list(cache.items())[drop:])
+        return max(0, before - self.get_memory_usage()["total"])
+
     def _get_client_state(self, attr: str, default=0):
         v = getattr(self.client, attr, default)
         try:
@@ -187,6 +543,7 @@ class ModbusTCPResiliente:
             return default
 
 
+    @_in_phase("connect")
     def _connect(self):
         """Abre conexão Modbus se ainda não estiver conectada."""
         if self.client.is_open:
@@ -199,6 +556,7 @@ class ModbusTCPResiliente:
             self._reset_backoff()
             return True
 
+        self._set_health_state(STATE_DISCONNECTED)
         self._log_and_print(
             "error",
             f"Falha na conexão (retry em {self.current_retry_delay:.1f}s)"
@@ -207,21 +565,34 @@ class ModbusTCPResiliente:
         self._increase_backoff()
         return False
 
+    @_in_phase("ping")
+    def _ping(self):
+        """Leitura de teste da conexão (sempre com o unit ID padrão)."""
+        return self.client.read_holding_registers(self.ping_addr, self.ping_count)
+
+    @_profiled
     def is_connected(self) -> bool:
         """Verifica conexão ativa via leitura Modbus real."""
+        reconnecting = not self.client.is_open
+        started = time.perf_counter()
         if not self._connect():
-            time.sleep(self._get_retry_delay_with_jitter())
+            self._backoff_sleep()
             return False
 
         try:
-            test = self.client.read_holding_registers(
-                self.ping_addr, self.ping_count
-            )
+            test = self._ping()
             if test is None:
                 raise Exception("Socket morto")
 
             self.failure_count = 0
             self._reset_backoff()
+            if reconnecting:
+                elapsed = time.perf_counter() - started
+                self.error_policy.record_reconnect_time(elapsed)
+                health = self._health()
+                if health is not None:
+                    health.record_reconnect(elapsed)
+            self._set_health_state(STATE_CONNECTED)
             return True
 
         except Exception:
@@ -230,72 +601,135 @@ class ModbusTCPResiliente:
                 f"Conexão perdida, reconectando (retry em {self.current_retry_delay:.1f}s)"
             )
             self.client.close()
+            self._set_health_state(STATE_DISCONNECTED)
             self.failure_count += 1
             self._increase_backoff()
-            time.sleep(self._get_retry_delay_with_jitter())
+            self._backoff_sleep()
             return False
 
     def close(self) -> None:
         """Fecha explicitamente a conexão Modbus."""
-        if self.client.is_open:
+        if self._client is not None and self._client.is_open:
             self.client.close()
             self._log_and_print("info", "Conexão encerrada")
 
-    def _handle_error(self, exc, context, close_connection=True):
-        """Trata erro Modbus padronizado."""
+    def _handle_error(self, exc, context, close_connection=None):
+        """Trata erro Modbus conforme a ErrorPolicy.
+
+        ``close_connection`` (True/False) força ou impede a reconexão,
+        ignorando a política.
+        """
         level = "warning" if isinstance(exc, ModbusProtocolError) else "error"
         self._log_and_print(level, f"{context}: {exc}")
 
-        if close_connection:
+        unit = exc.unit_id if exc.unit_id is not None else self._active_unit_id
+        if close_connection is None:
+            action = self.error_policy.rule_for(exc, unit).action
+        else:
+            action = ErrorAction.RECONNECT if close_connection else ErrorAction.RETRY
+        if not exc.rejected:
+            # Requisições recusadas antes do envio não inflam as estatísticas
+            self.error_policy.record(exc, action)
+            health = self._health()
+            if health is not None:
+                health.record_error(type(exc).__name__)
+
+        if action == ErrorAction.RECONNECT:
             self.client.close()
+            self._set_health_state(STATE_DISCONNECTED)
             self._increase_backoff()
+        elif action == ErrorAction.QUARANTINE:
+            self._mark_invalid_cached(exc.cache_key)
+        elif action == ErrorAction.BACKOFF and exc.unit_id is not None:
+            self._mark_unit_failure(exc.unit_id)
 
-    def _safe_read(self, action, error_msg, cache_key=None):
-        if cache_key is not None and self._is_invalid_cached(cache_key):
-            raise ModbusProtocolError(f"Endereço em quarentena (provável inexistente): {cache_key}")
-
-        if not self.is_connected():
-            raise ModbusConnectionError("Conexão indisponível")
-
-        result = action()
-        if result is None:
-            last_except = self._get_client_state("last_except", 0)
-            last_error = self._get_client_state("last_error", 0)
+    def _prepare_request(self, cache_key):
+        """Verifica quarentena, backoff do unit ID e conexão antes da requisição.
 
-            if last_except:
-                self._mark_invalid_cached(cache_key)
-                raise ModbusProtocolError(f"{error_msg} (Modbus exception={last_except})")
-
-            if last_error:
-                raise ModbusConnectionError(f"{error_msg} (socket/transport error={last_error})")
-
-            raise ModbusReadError(error_msg)
-
-        return result
-
-    def _safe_write(self, action, error_msg, cache_key=None):
+        As exceções daqui saem com ``rejected = True`` (nada foi enviado).
+        """
         if cache_key is not None and self._is_invalid_cached(cache_key):
-            raise ModbusProtocolError(f"Endereço em quarentena (provável inexistente): {cache_key}")
-
-        if not self.is_connected():
-            raise ModbusConnectionError("Conexão indisponível")
-
-        ok = action()
-        if not ok:
-            last_except = self._get_client_state("last_except", 0)
-            last_error = self._get_client_state("last_error", 0)
-
-            if last_except:
-                self._mark_invalid_cached(cache_key)
-                raise ModbusProtocolError(f"{error_msg} (Modbus exception={last_except})")
-
-            if last_error:
-                raise ModbusConnectionError(f"{error_msg} (socket/transport error={last_error})")
+            exc = ModbusProtocolError(f"Endereço em quarentena (provável inexistente): {cache_key}")
+        else:
+            unit = self._active_unit_id
+            state = self._unit_states.get(unit)
+            if state is not None and state.in_backoff():
+                exc = ModbusUnitError(f"Unit {unit} em backoff (retry em {state.current_retry_delay:.1f}s)")
+            elif not self.is_connected():
+                exc = ModbusConnectionError("Conexão indisponível")
+            else:
+                return
+        exc.rejected = True
+        raise exc
+
+    @_in_phase("request")
+    def _call_unit(self, action):
+        """Executa a requisição com o unit ID ativo (o ping usa sempre o unit ID padrão)."""
+        unit = self._active_unit_id
+        if unit == self.unit_id:
+            return action()
+        self.client.unit_id = unit
+        try:
+            return action()
+        finally:
+            self.client.unit_id = self.unit_id
+
+    def _request_error(self, error_msg, cache_key, default_exc) -> ModbusError:
+        """Converte last_except/last_error do cliente na exceção adequada."""
+        last_except = self._get_client_state("last_except", 0)
+        last_error = self._get_client_state("last_error", 0)
+        unit = self._active_unit_id
+
+        if last_except in GATEWAY_EXCEPTIONS:
+            exc = ModbusUnitError(f"{error_msg} (unit {unit}, Modbus exception={last_except})")
+        elif last_except:
+            exc = ModbusProtocolError(f"{error_msg} (Modbus exception={last_except})")
+        elif last_error == MB_TIMEOUT_ERR and unit != self.unit_id:
+            # Escravo atrás do gateway não respondeu: o gateway continua saudável
+            exc = ModbusUnitError(f"{error_msg} (unit {unit} sem resposta)")
+        elif last_error:
+            exc = ModbusConnectionError(f"{error_msg} (socket/transport error={last_error})")
+        else:
+            exc = default_exc(error_msg)
+
+        exc.unit_id = unit
+        exc.cache_key = cache_key
+        exc.exception_code = last_except or 0
+        return exc
+
+    def _execute(self, action, is_ok, error_msg, cache_key, default_exc):
+        """Executa a requisição, repetindo no mesmo socket quando a política permitir."""
+        self._prepare_request(cache_key)
+
+        health = self._health()
+        attempt = 0
+        while True:
+            started = time.perf_counter()
+            result = self._call_unit(action)
+            if health is not None:
+                health.record_request(time.perf_counter() - started, is_ok(result))
+            if is_ok(result):
+                if attempt:
+                    self.error_policy.record_retries(attempt, recovered=True)
+                self._mark_unit_success(self._active_unit_id)
+                return result
+
+            exc = self._request_error(error_msg, cache_key, default_exc)
+            rule = self.error_policy.rule_for(exc, self._active_unit_id)
+            if attempt >= rule.retries or not self.client.is_open:
+                if attempt:
+                    self.error_policy.record_retries(attempt, recovered=False)
+                raise exc
+            attempt += 1
 
-            raise ModbusWriteError(error_msg)
+    def _safe_read(self, action, error_msg, cache_key=None):
+        return self._execute(action, lambda r: r is not None, error_msg, cache_key, ModbusReadError)
 
+    def _safe_write(self, action, error_msg, cache_key=None):
+        self._execute(action, bool, error_msg, cache_key, ModbusWriteError)
         return True
 
+    @_profiled
     def read_discrete_inputs_safe(self, addr: int, count: int) -> Optional[List[bool]]:
         """Lê Discrete Inputs com reconexão automática."""
         try:
@@ -305,10 +739,10 @@ class ModbusTCPResiliente:
                 cache_key=self._cache_key("di", addr, count)
             )
         except ModbusError as e:
-            close_conn = isinstance(e, (ModbusConnectionError, ModbusReadError, ModbusWriteError)) and not isinstance(e, ModbusProtocolError)
-            self._handle_error(e, "read_discrete_inputs_safe", close_connection=close_conn)
+            self._handle_error(e, "read_discrete_inputs_safe")
             return None
 
+    @_profiled
     def read_coils_safe(self, addr: int, count: int) -> Optional[List[bool]]:
         """Lê Coils com reconexão automática."""
         try:
@@ -318,10 +752,10 @@ class ModbusTCPResiliente:
                 cache_key=self._cache_key("c", addr, count)
             )
         except ModbusError as e:
-            close_conn = isinstance(e, (ModbusConnectionError, ModbusReadError, ModbusWriteError)) and not isinstance(e, ModbusProtocolError)
-            self._handle_error(e, "read_coils_safe", close_connection=close_conn)
+            self._handle_error(e, "read_coils_safe")
             return None
 
+    @_profiled
     def write_single_coil_safe(self, addr: int, value: bool) -> bool:
         """Escreve Single Coil."""
         try:
@@ -331,10 +765,10 @@ class ModbusTCPResiliente:
                 cache_key=self._cache_key("c", addr, 1)
             )
         except ModbusError as e:
-            close_conn = isinstance(e, (ModbusConnectionError, ModbusReadError, ModbusWriteError)) and not isinstance(e, ModbusProtocolError)
-            self._handle_error(e, "write_single_coil_safe", close_connection=close_conn)
+            self._handle_error(e, "write_single_coil_safe")
             return False
 
+    @_profiled
     def write_multiple_coils_safe(self, addr: int, values: Sequence[bool]) -> bool:
         """Escreve múltiplas Coils."""
         try:
@@ -344,10 +778,10 @@ class ModbusTCPResiliente:
                 cache_key=self._cache_key("c", addr, len(values))
             )
         except ModbusError as e:
-            close_conn = isinstance(e, (ModbusConnectionError, ModbusReadError, ModbusWriteError)) and not isinstance(e, ModbusProtocolError)
-            self._handle_error(e, "write_multiple_coils_safe", close_connection=close_conn)
+            self._handle_error(e, "write_multiple_coils_safe")
             return False
 
+    @_profiled
     def read_input_registers_safe(self, addr: int, count: int) -> Optional[List[int]]:
         """Lê Input Registers com reconexão automática."""
         try:
@@ -357,10 +791,10 @@ class ModbusTCPResiliente:
                 cache_key=self._cache_key("ir", addr, count)
             )
         except ModbusError as e:
-            close_conn = isinstance(e, (ModbusConnectionError, ModbusReadError, ModbusWriteError)) and not isinstance(e, ModbusProtocolError)
-            self._handle_error(e, "read_input_registers_safe", close_connection=close_conn)
+            self._handle_error(e, "read_input_registers_safe")
             return None
 
+    @_profiled
     def read_holding_registers_safe(self, addr: int, count: int) -> Optional[List[int]]:
         """Lê Holding Registers com reconexão automática."""
         try:
@@ -370,10 +804,10 @@ class ModbusTCPResiliente:
                 cache_key=self._cache_key("hr", addr, count)
             )
         except ModbusError as e:
-            close_conn = isinstance(e, (ModbusConnectionError, ModbusReadError, ModbusWriteError)) and not isinstance(e, ModbusProtocolError)
-            self._handle_error(e, "read_holding_registers_safe", close_connection=close_conn)
+            self._handle_error(e, "read_holding_registers_safe")
             return None
 
+    @_profiled
     def write_single_register_safe(self, addr: int, value: int) -> bool:
         """Escreve Single Holding Register."""
         try:
@@ -383,10 +817,10 @@ class ModbusTCPResiliente:
                 cache_key=self._cache_key("hr", addr, 1)
             )
         except ModbusError as e:
-            close_conn = isinstance(e, (ModbusConnectionError, ModbusReadError, ModbusWriteError)) and not isinstance(e, ModbusProtocolError)
-            self._handle_error(e, "write_single_register_safe", close_connection=close_conn)
+            self._handle_error(e, "write_single_register_safe")
             return False
 
+    @_profiled
     def write_multiple_registers_safe(self, addr: int, values: Sequence[int]) -> bool:
         """Escreve múltiplos Holding Registers."""
         try:
@@ -396,10 +830,10 @@ class ModbusTCPResiliente:
                 cache_key=self._cache_key("hr", addr, len(values))
             )
         except ModbusError as e:
-            close_conn = isinstance(e, (ModbusConnectionError, ModbusReadError, ModbusWriteError)) and not isinstance(e, ModbusProtocolError)
-            self._handle_error(e, "write_multiple_registers_safe", close_connection=close_conn)
+            self._handle_error(e, "write_multiple_registers_safe")
             return False
 
+    @_profiled
     def write_read_multiple_registers_safe(
         self,
         write_addr: int,
@@ -419,122 +853,489 @@ class ModbusTCPResiliente:
                 "Falha Write/Read Multiple Registers"
             )
         except ModbusError as e:
-            close_conn = isinstance(
-                e,
-                (ModbusConnectionError, ModbusReadError, ModbusWriteError),
-            ) and not isinstance(e, ModbusProtocolError)
-            self._handle_error(e, "write_read_multiple_registers_safe", close_connection=close_conn)
-        
+            self._handle_error(e, "write_read_multiple_registers_safe")
+            return None
+
     def _dtype_register_count(self, dtype: ModbusDataType) -> int:
         """Retorna quantos registradores (16-bit) o tipo ocupa."""
         return dtype.registers
 
+    @_in_phase("conversion")
+    def _decode_typed(self, regs, dtype: ModbusDataType, endian: Endian):
+        """Converte registradores brutos conforme ModbusDataType."""
+        if dtype == ModbusDataType.UINT16:
+            return int(regs[0])
+        if dtype == ModbusDataType.INT16:
+            return self._reg_to_int16(regs[0])
+        if dtype == ModbusDataType.UINT32:
+            return self._regs_to_uint32(regs, endian)
+        if dtype == ModbusDataType.INT32:
+            return self._regs_to_int32(regs, endian)
+        if dtype == ModbusDataType.UINT64:
+            return self._regs_to_uint64(regs, endian)
+        if dtype == ModbusDataType.INT64:
+            return self._regs_to_int64(regs, endian)
+        if dtype == ModbusDataType.FLOAT32:
+            return self._regs_to_float32(regs, endian)
+        if dtype == ModbusDataType.FLOAT64:
+            return self._regs_to_float64(regs, endian)
+        raise ModbusConversionError(f"Tipo não suportado: {dtype}")
+
+    @_profiled
     def read_holding_typed_safe(
         self,
         addr: int,
         dtype: ModbusDataType,
         endian: Endian = Endian.BE,
+        scaling: Optional["Scaling"] = None,
     ) -> Optional[Union[int, float]]:
-        """Lê Holding Register e converte conforme ModbusDataType."""
+        """Lê Holding Register e converte conforme ModbusDataType (e ``scaling``, se houver)."""
         count = self._dtype_register_count(dtype)
         regs = self.read_holding_registers_safe(addr, count)
         if regs is None:
             return None
         try:
-            if dtype == ModbusDataType.UINT16:
-                return int(regs[0])
-            if dtype == ModbusDataType.INT16:
-                return self._reg_to_int16(regs[0])
-            if dtype == ModbusDataType.UINT32:
-                return self._regs_to_uint32(regs, endian)
-            if dtype == ModbusDataType.INT32:
-                return self._regs_to_int32(regs, endian)
-            if dtype == ModbusDataType.UINT64:
-                return self._regs_to_uint64(regs, endian)
-            if dtype == ModbusDataType.INT64:
-                return self._regs_to_int64(regs, endian)
-            if dtype == ModbusDataType.FLOAT32:
-                return self._regs_to_float32(regs, endian)
-            if dtype == ModbusDataType.FLOAT64:
-                return self._regs_to_float64(regs, endian)
-            raise ModbusConversionError(f"Tipo não suportado: {dtype}")
+            value = self._decode_typed(regs, dtype, endian)
         except ModbusConversionError as exc:
             self._handle_error(exc, f"read_holding_typed_safe[{dtype.value}]")
             return None
+        return value if scaling is None else scaling.to_eu((value,))[0]
 
+    @_profiled
     def read_input_typed_safe(
         self,
         addr: int,
         dtype: ModbusDataType,
         endian: Endian = Endian.BE,
+        scaling: Optional["Scaling"] = None,
     ) -> Optional[Union[int, float]]:
-        """Lê Input Register e converte conforme ModbusDataType."""
+        """Lê Input Register e converte conforme ModbusDataType (e ``scaling``, se houver)."""
         count = self._dtype_register_count(dtype)
         regs = self.read_input_registers_safe(addr, count)
         if regs is None:
             return None
         try:
-            if dtype == ModbusDataType.UINT16:
-                return int(regs[0])
-            if dtype == ModbusDataType.INT16:
-                return self._reg_to_int16(regs[0])
-            if dtype == ModbusDataType.UINT32:
-                return self._regs_to_uint32(regs, endian)
-            if dtype == ModbusDataType.INT32:
-                return self._regs_to_int32(regs, endian)
-            if dtype == ModbusDataType.UINT64:
-                return self._regs_to_uint64(regs, endian)
-            if dtype == ModbusDataType.INT64:
-                return self._regs_to_int64(regs, endian)
-            if dtype == ModbusDataType.FLOAT32:
-                return self._regs_to_float32(regs, endian)
-            if dtype == ModbusDataType.FLOAT64:
-                return self._regs_to_float64(regs, endian)
-            raise ModbusConversionError(f"Tipo não suportado: {dtype}")
+            value = self._decode_typed(regs, dtype, endian)
         except ModbusConversionError as exc:
             self._handle_error(exc, f"read_input_typed_safe[{dtype.value}]")
             return None
+        return value if scaling is None else scaling.to_eu((value,))[0]
+
+    @_profiled
+    def read_holding_array_safe(
+        self,
+        addr: int,
+        count: int,
+        dtype: ModbusDataType = ModbusDataType.UINT16,
+        endian: Endian = Endian.BE,
+        scaling: Optional["Scaling"] = None,
+    ) -> Optional[List[Union[int, float]]]:
+        """Lê ``count`` valores consecutivos do mesmo tipo em Holding Registers.
+
+        A decodificação e o ``scaling`` são aplicados ao array inteiro de uma vez;
+        leituras acima de 125 registradores são divididas sem separar valores.
+        """
+        return self._read_array(
+            self.read_holding_registers_safe, addr, count, dtype, endian, scaling, "read_holding_array_safe"
+        )
+
+    @_profiled
+    def read_input_array_safe(
+        self,
+        addr: int,
+        count: int,
+        dtype: ModbusDataType = ModbusDataType.UINT16,
+        endian: Endian = Endian.BE,
+        scaling: Optional["Scaling"] = None,
+    ) -> Optional[List[Union[int, float]]]:
+        """Lê ``count`` valores consecutivos do mesmo tipo em Input Registers."""
+        return self._read_array(
+            self.read_input_registers_safe, addr, count, dtype, endian, scaling, "read_input_array_safe"
+        )
+
+    def _read_array(self, reader, addr, count, dtype, endian, scaling, context):
+        """Leitura em blocos + decodificação vetorizada + scaling em uma passada."""
+        from .codec import MAX_READ_REGISTERS
+
+        width = dtype.registers
+        chunk = (MAX_READ_REGISTERS // width) * width
+        total = count * width
+        regs: List[int] = []
+        for offset in range(0, total, chunk):
+            data = reader(addr + offset, min(chunk, total - offset))
+            if data is None:
+                return None
+            regs.extend(data)
+        try:
+            return self._decode_array(regs, dtype, endian, scaling)
+        except ModbusConversionError as exc:
+            self._handle_error(exc, f"{context}[{dtype.value}]")
+            return None
+
+    @_in_phase("conversion")
+    def _decode_array(self, regs, dtype, endian, scaling) -> List[Union[int, float]]:
+        """Decodificação vetorizada seguida do scaling do array inteiro."""
+        from .codec import decode_values
+
+        values = decode_values(regs, dtype, endian)
+        return values if scaling is None else scaling.to_eu(values)
 
+    @_profiled
+    def read_plan_safe(
+        self,
+        plan: "ReadPlan",
+        scan_rate: Optional[float] = None,
+    ) -> Dict[str, Optional[Union[int, float, bool]]]:
+        """Executa um plano de leitura compilado e retorna valores por nome de tag.
+
+        Cada bloco do plano gera uma única requisição Modbus. Tags de blocos com
+        falha (ou com erro de conversão) retornam ``None``.
+        """
+        readers = self._area_readers()
+        values = {}
+        for block in plan.blocks_for(scan_rate):
+            data = readers[block.area](block.addr, block.count)
+            self._decode_block(block, data, values, "read_plan_safe")
+        return values
+
+    def _area_readers(self):
+        """Funções de leitura segura por área Modbus."""
+        return {
+            "hr": self.read_holding_registers_safe,
+            "ir": self.read_input_registers_safe,
+            "c": self.read_coils_safe,
+            "di": self.read_discrete_inputs_safe,
+        }
+
+    def _decode_block(self, block, data, values, context) -> None:
+        """Converte os dados de um ReadBlock em valores escalonados por tag.
+
+        Tags com ``scaling`` são convertidas para EU em uma única passada por
+        objeto Scaling (e não valor a valor).
+        """
+        from .tagmap import BIT_AREAS
+
+        if data is None:
+            for tag in block.tags:
+                values[tag.name] = None
+            return
+        if block.area in BIT_AREAS:
+            for tag in block.tags:
+                values[tag.name] = bool(data[tag.addr - block.addr])
+            return
+
+        scaled = {}
+        for tag in block.tags:
+            start = tag.addr - block.addr
+            try:
+                raw = self._decode_typed(data[start:start + tag.count], tag.dtype, tag.endian)
+            except ModbusConversionError as exc:
+                self._handle_error(exc, f"{context}[{tag.name}]")
+                values[tag.name] = None
+                continue
+            if tag.scaling is None:
+                values[tag.name] = tag.apply_linear(raw)
+            else:
+                group = scaled.get(tag.scaling)
+                if group is None:
+                    group = scaled[tag.scaling] = ([], [])
+                group[0].append(tag)
+                group[1].append(raw)
+
+        for scaling, (tags, raws) in scaled.items():
+            for tag, value in zip(tags, scaling.to_eu(raws)):
+                values[tag.name] = tag.apply_linear(value)
+
+    @_profiled
+    def read_snapshot_safe(
+        self,
+        blocks: Union["ReadPlan", Sequence],
+        seq_addr: Optional[int] = None,
+        seq_area: str = "hr",
+        max_retries: int = 2,
+        scan_rate: Optional[float] = None,
+    ) -> "Snapshot":
+        """Lê vários blocos como um snapshot, com timestamp e latência por bloco.
+
+        ``blocks`` pode ser um ReadPlan, ReadBlocks ou tuplas ``(area, addr, count)``.
+        Com ``seq_addr`` (contador de ciclo do CLP) o contador é lido entre os
+        blocos; blocos lidos fora do ciclo de referência (o último observado) são
+        relidos, até ``max_retries`` vezes, sem repetir os blocos consistentes.
+        """
+        from .snapshot import Snapshot, snapshot_blocks
+
+        readers = self._area_readers()
+        readings = snapshot_blocks(blocks, scan_rate)
+        snap = Snapshot(readings, seq_addr=seq_addr)
+
+        def read_seq():
+            snap.requests += 1
+            regs = readers[seq_area](seq_addr, 1)
+            return None if regs is None else regs[0]
+
+        pending = readings
+        for attempt in range(max_retries + 1):
+            if attempt:
+                snap.retried_blocks += len(pending)
+            seq = read_seq() if seq_addr is not None else None
+            for reading in pending:
+                start = time.perf_counter()
+                reading.data = readers[reading.area](reading.addr, reading.count)
+                reading.latency = time.perf_counter() - start
+                reading.timestamp = time.time()
+                reading.attempts += 1
+                snap.requests += 1
+                if seq_addr is not None:
+                    reading.seq_before = seq
+                    seq = read_seq()
+                    reading.seq_after = seq
+
+            if seq_addr is None or seq is None:
+                break
+            snap.sequence = seq
+            pending = snap.inconsistent_blocks
+            if not pending:
+                break
+
+        for reading in readings:
+            if reading.block is not None:
+                self._decode_block(reading.block, reading.data, snap.values, "read_snapshot_safe")
+        return snap
+
+    @_profiled
     def write_holding_typed_safe(
         self,
         addr: int,
         value: Union[int, float],
         dtype: ModbusDataType,
         endian: Endian = Endian.BE,
+        scaling: Optional["Scaling"] = None,
     ) -> bool:
-        """Escreve em Holding Register conforme ModbusDataType."""
+        """Escreve em Holding Register conforme ModbusDataType.
+
+        Com ``scaling`` o valor é informado em EU e convertido para o bruto
+        (arredondado em tipos inteiros) antes da codificação.
+        """
         try:
-            if dtype == ModbusDataType.UINT16:
-                v = int(value)
-                if not (0 <= v <= 0xFFFF):
-                    raise ModbusConversionError("UINT16 fora do range")
-                return self.write_single_register_safe(addr, v)
-            if dtype == ModbusDataType.INT16:
-                reg = self._int16_to_reg(value)
-                return self.write_single_register_safe(addr, reg)
-            if dtype == ModbusDataType.UINT32:
-                regs = self._uint32_to_regs(value, endian)
-                return self.write_multiple_registers_safe(addr, regs)
-            if dtype == ModbusDataType.INT32:
-                regs = self._int32_to_regs(value, endian)
-                return self.write_multiple_registers_safe(addr, regs)
-            if dtype == ModbusDataType.UINT64:
-                regs = self._uint64_to_regs(value, endian)
-                return self.write_multiple_registers_safe(addr, regs)
-            if dtype == ModbusDataType.INT64:
-                regs = self._int64_to_regs(value, endian)
-                return self.write_multiple_registers_safe(addr, regs)
-            if dtype == ModbusDataType.FLOAT32:
-                regs = self._float32_to_regs(value, endian)
-                return self.write_multiple_registers_safe(addr, regs)
-            if dtype == ModbusDataType.FLOAT64:
-                regs = self._float64_to_regs(value, endian)
-                return self.write_multiple_registers_safe(addr, regs)
-            raise ModbusConversionError(f"Tipo não suportado: {dtype}")
+            if scaling is not None:
+                from .codec import scale_to_raw
+
+                value = scale_to_raw((value,), scaling, dtype)[0]
+            regs = self._encode_typed(value, dtype, endian)
         except ModbusConversionError as exc:
             self._handle_error(exc, f"write_holding_typed_safe[{dtype.value}]")
             return False
+        if len(regs) == 1:
+            return self.write_single_register_safe(addr, regs[0])
+        return self.write_multiple_registers_safe(addr, regs)
+
+    @_profiled
+    def write_typed_batch_safe(self, entries: Sequence[Sequence]) -> bool:
+        """Escreve um lote de valores tipados com o mínimo de requisições FC16.
+
+        ``entries``: ``(addr, value, dtype)``, ``(addr, value, dtype, endian)`` ou
+        ``(addr, value, dtype, endian, scaling)`` (valor em EU). Todos os
+        valores são validados e codificados antes do envio (nada é escrito se
+        algum for inválido); entradas contíguas formam uma única imagem de
+        registradores, enviada em blocos de até 123 registradores.
+        Entradas sobrepostas são rejeitadas como ``ModbusConversionError``.
+
+        A escrita não é atômica: se um bloco falhar, os blocos anteriores já
+        foram escritos e os seguintes não são enviados. Nesse caso os
+        intervalos não escritos são registrados no log antes de retornar ``False``.
+        """
+        try:
+            requests = self._encode_batch(entries)
+        except ModbusConversionError as exc:
+            self._handle_error(exc, "write_typed_batch_safe")
+            return False
+        for i, (addr, regs) in enumerate(requests):
+            if not self.write_multiple_registers_safe(addr, regs):
+                if i:
+                    pending = ", ".join(f"{a}-{a + len(r) - 1}" for a, r in requests[i:])
+                    self._log_and_print(
+                        "error",
+                        f"write_typed_batch_safe: escrita parcial ({i}/{len(requests)} blocos); "
+                        f"não escritos: {pending}",
+                    )
+                return False
+        return True
+
+    @_in_phase("conversion")
+    def _encode_batch(self, entries: Sequence[Sequence]) -> List[tuple]:
+        """Codifica o lote e monta as requisições FC16 (``(addr, regs)``)."""
+        from .codec import build_image, encode_entries
 
+        return build_image(encode_entries(entries))
+
+    @_profiled
+    def write_verified_safe(
+        self,
+        setpoints: Sequence[Sequence],
+        rel_tol: float = 1e-6,
+        abs_tol: float = 1e-6,
+        use_fc23: Optional[bool] = None,
+    ) -> "VerifiedWriteReport":
+        """Escreve um lote de setpoints e confere cada valor lendo de volta.
+
+        ``setpoints``: ``(addr, value, dtype)`` ou ``(addr, value, dtype, endian)``.
+        Setpoints contíguos são escritos juntos. Com FC23 cada intervalo é escrito
+        e lido em uma única requisição; sem suporte (``use_fc23=False`` ou Illegal
+        Function detectado) usa FC16 + leitura em lote dos intervalos contíguos.
+        Floats são comparados com ``rel_tol``/``abs_tol``. Retorna um único
+        relatório com todas as divergências e falhas do lote. Se a conexão cair,
+        os intervalos ainda não enviados são marcados como falha sem novas
+        tentativas (cada tentativa esperaria o backoff de reconexão).
+        """
+        from .codec import MAX_FC23_WRITE, MAX_WRITE_REGISTERS
+        from .verify import (
+            VerifiedWriteReport,
+            WriteMismatch,
+            _Setpoint,
+            group_runs,
+            invalid_setpoint,
+            parse_setpoint,
+            read_ranges,
+            values_match,
+        )
+
+        report = VerifiedWriteReport()
+        encoded = []
+        for item in setpoints:
+            report.total += 1
+            try:
+                addr, value, dtype, endian = parse_setpoint(item)
+            except ModbusConversionError as exc:
+                self._handle_error(exc, "write_verified_safe")
+                report.failed.append(WriteMismatch(*invalid_setpoint(item), reason=str(exc)))
+                continue
+            try:
+                regs = self._encode_typed(value, dtype, endian)
+            except ModbusConversionError as exc:
+                self._handle_error(exc, f"write_verified_safe[{addr}]")
+                report.failed.append(WriteMismatch(addr, dtype, value, reason=str(exc)))
+                continue
+            encoded.append(_Setpoint(addr, value, dtype, endian, regs))
+
+        def check(run, data):
+            offset = 0
+            for sp in run.members:
+                chunk = data[offset:offset + len(sp.regs)]
+                offset += len(sp.regs)
+                try:
+                    actual = self._decode_typed(chunk, sp.dtype, sp.endian)
+                except ModbusConversionError as exc:
+                    report.failed.append(WriteMismatch(sp.addr, sp.dtype, sp.value, reason=str(exc)))
+                    continue
+                if values_match(sp.value, actual, sp.dtype, rel_tol, abs_tol):
+                    report.verified += 1
+                else:
+                    report.mismatches.append(WriteMismatch(sp.addr, sp.dtype, sp.value, actual))
+
+        def fail(run, reason):
+            for sp in run.members:
+                report.failed.append(WriteMismatch(sp.addr, sp.dtype, sp.value, reason=reason))
+
+        def connection_lost(runs) -> bool:
+            """Após uma falha: com a conexão fechada, desiste dos ``runs`` restantes."""
+            if self.client.is_open:
+                return False
+            for run in runs:
+                fail(run, "conexão indisponível")
+            return True
+
+        if use_fc23 is None:
+            use_fc23 = self.fc23_supported is not False
+
+        try:
+            pending = group_runs(encoded, MAX_FC23_WRITE if use_fc23 else MAX_WRITE_REGISTERS)
+        except ModbusConversionError as exc:
+            # Setpoints sobrepostos: nada é escrito
+            self._handle_error(exc, "write_verified_safe")
+            for sp in encoded:
+                report.failed.append(WriteMismatch(sp.addr, sp.dtype, sp.value, reason=str(exc)))
+            return report
+        if use_fc23:
+            report.method = "fc23"
+            remaining = []
+            for i, run in enumerate(pending):
+                if remaining:
+                    remaining.extend(run.members)
+                    continue
+                report.requests += 1
+                data = self.write_read_multiple_registers_safe(run.addr, run.regs, run.addr, len(run.regs))
+                if data is not None:
+                    self._unit_state(self._active_unit_id).fc23_supported = True
+                    check(run, data)
+                elif self._get_client_state("last_except", 0) == EXP_ILLEGAL_FUNCTION:
+                    self._unit_state(self._active_unit_id).fc23_supported = False
+                    remaining.extend(run.members)
+                else:
+                    fail(run, "falha Write/Read Multiple Registers")
+                    if connection_lost(pending[i + 1:]):
+                        break
+            pending = group_runs(remaining, MAX_WRITE_REGISTERS) if remaining else []
+            if pending:
+                report.method = "fc23+fc16"
+
+        if pending:
+            report.method = report.method or "fc16"
+            written = []
+            for i, run in enumerate(pending):
+                report.requests += 1
+                if self.write_multiple_registers_safe(run.addr, run.regs):
+                    written.append(run)
+                else:
+                    fail(run, "falha de escrita")
+                    if connection_lost(pending[i + 1:]):
+                        break
+            readback = {}
+            for addr, count in read_ranges(written):
+                report.requests += 1
+                data = self.read_holding_registers_safe(addr, count)
+                if data is not None:
+                    readback.update(zip(range(addr, addr + count), data))
+                elif not self.client.is_open:
+                    break  # os intervalos sem leitura falham abaixo
+            for run in written:
+                if all(a in readback for a in range(run.addr, run.end)):
+                    check(run, [readback[a] for a in range(run.addr, run.end)])
+                else:
+                    fail(run, "falha na leitura de verificação")
+
+        if not report.ok:
+            self._log_and_print(
+                "warning",
+                f"write_verified_safe: {len(report.mismatches)} divergência(s), "
+                f"{len(report.failed)} falha(s) em {report.total} setpoint(s)",
+            )
+        return report
+
+    @_in_phase("conversion")
+    def _encode_typed(self, value, dtype: ModbusDataType, endian: Endian) -> List[int]:
+        """Converte um valor em registradores conforme ModbusDataType."""
+        if dtype == ModbusDataType.UINT16:
+            v = int(value)
+            if not (0 <= v <= 0xFFFF):
+                raise ModbusConversionError("UINT16 fora do range")
+            return [v]
+        if dtype == ModbusDataType.INT16:
+            return [self._int16_to_reg(value)]
+        if dtype == ModbusDataType.UINT32:
+            return self._uint32_to_regs(value, endian)
+        if dtype == ModbusDataType.INT32:
+            return self._int32_to_regs(value, endian)
+        if dtype == ModbusDataType.UINT64:
+            return self._uint64_to_regs(value, endian)
+        if dtype == ModbusDataType.INT64:
+            return self._int64_to_regs(value, endian)
+        if dtype == ModbusDataType.FLOAT32:
+            return self._float32_to_regs(value, endian)
+        if dtype == ModbusDataType.FLOAT64:
+            return self._float64_to_regs(value, endian)
+        raise ModbusConversionError(f"Tipo não suportado: {dtype}")
+
+    @_profiled
     def read_holding_int16_safe(self, addr: int) -> Optional[int]:
         """Lê um Inteiro de 16 bits com sinal como um único Holding Register."""
         regs = self.read_holding_registers_safe(addr, 1)
@@ -554,6 +1355,7 @@ class ModbusTCPResiliente:
 
         return value & 0xFFFF
     
+    @_profiled
     def read_input_int16_safe(self, addr: int) -> Optional[int]:
         """Lê INT16 de Input Register."""
         try:
@@ -567,6 +1369,7 @@ class ModbusTCPResiliente:
             self._handle_error(e, "read_input_int16_safe")
             return None
         
+    @_profiled
     def write_holding_int16_safe(self, addr: int, value: int) -> bool:
         """Escreve INT16 em Holding Register."""
         try:
@@ -633,6 +1436,7 @@ class ModbusTCPResiliente:
         unsigned = value & 0xFFFFFFFF
         return self._uint32_to_regs_core(unsigned, endian)
 
+    @_profiled
     def read_holding_uint32_safe(
         self,
         addr: int,
@@ -641,6 +1445,7 @@ class ModbusTCPResiliente:
         """Lê UINT32 de Holding Register."""
         return self.read_holding_typed_safe(addr, ModbusDataType.UINT32, endian)
 
+    @_profiled
     def write_holding_uint32_safe(
         self,
         addr: int,
@@ -650,6 +1455,7 @@ class ModbusTCPResiliente:
         """Escreve UINT32 em Holding Register."""
         return self.write_holding_typed_safe(addr, value, ModbusDataType.UINT32, endian)
     
+    @_profiled
     def read_holding_int32_safe(
         self,
         addr: int,
@@ -658,6 +1464,7 @@ class ModbusTCPResiliente:
         """Lê INT32 de Holding Register."""
         return self.read_holding_typed_safe(addr, ModbusDataType.INT32, endian)
 
+    @_profiled
     def write_holding_int32_safe(
         self,
         addr: int,
@@ -747,6 +1554,7 @@ class ModbusTCPResiliente:
         unsigned = value & 0xFFFFFFFFFFFFFFFF
         return self._uint64_to_regs_core(unsigned, endian)
 
+    @_profiled
     def read_holding_uint64_safe(
         self,
         addr: int,
@@ -755,6 +1563,7 @@ class ModbusTCPResiliente:
         """Lê UINT64 de Holding Register."""
         return self.read_holding_typed_safe(addr, ModbusDataType.UINT64, endian)
 
+    @_profiled
     def write_holding_uint64_safe(
         self,
         addr: int,
@@ -764,6 +1573,7 @@ class ModbusTCPResiliente:
         """Escreve UINT64 em Holding Register."""
         return self.write_holding_typed_safe(addr, value, ModbusDataType.UINT64, endian)
 
+    @_profiled
     def read_holding_int64_safe(
         self,
         addr: int,
@@ -772,6 +1582,7 @@ class ModbusTCPResiliente:
         """Lê INT64 de Holding Register."""
         return self.read_holding_typed_safe(addr, ModbusDataType.INT64, endian)
 
+    @_profiled
     def write_holding_int64_safe(
         self,
         addr: int,
@@ -798,6 +1609,7 @@ class ModbusTCPResiliente:
 
         return self._uint32_to_regs_core(encoded, endian)
 
+    @_profiled
     def read_holding_float32_safe(
         self,
         addr: int,
@@ -806,6 +1618,7 @@ class ModbusTCPResiliente:
         """Lê FLOAT32 de Holding Register."""
         return self.read_holding_typed_safe(addr, ModbusDataType.FLOAT32, endian)
 
+    @_profiled
     def read_input_float32_safe(
         self,
         addr: int,
@@ -814,6 +1627,7 @@ class ModbusTCPResiliente:
         """Lê FLOAT32 de Input Register."""
         return self.read_input_typed_safe(addr, ModbusDataType.FLOAT32, endian)
 
+    @_profiled
     def write_holding_float32_safe(
         self,
         addr: int,
@@ -840,6 +1654,7 @@ class ModbusTCPResiliente:
 
         return self._uint64_to_regs_core(encoded, endian)
 
+    @_profiled
     def read_holding_float64_safe(
         self,
         addr: int,
@@ -848,6 +1663,7 @@ class ModbusTCPResiliente:
         """Lê FLOAT64 (DOUBLE) de Holding Register."""
         return self.read_holding_typed_safe(addr, ModbusDataType.FLOAT64, endian)
 
+    @_profiled
     def read_input_float64_safe(
         self,
         addr: int,
@@ -856,6 +1672,7 @@ class ModbusTCPResiliente:
         """Lê FLOAT64 (DOUBLE) de Input Register."""
         return self.read_input_typed_safe(addr, ModbusDataType.FLOAT64, endian)
 
+    @_profiled
     def write_holding_float64_safe(
         self,
         addr: int,
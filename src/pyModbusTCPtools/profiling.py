@@ -0,0 +1,211 @@
+"""
+Opt-in, sampled profiling of where a client's time goes.
+
+This module is only imported by ``ModbusTCPResiliente.enable_profiling`` (and
+for ``fleet_profile`` / ``format_profile``). The client's public methods
+(``*_safe`` and ``is_connected``) are decorated with ``_profiled`` and its
+internal steps with ``_in_phase``; both return immediately when the client
+has no profiler. With a profiler, the first of every ``round(1 / sample_rate)``
+calls *of each operation* is profiled, so operations interleaved in a poll
+cycle are all sampled. A ``CallFrame`` attributes the call's wall time
+(``time.perf_counter``, monotonic) to exclusive phases:
+
+- ``connect``:    opening the socket in ``is_connected``;
+- ``ping``:       the liveness read in ``is_connected``;
+- ``request``:    the Modbus request itself (retries included);
+- ``conversion``: typed, array and batch conversions (``_decode_typed``,
+                  ``_encode_typed``, ``_decode_array``, ``_encode_batch``);
+- ``logging``:    ``_log_and_print`` (formatting, handlers, console);
+- ``backoff``:    ``time.sleep`` between reconnection attempts;
+- ``other``:      everything else (bookkeeping, policy, health tracking).
+
+Nested phases are exclusive (logging inside ``connect`` is not counted
+twice), so the phases of a call add up to its duration. Unsampled calls only
+increment a counter; averages from the sampled calls are scaled by the call
+count to estimate totals. ``fleet_profile`` ranks devices and operations
+across many clients and ``format_profile`` renders it as a text report.
+"""
+
+import time
+from typing import Dict, Iterable, Optional
+
+PHASE_CONNECT = "connect"
+PHASE_PING = "ping"
+PHASE_REQUEST = "request"
+PHASE_CONVERSION = "conversion"
+PHASE_LOGGING = "logging"
+PHASE_BACKOFF = "backoff"
+PHASE_OTHER = "other"
+
+PHASES = (
+    PHASE_CONNECT, PHASE_PING, PHASE_REQUEST, PHASE_CONVERSION,
+    PHASE_LOGGING, PHASE_BACKOFF, PHASE_OTHER,
+)
+
+
+class CallFrame:
+    """Acumulador de tempo exclusivo por fase de uma chamada amostrada."""
+
+    __slots__ = ("phases", "current", "started", "mark")
+
+    def __init__(self) -> None:
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self.current = PHASE_OTHER
+        self.started = self.mark = time.perf_counter()
+
+    def switch(self, phase: str) -> str:
+        """Encerra a fase atual, inicia ``phase`` e retorna a fase anterior."""
+        now = time.perf_counter()
+        self.phases[self.current] += now - self.mark
+        self.mark = now
+        previous, self.current = self.current, phase
+        return previous
+
+    def finish(self) -> float:
+        self.switch(PHASE_OTHER)
+        return self.mark - self.started
+
+
+class OperationProfile:
+    """Contadores de uma operação (método público) de um cliente."""
+
+    __slots__ = ("calls", "sampled", "total", "max", "phases")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.sampled = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.phases = dict.fromkeys(PHASES, 0.0)
+
+    def record(self, frame: CallFrame, elapsed: float) -> None:
+        self.sampled += 1
+        self.total += elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+        phases = self.phases
+        for name, seconds in frame.phases.items():
+            if seconds:
+                phases[name] += seconds
+
+    @property
+    def scale(self) -> float:
+        """Fator de extrapolação das amostras para todas as chamadas."""
+        return self.calls / self.sampled if self.sampled else 0.0
+
+    def summary(self) -> dict:
+        scale = self.scale
+        return {
+            "calls": self.calls,
+            "sampled": self.sampled,
+            "avg": self.total / self.sampled if self.sampled else 0.0,
+            "max": self.max,
+            "estimated_total": self.total * scale,
+            "phases": {name: seconds * scale for name, seconds in self.phases.items()},
+        }
+
+
+class CallProfiler:
+    """Perfil amostrado das chamadas públicas de um cliente."""
+
+    __slots__ = ("sample_every", "operations")
+
+    def __init__(self, sample_rate: float = 0.1) -> None:
+        if not 0 < sample_rate <= 1:
+            raise ValueError("sample_rate deve estar em (0, 1]")
+        self.sample_every = max(1, round(1.0 / sample_rate))
+        self.operations: Dict[str, OperationProfile] = {}
+
+    @property
+    def sample_rate(self) -> float:
+        return 1.0 / self.sample_every
+
+    def start(self, operation: str) -> Optional[CallFrame]:
+        """Conta a chamada e retorna um CallFrame se ela for amostrada.
+
+        A amostragem conta as chamadas de cada operação separadamente (a
+        primeira e depois uma a cada ``sample_every``): um contador único
+        ficaria em fase com o ciclo de polling e nunca amostraria algumas
+        operações.
+        """
+        op = self.operations.get(operation)
+        if op is None:
+            op = self.operations[operation] = OperationProfile()
+        op.calls += 1
+        if (op.calls - 1) % self.sample_every == 0:
+            return CallFrame()
+        return None
+
+    def finish(self, operation: str, frame: CallFrame) -> None:
+        self.operations[operation].record(frame, frame.finish())
+
+    def reset(self) -> None:
+        self.operations.clear()
+
+    def snapshot(self) -> dict:
+        operations = {name: op.summary() for name, op in self.operations.items()}
+        phases = dict.fromkeys(PHASES, 0.0)
+        for summary in operations.values():
+            for name, seconds in summary["phases"].items():
+                phases[name] += seconds
+        return {
+            "sample_rate": self.sample_rate,
+            "calls": sum(op.calls for op in self.operations.values()),
+            "estimated_total": sum(s["estimated_total"] for s in operations.values()),
+            "phases": phases,
+            "operations": operations,
+        }
+
+
+def fleet_profile(clients: Iterable, top: int = 10) -> dict:
+    """Soma os perfis de vários clientes e lista os dispositivos e operações mais caros."""
+    phases = dict.fromkeys(PHASES, 0.0)
+    devices = []
+    operations = []
+    for client in clients:
+        profiler = client.profiler
+        if profiler is None:
+            continue
+        snap = profiler.snapshot()
+        device = f"{client.host}:{client.port}"
+        for name, seconds in snap["phases"].items():
+            phases[name] += seconds
+        devices.append({
+            "device": device,
+            "calls": snap["calls"],
+            "estimated_total": snap["estimated_total"],
+            "phases": snap["phases"],
+        })
+        for name, summary in snap["operations"].items():
+            operations.append({"device": device, "operation": name, **summary})
+
+    devices.sort(key=lambda d: d["estimated_total"], reverse=True)
+    operations.sort(key=lambda o: o["estimated_total"], reverse=True)
+    return {
+        "clients": len(devices),
+        "estimated_total": sum(d["estimated_total"] for d in devices),
+        "phases": phases,
+        "top_devices": devices[:top],
+        "top_operations": operations[:top],
+    }
+
+
+def format_profile(report: dict) -> str:
+    """Relatório em texto de ``fleet_profile``."""
+    total = report["estimated_total"] or 1.0
+    lines = [f"clients={report['clients']} estimated_total={report['estimated_total']:.3f}s"]
+    lines.append("  ".join(f"{name}={100.0 * s / total:.1f}%" for name, s in report["phases"].items()))
+
+    def row(label: str, entry: dict) -> str:
+        share = max(entry["phases"].items(), key=lambda item: item[1])
+        return (
+            f"{label:<48}{entry['calls']:>9}{entry['estimated_total']:>11.3f}"
+            f"  {share[0]} {100.0 * share[1] / (entry['estimated_total'] or 1.0):.0f}%"
+        )
+
+    header = f"{'':<48}{'calls':>9}{'total (s)':>11}  maior fase"
+    lines += ["", "dispositivos" + header[12:]]
+    lines += [row(d["device"], d) for d in report["top_devices"]]
+    lines += ["", "operações" + header[9:]]
+    lines += [row(f"{o['device']} {o['operation']}", o) for o in report["top_operations"]]
+    return "\n".join(lines)
@@ -0,0 +1,83 @@
+"""
+Engineering-unit scaling for raw register values.
+
+``Scaling`` maps a raw range (e.g. 0..27648 counts of an analog card) to an
+engineering-unit range (e.g. 0..10 bar), with optional clamping to the
+configured ranges and optional square-root extraction (differential-pressure
+flow transmitters). Gain and offset are precomputed once, and conversions run
+as a single list comprehension over a whole array of decoded values, so typed
+reads, array reads, read plans and batch writes pay no per-tag setup cost.
+``to_raw`` is the exact inverse used by writes.
+"""
+
+import math
+from dataclasses import dataclass, field
+from typing import List, Sequence
+
+
+@dataclass(frozen=True)
+class Scaling:
+    """Conversão linear raw → EU, com clamp e extração de raiz quadrada."""
+
+    raw_min: float
+    raw_max: float
+    eu_min: float
+    eu_max: float
+    clamp: bool = True
+    sqrt: bool = False
+    _gain: float = field(init=False, repr=False, compare=False)
+    _raw_span: float = field(init=False, repr=False, compare=False)
+    _eu_span: float = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        raw_span = float(self.raw_max) - float(self.raw_min)
+        eu_span = float(self.eu_max) - float(self.eu_min)
+        if raw_span == 0 or eu_span == 0:
+            raise ValueError("Scaling requer raw_min != raw_max e eu_min != eu_max")
+        object.__setattr__(self, "_raw_span", raw_span)
+        object.__setattr__(self, "_eu_span", eu_span)
+        object.__setattr__(self, "_gain", eu_span / raw_span)
+
+    def _bounds(self, lo: float, hi: float):
+        return (lo, hi) if lo <= hi else (hi, lo)
+
+    def to_eu(self, values: Sequence[float]) -> List[float]:
+        """Converte valores brutos em unidades de engenharia."""
+        raw_min, eu_min = float(self.raw_min), float(self.eu_min)
+        if self.clamp:
+            lo, hi = self._bounds(raw_min, float(self.raw_max))
+            values = [lo if v < lo else hi if v > hi else v for v in values]
+        if self.sqrt:
+            inv, span = 1.0 / self._raw_span, self._eu_span
+            sqrt = math.sqrt
+            return [eu_min + span * sqrt(f) if f > 0 else eu_min for f in ((v - raw_min) * inv for v in values)]
+        gain = self._gain
+        offset = eu_min - raw_min * gain
+        return [v * gain + offset for v in values]
+
+    def to_raw(self, values: Sequence[float], integer: bool = False) -> List[float]:
+        """Inversa de ``to_eu`` (para escrita); ``integer`` arredonda o resultado."""
+        raw_min, eu_min = float(self.raw_min), float(self.eu_min)
+        if self.clamp:
+            lo, hi = self._bounds(eu_min, float(self.eu_max))
+            values = [lo if v < lo else hi if v > hi else v for v in values]
+        if self.sqrt:
+            inv, span = 1.0 / self._eu_span, self._raw_span
+            out = [raw_min + span * f * f if f > 0 else raw_min for f in ((v - eu_min) * inv for v in values)]
+        else:
+            gain = 1.0 / self._gain
+            offset = raw_min - eu_min * gain
+            out = [v * gain + offset for v in values]
+        if integer:
+            return [int(round(v)) for v in out]
+        return out
+
+    def to_dict(self) -> dict:
+        return {
+            "raw_min": self.raw_min,
+            "raw_max": self.raw_max,
+            "eu_min": self.eu_min,
+            "eu_max": self.eu_max,
+            "clamp": self.clamp,
+            "sqrt": self.sqrt,
+        }
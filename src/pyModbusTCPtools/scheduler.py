@@ -0,0 +1,226 @@
+"""
+Priority-aware, deadline-aware request queue for one connection.
+
+All requests for a client go through a single queue served by one worker, so
+the connection is never used concurrently. The queue is ordered by
+``Priority`` (then by arrival), which lets operator writes and alarm reads go
+ahead of bulk polling reads: an urgent request waits at most for the request
+already in flight. Requests may carry a deadline; a request whose deadline has
+passed when it reaches the head of the queue is dropped instead of being sent,
+and its future fails with ``ModbusDeadlineError``. Queueing delay is recorded
+per priority class.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Union
+
+from .enums import Priority
+from .exceptions import ModbusDeadlineError
+
+if TYPE_CHECKING:
+    from .modbustools import ModbusTCPResiliente
+
+# Amostras de atraso mantidas por classe (percentis aproximados)
+DELAY_SAMPLES = 1024
+
+
+class _Request:
+    __slots__ = ("priority", "seq", "action", "future", "enqueued", "deadline", "name")
+
+    def __init__(self, priority, seq, action, future, enqueued, deadline, name):
+        self.priority = priority
+        self.seq = seq
+        self.action = action
+        self.future = future
+        self.enqueued = enqueued
+        self.deadline = deadline
+        self.name = name
+
+    def __lt__(self, other: "_Request") -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class _ClassStats:
+    __slots__ = ("submitted", "executed", "dropped", "delay_total", "delay_max", "delays")
+
+    def __init__(self) -> None:
+        self.submitted = 0
+        self.executed = 0
+        self.dropped = 0
+        self.delay_total = 0.0
+        self.delay_max = 0.0
+        self.delays = deque(maxlen=DELAY_SAMPLES)
+
+    def record_delay(self, delay: float) -> None:
+        self.delay_total += delay
+        self.delay_max = max(self.delay_max, delay)
+        self.delays.append(delay)
+
+    def to_dict(self) -> dict:
+        served = self.executed + self.dropped
+        ordered = sorted(self.delays)
+        p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] if ordered else 0.0
+        return {
+            "submitted": self.submitted,
+            "executed": self.executed,
+            "dropped": self.dropped,
+            "avg_delay": self.delay_total / served if served else 0.0,
+            "p95_delay": p95,
+            "max_delay": self.delay_max,
+        }
+
+
+class RequestScheduler:
+    """Fila de requisições com prioridade e prazo para um cliente."""
+
+    def __init__(
+        self,
+        client: "ModbusTCPResiliente",
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.client = client
+        self.clock = clock
+        self._queue: List[_Request] = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._worker: Optional[threading.Thread] = None
+        self._running = False
+        self._stats: Dict[Priority, _ClassStats] = {p: _ClassStats() for p in Priority}
+
+    # ================== SUBMISSÃO ==================
+    def submit(
+        self,
+        action: Union[str, Callable],
+        *args,
+        priority: Priority = Priority.NORMAL,
+        deadline: Optional[float] = None,
+        timeout: Optional[float] = None,
+        **kwargs,
+    ) -> Future:
+        """Enfileira uma chamada e retorna um ``Future`` com o resultado.
+
+        ``action`` é o nome de um método do cliente (ex.: ``"write_single_coil_safe"``)
+        ou um callable. ``deadline`` é absoluto (relógio ``clock``); ``timeout`` é
+        relativo ao momento da submissão.
+        """
+        priority = Priority(priority)
+        if isinstance(action, str):
+            name = action
+            method = getattr(self.client, action)
+        else:
+            name = getattr(action, "__name__", repr(action))
+            method = action
+        now = self.clock()
+        if timeout is not None:
+            deadline = now + timeout if deadline is None else min(deadline, now + timeout)
+
+        future: Future = Future()
+        request = _Request(priority, next(self._seq), lambda: method(*args, **kwargs),
+                           future, now, deadline, name)
+        with self._cond:
+            self._stats[priority].submitted += 1
+            heapq.heappush(self._queue, request)
+            self._cond.notify()
+        return future
+
+    def urgent(self, action: Union[str, Callable], *args, **kwargs) -> Future:
+        """Atalho para ``submit(..., priority=Priority.URGENT)``."""
+        return self.submit(action, *args, priority=Priority.URGENT, **kwargs)
+
+    def bulk(self, action: Union[str, Callable], *args, **kwargs) -> Future:
+        """Atalho para ``submit(..., priority=Priority.BULK)``."""
+        return self.submit(action, *args, priority=Priority.BULK, **kwargs)
+
+    def __len__(self) -> int:
+        with self._cond:
+            return len(self._queue)
+
+    # ================== EXECUÇÃO ==================
+    def _pop(self) -> Optional[_Request]:
+        with self._cond:
+            return heapq.heappop(self._queue) if self._queue else None
+
+    def _run(self, request: _Request) -> bool:
+        """Executa (ou descarta) uma requisição. Retorna True se foi enviada."""
+        if not request.future.set_running_or_notify_cancel():
+            return False
+        now = self.clock()
+        stats = self._stats[request.priority]
+        stats.record_delay(now - request.enqueued)
+        if request.deadline is not None and now > request.deadline:
+            stats.dropped += 1
+            request.future.set_exception(ModbusDeadlineError(
+                f"{request.name}: prazo expirado na fila ({now - request.deadline:.3f}s)"
+            ))
+            return False
+        stats.executed += 1
+        try:
+            request.future.set_result(request.action())
+        except BaseException as exc:
+            request.future.set_exception(exc)
+        return True
+
+    def run_pending(self, max_requests: Optional[int] = None) -> int:
+        """Atende a fila na thread atual. Retorna quantas requisições foram enviadas."""
+        sent = handled = 0
+        while max_requests is None or handled < max_requests:
+            request = self._pop()
+            if request is None:
+                break
+            handled += 1
+            sent += self._run(request)
+        return sent
+
+    def _loop(self) -> None:
+        while True:
+            with self._cond:
+                while self._running and not self._queue:
+                    self._cond.wait()
+                if not self._running:
+                    return
+                request = heapq.heappop(self._queue)
+            self._run(request)
+
+    def start(self) -> "RequestScheduler":
+        """Inicia a thread de atendimento (uma por conexão)."""
+        with self._cond:
+            if self._worker is not None:
+                return self
+            self._running = True
+            self._worker = threading.Thread(target=self._loop, name="ModbusScheduler", daemon=True)
+            self._worker.start()
+        return self
+
+    def stop(self, cancel_pending: bool = True) -> None:
+        """Para a thread; requisições ainda na fila são canceladas por padrão."""
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+            worker, self._worker = self._worker, None
+        if worker is not None:
+            worker.join()
+        if cancel_pending:
+            with self._cond:
+                pending, self._queue = self._queue, []
+            for request in pending:
+                request.future.cancel()
+
+    def __enter__(self) -> "RequestScheduler":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    # ================== RELATÓRIO ==================
+    def stats(self) -> dict:
+        """Atraso de fila e contadores por classe de prioridade."""
+        with self._cond:
+            return {
+                "queued": len(self._queue),
+                "classes": {p.name.lower(): s.to_dict() for p, s in self._stats.items()},
+            }
@@ -0,0 +1,398 @@
+"""
+Local Modbus TCP stand-in server with scripted faults.
+
+``ModbusSimulator`` serves many ``SimulatedDevice`` instances from a single
+thread (``selectors``), one listening port per device on the loopback
+interface. Each device follows a deterministic fault script, with times
+relative to ``start()``:
+
+- ``outage``: the listener is closed (connection refused) and open
+  connections are dropped;
+- ``slow``: replies are delayed by ``delay`` seconds;
+- ``half_open``: connections stay up but requests are silently discarded;
+- ``illegal_address``: reads/writes in ``addr_range`` (or everywhere) get
+  the Illegal Data Address exception (0x02).
+
+Every device counts connections, requests, ping reads, exceptions and
+discarded requests, which is what the load generator in
+``benchmarks/bench_soak.py`` uses to measure recovery time and request
+amplification.
+"""
+
+import heapq
+import itertools
+import selectors
+import socket
+import struct
+import threading
+import time
+from array import array
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from pyModbusTCP.constants import (
+    EXP_DATA_ADDRESS,
+    EXP_DATA_VALUE,
+    EXP_ILLEGAL_FUNCTION,
+    READ_COILS,
+    READ_DISCRETE_INPUTS,
+    READ_HOLDING_REGISTERS,
+    READ_INPUT_REGISTERS,
+    WRITE_MULTIPLE_COILS,
+    WRITE_MULTIPLE_REGISTERS,
+    WRITE_READ_MULTIPLE_REGISTERS,
+    WRITE_SINGLE_COIL,
+    WRITE_SINGLE_REGISTER,
+)
+
+FAULT_KINDS = ("outage", "slow", "half_open", "illegal_address")
+
+_MBAP = struct.Struct(">HHHB")
+_ADDR_COUNT = struct.Struct(">HH")
+
+
+class Fault(NamedTuple):
+    """Falha programada entre ``start`` e ``end`` (s desde ``start()``)."""
+
+    kind: str
+    start: float
+    end: float
+    delay: float = 0.0
+    addr_range: Optional[Tuple[int, int]] = None
+
+    def active(self, elapsed: float) -> bool:
+        return self.start <= elapsed < self.end
+
+
+class DeviceStats:
+    """Contadores de um dispositivo simulado."""
+
+    __slots__ = ("connections", "requests", "pings", "exceptions", "discarded", "delayed")
+
+    def __init__(self) -> None:
+        self.connections = 0
+        self.requests = 0
+        self.pings = 0
+        self.exceptions = 0
+        self.discarded = 0
+        self.delayed = 0
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class SimulatedDevice:
+    """CLP simulado: registradores, coils e roteiro de falhas."""
+
+    def __init__(
+        self,
+        size: int = 1000,
+        faults: Iterable[Fault] = (),
+        ping_addr: int = 0,
+        name: Optional[str] = None,
+    ) -> None:
+        self.size = size
+        self.registers = array("H", bytes(2 * size))
+        self.coils = bytearray(size)
+        self.faults: List[Fault] = list(faults)
+        for fault in self.faults:
+            if fault.kind not in FAULT_KINDS:
+                raise ValueError(f"Falha desconhecida: {fault.kind!r} (use {', '.join(FAULT_KINDS)})")
+        self.ping_addr = ping_addr
+        self.name = name
+        self.host = "127.0.0.1"
+        self.port = 0
+        self.stats = DeviceStats()
+
+    def active_faults(self, elapsed: float) -> List[Fault]:
+        return [f for f in self.faults if f.active(elapsed)]
+
+    def in_fault(self, kind: str, elapsed: float) -> bool:
+        return any(f.kind == kind and f.active(elapsed) for f in self.faults)
+
+    # ================== PDU ==================
+    def _illegal(self, addr: int, count: int, elapsed: float) -> bool:
+        if count < 1 or addr + count > self.size:
+            return True
+        for fault in self.faults:
+            if fault.kind == "illegal_address" and fault.active(elapsed):
+                if fault.addr_range is None:
+                    return True
+                lo, hi = fault.addr_range
+                if addr < hi and addr + count > lo:
+                    return True
+        return False
+
+    def handle(self, pdu: bytes, elapsed: float) -> bytes:
+        """Processa uma PDU e retorna a PDU de resposta."""
+        if not pdu:
+            return self._exception(0, EXP_ILLEGAL_FUNCTION)
+        fc = pdu[0]
+        try:
+            if fc in (READ_HOLDING_REGISTERS, READ_INPUT_REGISTERS, READ_COILS, READ_DISCRETE_INPUTS):
+                addr, count = _ADDR_COUNT.unpack_from(pdu, 1)
+                if fc == READ_HOLDING_REGISTERS and addr == self.ping_addr:
+                    self.stats.pings += 1
+                if self._illegal(addr, count, elapsed):
+                    return self._exception(fc, EXP_DATA_ADDRESS)
+                if fc in (READ_HOLDING_REGISTERS, READ_INPUT_REGISTERS):
+                    data = self.registers[addr:addr + count]
+                    return struct.pack(f">BB{count}H", fc, 2 * count, *data)
+                bits = self.coils[addr:addr + count]
+                packed = bytearray((count + 7) // 8)
+                for i, bit in enumerate(bits):
+                    if bit:
+                        packed[i // 8] |= 1 << (i % 8)
+                return bytes((fc, len(packed))) + bytes(packed)
+
+            if fc == WRITE_SINGLE_REGISTER:
+                addr, value = _ADDR_COUNT.unpack_from(pdu, 1)
+                if self._illegal(addr, 1, elapsed):
+                    return self._exception(fc, EXP_DATA_ADDRESS)
+                self.registers[addr] = value
+                return bytes(pdu[:5])
+
+            if fc == WRITE_SINGLE_COIL:
+                addr, value = _ADDR_COUNT.unpack_from(pdu, 1)
+                if value not in (0x0000, 0xFF00):
+                    return self._exception(fc, EXP_DATA_VALUE)
+                if self._illegal(addr, 1, elapsed):
+                    return self._exception(fc, EXP_DATA_ADDRESS)
+                self.coils[addr] = 1 if value else 0
+                return bytes(pdu[:5])
+
+            if fc == WRITE_MULTIPLE_REGISTERS:
+                addr, count = _ADDR_COUNT.unpack_from(pdu, 1)
+                if not self._byte_count_ok(pdu, 5, 2 * count):
+                    return self._exception(fc, EXP_DATA_VALUE)
+                if self._illegal(addr, count, elapsed):
+                    return self._exception(fc, EXP_DATA_ADDRESS)
+                self.registers[addr:addr + count] = array("H", struct.unpack_from(f">{count}H", pdu, 6))
+                return bytes(pdu[:5])
+
+            if fc == WRITE_MULTIPLE_COILS:
+                addr, count = _ADDR_COUNT.unpack_from(pdu, 1)
+                if not self._byte_count_ok(pdu, 5, (count + 7) // 8):
+                    return self._exception(fc, EXP_DATA_VALUE)
+                if self._illegal(addr, count, elapsed):
+                    return self._exception(fc, EXP_DATA_ADDRESS)
+                for i in range(count):
+                    self.coils[addr + i] = (pdu[6 + i // 8] >> (i % 8)) & 1
+                return bytes(pdu[:5])
+
+            if fc == WRITE_READ_MULTIPLE_REGISTERS:
+                r_addr, r_count, w_addr, w_count = struct.unpack_from(">HHHH", pdu, 1)
+                if not self._byte_count_ok(pdu, 9, 2 * w_count):
+                    return self._exception(fc, EXP_DATA_VALUE)
+                if self._illegal(w_addr, w_count, elapsed) or self._illegal(r_addr, r_count, elapsed):
+                    return self._exception(fc, EXP_DATA_ADDRESS)
+                self.registers[w_addr:w_addr + w_count] = array("H", struct.unpack_from(f">{w_count}H", pdu, 10))
+                data = self.registers[r_addr:r_addr + r_count]
+                return struct.pack(f">BB{r_count}H", fc, 2 * r_count, *data)
+        except struct.error:
+            return self._exception(fc, EXP_DATA_VALUE)
+        return self._exception(fc, EXP_ILLEGAL_FUNCTION)
+
+    @staticmethod
+    def _byte_count_ok(pdu: bytes, pos: int, expected: int) -> bool:
+        """Confere o campo byte count em ``pos`` e se a PDU traz esses bytes."""
+        return len(pdu) >= pos + 1 + expected and pdu[pos] == expected
+
+    def _exception(self, fc: int, code: int) -> bytes:
+        self.stats.exceptions += 1
+        return bytes((fc | 0x80, code))
+
+
+class _Conn:
+    __slots__ = ("device", "sock", "rx")
+
+    def __init__(self, device: SimulatedDevice, sock: socket.socket) -> None:
+        self.device = device
+        self.sock = sock
+        self.rx = bytearray()
+
+
+class ModbusSimulator:
+    """Servidor Modbus TCP local para vários dispositivos simulados."""
+
+    def __init__(self, host: str = "127.0.0.1", tick: float = 0.02) -> None:
+        self.host = host
+        self.tick = tick
+        self.devices: List[SimulatedDevice] = []
+        self._listeners: Dict[SimulatedDevice, Optional[socket.socket]] = {}
+        self._conns: Dict[SimulatedDevice, List[_Conn]] = {}
+        self._sel = selectors.DefaultSelector()
+        self._delayed: list = []
+        self._seq = itertools.count()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self.started_at: Optional[float] = None
+
+    # ================== DISPOSITIVOS ==================
+    def add_device(self, device: Optional[SimulatedDevice] = None, port: int = 0, **kwargs) -> SimulatedDevice:
+        """Registra um dispositivo e abre sua porta (0 = porta livre)."""
+        if device is None:
+            device = SimulatedDevice(**kwargs)
+        device.host = self.host
+        device.port = port
+        self.devices.append(device)
+        self._conns[device] = []
+        self._listeners[device] = None
+        self._listen(device)
+        return device
+
+    def _listen(self, device: SimulatedDevice) -> None:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, device.port))
+        sock.listen(64)
+        sock.setblocking(False)
+        device.port = sock.getsockname()[1]
+        self._listeners[device] = sock
+        self._sel.register(sock, selectors.EVENT_READ, device)
+
+    def _unlisten(self, device: SimulatedDevice) -> None:
+        sock = self._listeners.get(device)
+        if sock is not None:
+            self._sel.unregister(sock)
+            sock.close()
+            self._listeners[device] = None
+
+    def _drop(self, conn: _Conn) -> None:
+        try:
+            self._sel.unregister(conn.sock)
+        except (KeyError, ValueError):
+            pass
+        conn.sock.close()
+        conns = self._conns[conn.device]
+        if conn in conns:
+            conns.remove(conn)
+
+    # ================== LOOP ==================
+    def elapsed(self) -> float:
+        return 0.0 if self.started_at is None else time.monotonic() - self.started_at
+
+    def start(self) -> "ModbusSimulator":
+        self.started_at = time.monotonic()
+        self._apply_outages(0.0)
+        self._running = True
+        self._thread = threading.Thread(target=self._loop, name="ModbusSimulator", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._running = False
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        for device in self.devices:
+            for conn in list(self._conns[device]):
+                self._drop(conn)
+            self._unlisten(device)
+        self._sel.close()
+
+    def __enter__(self) -> "ModbusSimulator":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _apply_outages(self, elapsed: float) -> None:
+        for device in self.devices:
+            if not device.faults:
+                continue
+            down = device.in_fault("outage", elapsed)
+            listening = self._listeners[device] is not None
+            if down and listening:
+                self._unlisten(device)
+                for conn in list(self._conns[device]):
+                    self._drop(conn)
+            elif not down and not listening:
+                self._listen(device)
+
+    def _accept(self, device: SimulatedDevice, listener: socket.socket) -> None:
+        try:
+            sock, _ = listener.accept()
+        except (BlockingIOError, OSError):
+            return
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        device.stats.connections += 1
+        conn = _Conn(device, sock)
+        self._conns[device].append(conn)
+        self._sel.register(sock, selectors.EVENT_READ, conn)
+
+    def _receive(self, conn: _Conn, elapsed: float) -> None:
+        try:
+            data = conn.sock.recv(4096)
+        except OSError:
+            data = b""
+        if not data:
+            self._drop(conn)
+            return
+        conn.rx += data
+        device = conn.device
+        while len(conn.rx) >= 7:
+            tid, _, length, unit = _MBAP.unpack_from(conn.rx)
+            if length < 2:
+                # MBAP sem código de função: o enquadramento não é confiável, derruba a conexão
+                device.stats.discarded += 1
+                self._drop(conn)
+                return
+            end = 6 + length
+            if len(conn.rx) < end:
+                break
+            pdu = bytes(conn.rx[7:end])
+            del conn.rx[:end]
+            device.stats.requests += 1
+
+            if device.in_fault("half_open", elapsed):
+                device.stats.discarded += 1
+                continue
+            try:
+                reply = device.handle(pdu, elapsed)
+            except Exception:
+                # PDU que o simulador não sabe tratar: derruba só esta conexão
+                device.stats.discarded += 1
+                self._drop(conn)
+                return
+            frame = _MBAP.pack(tid, 0, len(reply) + 1, unit) + reply
+            delay = max((f.delay for f in device.active_faults(elapsed) if f.kind == "slow"), default=0.0)
+            if delay > 0:
+                device.stats.delayed += 1
+                heapq.heappush(self._delayed, (time.monotonic() + delay, next(self._seq), conn, frame))
+            else:
+                self._send(conn, frame)
+
+    def _send(self, conn: _Conn, frame: bytes) -> None:
+        if conn not in self._conns[conn.device]:
+            return
+        try:
+            conn.sock.sendall(frame)
+        except OSError:
+            self._drop(conn)
+
+    def _loop(self) -> None:
+        while self._running:
+            timeout = self.tick
+            if self._delayed:
+                timeout = max(0.0, min(timeout, self._delayed[0][0] - time.monotonic()))
+            for key, _ in self._sel.select(timeout):
+                elapsed = self.elapsed()
+                if isinstance(key.data, _Conn):
+                    self._receive(key.data, elapsed)
+                else:
+                    self._accept(key.data, key.fileobj)
+            now = time.monotonic()
+            while self._delayed and self._delayed[0][0] <= now:
+                _, _, conn, frame = heapq.heappop(self._delayed)
+                self._send(conn, frame)
+            self._apply_outages(self.elapsed())
+
+    # ================== RELATÓRIO ==================
+    def stats(self) -> dict:
+        """Totais de todos os dispositivos."""
+        totals = DeviceStats().to_dict()
+        for device in self.devices:
+            for name, value in device.stats.to_dict().items():
+                totals[name] += value
+        totals["devices"] = len(self.devices)
+        return totals
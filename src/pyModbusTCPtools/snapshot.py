@@ -0,0 +1,130 @@
+"""
+Consistent snapshots across multiple read blocks.
+
+A batch of tags that spans several Modbus requests is read over several PLC
+scan cycles. ``read_snapshot_safe`` records, for every block, the wall-clock
+timestamp of the response and the request latency, so callers can see how far
+apart the blocks are. Optionally a PLC-side sequence counter (a register the
+PLC increments once per scan) is read between blocks: a block is consistent
+when the counter had the snapshot's reference value both before and after it
+was read. Only inconsistent blocks are read again, instead of the whole set.
+"""
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple, Union
+
+if TYPE_CHECKING:
+    from .tagmap import ReadBlock, ReadPlan
+
+BlockSpec = Union["ReadBlock", Tuple[str, int, int]]
+
+
+@dataclass
+class BlockReading:
+    """Resultado da leitura de um bloco dentro de um snapshot."""
+
+    area: str
+    addr: int
+    count: int
+    data: Optional[list] = None
+    timestamp: float = 0.0
+    latency: float = 0.0
+    attempts: int = 0
+    seq_before: Optional[int] = None
+    seq_after: Optional[int] = None
+    block: Optional["ReadBlock"] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.data is not None
+
+    @property
+    def torn(self) -> bool:
+        """Contador mudou durante a leitura do bloco (leitura entre dois ciclos)."""
+        return self.seq_before is not None and self.seq_before != self.seq_after
+
+    def matches(self, sequence: Optional[int]) -> bool:
+        """Bloco lido inteiramente no ciclo ``sequence`` do CLP."""
+        return sequence is not None and self.seq_before == sequence and self.seq_after == sequence
+
+
+@dataclass
+class Snapshot:
+    """Conjunto de blocos lidos como uma única visão do CLP."""
+
+    blocks: List[BlockReading]
+    seq_addr: Optional[int] = None
+    sequence: Optional[int] = None
+    requests: int = 0
+    retried_blocks: int = 0
+    values: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return all(b.ok for b in self.blocks)
+
+    @property
+    def consistent(self) -> bool:
+        """Todos os blocos lidos e, com contador, todos no mesmo ciclo."""
+        if not self.ok:
+            return False
+        if self.seq_addr is None:
+            return True
+        return all(b.matches(self.sequence) for b in self.blocks)
+
+    @property
+    def inconsistent_blocks(self) -> List[BlockReading]:
+        if self.seq_addr is None:
+            return []
+        return [b for b in self.blocks if b.ok and not b.matches(self.sequence)]
+
+    @property
+    def spread(self) -> float:
+        """Intervalo (s) entre a primeira e a última resposta do snapshot."""
+        stamps = [b.timestamp for b in self.blocks if b.ok]
+        return max(stamps) - min(stamps) if stamps else 0.0
+
+    @property
+    def latency(self) -> float:
+        """Soma das latências das requisições de dados (última tentativa)."""
+        return sum(b.latency for b in self.blocks)
+
+    def to_dict(self) -> dict:
+        return {
+            "consistent": self.consistent,
+            "sequence": self.sequence,
+            "requests": self.requests,
+            "retried_blocks": self.retried_blocks,
+            "spread": self.spread,
+            "blocks": [
+                {
+                    "area": b.area,
+                    "addr": b.addr,
+                    "count": b.count,
+                    "ok": b.ok,
+                    "timestamp": b.timestamp,
+                    "latency": b.latency,
+                    "attempts": b.attempts,
+                    "seq_before": b.seq_before,
+                    "seq_after": b.seq_after,
+                }
+                for b in self.blocks
+            ],
+        }
+
+
+def snapshot_blocks(
+    blocks: Union["ReadPlan", Iterable[BlockSpec]],
+    scan_rate: Optional[float] = None,
+) -> List[BlockReading]:
+    """Normaliza um ReadPlan, ReadBlocks ou tuplas ``(area, addr, count)``."""
+    if hasattr(blocks, "blocks_for"):
+        blocks = blocks.blocks_for(scan_rate)
+    readings = []
+    for spec in blocks:
+        if isinstance(spec, tuple):
+            area, addr, count = spec
+            readings.append(BlockReading(area, addr, count))
+        else:
+            readings.append(BlockReading(spec.area, spec.addr, spec.count, block=spec))
+    return readings
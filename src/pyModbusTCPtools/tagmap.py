@@ -0,0 +1,371 @@
+"""
+Declarative tag maps and precompiled read plans.
+
+A tag map describes PLC variables by name (area, address, data type,
+endianness, linear scale/offset, optional raw→EU ``Scaling`` and scan
+rate). At load time the tags are
+validated and compiled into a ``ReadPlan``: tags are grouped by area and scan
+rate and contiguous addresses are merged into as few Modbus requests as
+possible. Compiled plans can be cached on disk (JSON) so large maps (10k+
+tags) start without re-parsing and re-compiling the source file.
+
+Supported source formats (standard library only):
+- CSV  (header: name,area,addr,dtype,endian,scale,offset,scan_rate; optional
+  raw_min,raw_max,eu_min,eu_max,clamp,sqrt)
+- JSON (list of objects, or ``{"tags": [...]}``)
+"""
+
+import csv
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .codec import MAX_READ_BITS, MAX_READ_REGISTERS
+from .enums import Endian, ModbusDataType
+from .exceptions import ModbusTagMapError
+from .scaling import Scaling
+
+# Áreas Modbus (mesmas chaves usadas no cache de endereços inválidos)
+REGISTER_AREAS = ("hr", "ir")
+BIT_AREAS = ("c", "di")
+AREAS = REGISTER_AREAS + BIT_AREAS
+
+PLAN_CACHE_VERSION = 2
+
+
+@dataclass(frozen=True)
+class Tag:
+    """Variável nomeada do CLP."""
+
+    name: str
+    area: str
+    addr: int
+    dtype: ModbusDataType = ModbusDataType.UINT16
+    endian: Endian = Endian.BE
+    scale: float = 1.0
+    offset: float = 0.0
+    scan_rate: float = 1.0
+    scaling: Optional[Scaling] = None
+
+    @property
+    def count(self) -> int:
+        """Quantidade de registradores (ou bits) ocupados pela tag."""
+        if self.area in BIT_AREAS:
+            return 1
+        return self.dtype.registers
+
+    @property
+    def end(self) -> int:
+        """Endereço seguinte ao último registrador ocupado."""
+        return self.addr + self.count
+
+    def apply_scale(self, value):
+        """Aplica scaling raw→EU e scale/offset ao valor bruto (bits não são escalonados)."""
+        if self.area in BIT_AREAS:
+            return value
+        if self.scaling is not None:
+            value = self.scaling.to_eu((value,))[0]
+        return self.apply_linear(value)
+
+    def apply_linear(self, value):
+        """Aplica apenas scale/offset (após o scaling raw→EU)."""
+        if self.scale == 1.0 and self.offset == 0.0:
+            return value
+        return value * self.scale + self.offset
+
+
+@dataclass
+class ReadBlock:
+    """Requisição Modbus única cobrindo um intervalo contíguo de tags."""
+
+    area: str
+    addr: int
+    count: int
+    scan_rate: float
+    tags: Tuple[Tag, ...] = field(default_factory=tuple)
+
+
+class ReadPlan:
+    """Plano de leitura compilado a partir de um tag map."""
+
+    def __init__(self, tags: Iterable[Tag], blocks: Iterable[ReadBlock]) -> None:
+        self.tags: Dict[str, Tag] = {t.name: t for t in tags}
+        self.blocks: List[ReadBlock] = list(blocks)
+
+    def __len__(self) -> int:
+        return len(self.tags)
+
+    @property
+    def scan_rates(self) -> List[float]:
+        """Taxas de varredura distintas presentes no plano."""
+        return sorted({b.scan_rate for b in self.blocks})
+
+    def blocks_for(self, scan_rate: Optional[float] = None) -> List[ReadBlock]:
+        """Retorna os blocos de uma taxa de varredura (ou todos)."""
+        if scan_rate is None:
+            return list(self.blocks)
+        return [b for b in self.blocks if b.scan_rate == scan_rate]
+
+    def to_dict(self) -> dict:
+        """Representação compacta e serializável em JSON."""
+        index = {name: i for i, name in enumerate(self.tags)}
+        return {
+            "version": PLAN_CACHE_VERSION,
+            "tags": [
+                [
+                    t.name, t.area, t.addr, t.dtype.value, t.endian.value, t.scale, t.offset, t.scan_rate,
+                    None if t.scaling is None else t.scaling.to_dict(),
+                ]
+                for t in self.tags.values()
+            ],
+            "blocks": [
+                [b.area, b.addr, b.count, b.scan_rate, [index[t.name] for t in b.tags]]
+                for b in self.blocks
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ReadPlan":
+        """Reconstrói um plano a partir de ``to_dict`` (sem revalidar)."""
+        if data.get("version") != PLAN_CACHE_VERSION:
+            raise ModbusTagMapError("Versão de plano incompatível")
+        tags = [
+            Tag(
+                name, area, addr, ModbusDataType(dtype), Endian(endian), scale, offset, scan_rate,
+                None if scaling is None else Scaling(**scaling),
+            )
+            for name, area, addr, dtype, endian, scale, offset, scan_rate, scaling in data["tags"]
+        ]
+        blocks = [
+            ReadBlock(area, addr, count, scan_rate, tuple(tags[i] for i in idx))
+            for area, addr, count, scan_rate, idx in data["blocks"]
+        ]
+        return cls(tags, blocks)
+
+
+# ================== PARSING ==================
+def _parse_enum(enum_cls, value, default):
+    if value is None or value == "":
+        return default
+    if isinstance(value, enum_cls):
+        return value
+    text = str(value).strip()
+    try:
+        return enum_cls(text.lower())
+    except ValueError:
+        pass
+    try:
+        return enum_cls[text.upper()]
+    except KeyError:
+        raise ModbusTagMapError(f"{enum_cls.__name__} inválido: {value!r}") from None
+
+
+def _parse_number(value, default, conv, field_name, name):
+    if value is None or value == "":
+        return default
+    try:
+        return conv(value)
+    except (TypeError, ValueError):
+        raise ModbusTagMapError(f"Tag {name!r}: campo {field_name} inválido: {value!r}") from None
+
+
+_TRUE = ("1", "true", "yes", "sim", "on")
+_FALSE = ("0", "false", "no", "nao", "não", "off")
+_SCALING_FIELDS = ("raw_min", "raw_max", "eu_min", "eu_max")
+
+
+def _parse_bool(value, default: bool, field_name: str, name: str) -> bool:
+    if value is None or value == "":
+        return default
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in _TRUE:
+        return True
+    if text in _FALSE:
+        return False
+    raise ModbusTagMapError(f"Tag {name!r}: campo {field_name} inválido: {value!r}")
+
+
+def _parse_scaling(row: dict, name: str) -> Optional[Scaling]:
+    limits = [_parse_number(row.get(f), None, float, f, name) for f in _SCALING_FIELDS]
+    if all(v is None for v in limits):
+        return None
+    if any(v is None for v in limits):
+        raise ModbusTagMapError(f"Tag {name!r}: scaling requer {', '.join(_SCALING_FIELDS)}")
+    try:
+        return Scaling(
+            *limits,
+            clamp=_parse_bool(row.get("clamp"), True, "clamp", name),
+            sqrt=_parse_bool(row.get("sqrt"), False, "sqrt", name),
+        )
+    except ValueError as exc:
+        raise ModbusTagMapError(f"Tag {name!r}: {exc}") from None
+
+
+def tag_from_dict(row: dict) -> Tag:
+    """Cria uma Tag a partir de um dicionário (linha CSV ou objeto JSON)."""
+    name = str(row.get("name") or "").strip()
+    if not name:
+        raise ModbusTagMapError(f"Tag sem nome: {row!r}")
+
+    area = str(row.get("area") or "").strip().lower()
+    if area not in AREAS:
+        raise ModbusTagMapError(f"Tag {name!r}: área inválida {area!r} (use {', '.join(AREAS)})")
+
+    addr = _parse_number(row.get("addr"), None, int, "addr", name)
+    if addr is None:
+        raise ModbusTagMapError(f"Tag {name!r}: campo addr obrigatório")
+
+    scan_rate = _parse_number(row.get("scan_rate"), 1.0, float, "scan_rate", name)
+    if scan_rate <= 0:
+        raise ModbusTagMapError(f"Tag {name!r}: scan_rate deve ser positivo")
+
+    tag = Tag(
+        name=name,
+        area=area,
+        addr=addr,
+        dtype=_parse_enum(ModbusDataType, row.get("dtype"), ModbusDataType.UINT16),
+        endian=_parse_enum(Endian, row.get("endian"), Endian.BE),
+        scale=_parse_number(row.get("scale"), 1.0, float, "scale", name),
+        offset=_parse_number(row.get("offset"), 0.0, float, "offset", name),
+        scan_rate=scan_rate,
+        scaling=_parse_scaling(row, name),
+    )
+    if not (0 <= tag.addr and tag.end <= 0x10000):
+        raise ModbusTagMapError(f"Tag {name!r}: endereço fora do range: {tag.addr}")
+    return tag
+
+
+def _read_source(path: str, data: bytes) -> List[dict]:
+    ext = os.path.splitext(path)[1].lower()
+    text = data.decode("utf-8-sig")
+    if ext == ".csv":
+        return list(csv.DictReader(text.splitlines()))
+    if ext == ".json":
+        rows = json.loads(text)
+        if isinstance(rows, dict):
+            rows = rows.get("tags", [])
+        if not isinstance(rows, list):
+            raise ModbusTagMapError("JSON de tags deve ser uma lista de objetos")
+        return rows
+    raise ModbusTagMapError(f"Formato de tag map não suportado: {ext or path}")
+
+
+def load_tag_map(path: str) -> List[Tag]:
+    """Carrega tags de um arquivo CSV ou JSON."""
+    with open(path, "rb") as f:
+        data = f.read()
+    return [tag_from_dict(row) for row in _read_source(path, data)]
+
+
+# ================== COMPILAÇÃO ==================
+def validate_tags(tags: Iterable[Tag]) -> None:
+    """Valida nomes duplicados e sobreposição de endereços na mesma área."""
+    seen = set()
+    by_area: Dict[str, List[Tag]] = {}
+    for tag in tags:
+        if tag.name in seen:
+            raise ModbusTagMapError(f"Tag duplicada: {tag.name!r}")
+        seen.add(tag.name)
+        by_area.setdefault(tag.area, []).append(tag)
+
+    for area, items in by_area.items():
+        items.sort(key=lambda t: t.addr)
+        prev = None
+        for tag in items:
+            if prev is not None and tag.addr < prev.end:
+                raise ModbusTagMapError(
+                    f"Sobreposição em {area}: {prev.name!r} [{prev.addr}..{prev.end - 1}] "
+                    f"e {tag.name!r} [{tag.addr}..{tag.end - 1}]"
+                )
+            prev = tag
+
+
+def compile_read_plan(
+    tags: Iterable[Tag],
+    max_gap: int = 0,
+    max_registers: int = MAX_READ_REGISTERS,
+    max_bits: int = MAX_READ_BITS,
+) -> ReadPlan:
+    """Valida as tags e agrupa endereços contíguos em blocos de leitura.
+
+    ``max_gap`` permite unir blocos separados por até N endereços não
+    mapeados (lidos e descartados), trocando bytes extras por menos requisições.
+    """
+    tags = list(tags)
+    validate_tags(tags)
+
+    groups: Dict[Tuple[str, float], List[Tag]] = {}
+    for tag in tags:
+        groups.setdefault((tag.area, tag.scan_rate), []).append(tag)
+
+    blocks: List[ReadBlock] = []
+    for (area, scan_rate), items in sorted(groups.items()):
+        limit = max_bits if area in BIT_AREAS else max_registers
+        items.sort(key=lambda t: t.addr)
+        start = end = None
+        members: List[Tag] = []
+        for tag in items:
+            if start is not None and tag.addr - end <= max_gap and tag.end - start <= limit:
+                end = max(end, tag.end)
+                members.append(tag)
+                continue
+            if start is not None:
+                blocks.append(ReadBlock(area, start, end - start, scan_rate, tuple(members)))
+            start, end, members = tag.addr, tag.end, [tag]
+        if start is not None:
+            blocks.append(ReadBlock(area, start, end - start, scan_rate, tuple(members)))
+
+    return ReadPlan(tags, blocks)
+
+
+def load_read_plan(
+    path: str,
+    cache_dir: Optional[str] = None,
+    max_gap: int = 0,
+    max_registers: int = MAX_READ_REGISTERS,
+    max_bits: int = MAX_READ_BITS,
+) -> ReadPlan:
+    """Carrega um tag map e retorna o plano compilado, usando cache em disco.
+
+    A chave do cache é o hash do conteúdo do arquivo e dos parâmetros de
+    compilação; qualquer alteração no tag map invalida o cache automaticamente.
+    Falhas ao gravar o cache (diretório somente leitura, disco cheio) são
+    ignoradas: o plano compilado é retornado mesmo assim.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+
+    cache_file = None
+    if cache_dir is not None:
+        digest = hashlib.sha256(data)
+        digest.update(f"|{PLAN_CACHE_VERSION}|{max_gap}|{max_registers}|{max_bits}".encode())
+        stem = os.path.splitext(os.path.basename(path))[0]
+        cache_file = os.path.join(cache_dir, f"{stem}.{digest.hexdigest()[:16]}.plan.json")
+        try:
+            with open(cache_file, "r", encoding="utf-8") as f:
+                return ReadPlan.from_dict(json.load(f))
+        except (OSError, ValueError, KeyError, TypeError, ModbusTagMapError):
+            pass  # cache ausente ou corrompido: recompila
+
+    tags = [tag_from_dict(row) for row in _read_source(path, data)]
+    plan = compile_read_plan(tags, max_gap=max_gap, max_registers=max_registers, max_bits=max_bits)
+
+    if cache_file is not None:
+        tmp = f"{cache_file}.tmp"
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(plan.to_dict(), f, separators=(",", ":"))
+            os.replace(tmp, cache_file)
+        except OSError:
+            # cache é só otimização: sem ele, a próxima carga recompila
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+
+    return plan
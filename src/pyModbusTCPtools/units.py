@@ -0,0 +1,80 @@
+"""
+Per-unit-ID access for Modbus TCP gateways.
+
+A Modbus TCP/RTU gateway exposes many serial slaves behind a single TCP
+socket, addressed by the MBAP unit ID. ``ModbusUnit`` is a lightweight view
+bound to one unit ID that shares the parent ``ModbusTCPResiliente``
+connection, while backoff and failure state are tracked per unit so a dead
+slave does not throttle or close the socket for the healthy ones.
+"""
+
+import functools
+import time
+
+
+class _UnitState:
+    """Estado de backoff (e suporte a FC23) de um unit ID."""
+
+    __slots__ = ("failure_count", "current_retry_delay", "retry_at", "fc23_supported")
+
+    def __init__(self, retry_delay: float) -> None:
+        self.failure_count = 0
+        self.current_retry_delay = retry_delay
+        self.retry_at = 0.0  # time.monotonic()
+        # Suporte a FC23 (Read/Write Multiple Registers): None = ainda não testado
+        self.fc23_supported = None
+
+    def in_backoff(self) -> bool:
+        return self.failure_count > 0 and time.monotonic() < self.retry_at
+
+    def mark_failure(self, base_delay: float, max_delay: float) -> None:
+        if self.failure_count:
+            self.current_retry_delay = min(self.current_retry_delay * 2, max_delay)
+        else:
+            self.current_retry_delay = base_delay
+        self.failure_count += 1
+        self.retry_at = time.monotonic() + self.current_retry_delay
+
+    def mark_success(self, base_delay: float) -> None:
+        self.failure_count = 0
+        self.current_retry_delay = base_delay
+        self.retry_at = 0.0
+
+
+class ModbusUnit:
+    """Visão de um unit ID que compartilha a conexão de um ``ModbusTCPResiliente``.
+
+    Qualquer método público do cliente pode ser chamado na visão; a chamada é
+    executada com o unit ID da visão:
+
+    ```py
+    gw = ModbusTCPResiliente(host="10.0.0.5")
+    inversor = gw.unit(7)
+    inversor.read_holding_typed_safe(100, ModbusDataType.FLOAT32)
+    ```
+    """
+
+    def __init__(self, parent, unit_id: int) -> None:
+        self._parent = parent
+        self.unit_id = unit_id
+
+    def __repr__(self) -> str:
+        return f"ModbusUnit(unit_id={self.unit_id}, parent={self._parent!r})"
+
+    @property
+    def fc23_supported(self):
+        """Suporte a FC23 deste unit ID (``None`` = ainda não testado)."""
+        state = self._parent._unit_states.get(self.unit_id)
+        return state.fc23_supported if state is not None else None
+
+    def __getattr__(self, name):
+        attr = getattr(self._parent, name)
+        if not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        def call(*args, **kwargs):
+            with self._parent._using_unit(self.unit_id):
+                return attr(*args, **kwargs)
+
+        return call
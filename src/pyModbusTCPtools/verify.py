@@ -0,0 +1,165 @@
+"""
+Verified writes with read-back for batches of setpoints.
+
+A setpoint batch is encoded up front and grouped into contiguous register
+runs. Each run is written and read back in a single round trip with FC23
+(Read/Write Multiple Registers) when the device supports it; otherwise runs
+are written with FC16 and read back in as few contiguous FC03 reads as
+possible. Read-back values are compared with the requested ones (floats with
+a tolerance) and every mismatch or failure of the batch is returned in one
+``VerifiedWriteReport``.
+"""
+
+import math
+from dataclasses import dataclass, field
+from typing import Any, List, Optional, Sequence, Tuple
+
+from .codec import MAX_FC23_WRITE, MAX_READ_REGISTERS, MAX_WRITE_REGISTERS
+from .enums import Endian, ModbusDataType
+from .exceptions import ModbusConversionError
+
+
+@dataclass
+class WriteMismatch:
+    """Setpoint cuja leitura de volta não confere (ou que não foi escrito)."""
+
+    addr: int
+    dtype: ModbusDataType
+    expected: Any
+    actual: Any = None
+    reason: str = "mismatch"
+
+
+@dataclass
+class VerifiedWriteReport:
+    """Resultado único da escrita verificada de um lote de setpoints."""
+
+    total: int = 0
+    verified: int = 0
+    method: str = ""
+    requests: int = 0
+    mismatches: List[WriteMismatch] = field(default_factory=list)
+    failed: List[WriteMismatch] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.mismatches and not self.failed and self.verified == self.total
+
+    def __bool__(self) -> bool:
+        return self.ok
+
+    def to_dict(self) -> dict:
+        def row(m: WriteMismatch) -> dict:
+            return {
+                "addr": m.addr,
+                "dtype": getattr(m.dtype, "value", m.dtype),
+                "expected": m.expected,
+                "actual": m.actual,
+                "reason": m.reason,
+            }
+
+        return {
+            "ok": self.ok,
+            "total": self.total,
+            "verified": self.verified,
+            "method": self.method,
+            "requests": self.requests,
+            "mismatches": [row(m) for m in self.mismatches],
+            "failed": [row(m) for m in self.failed],
+        }
+
+
+@dataclass
+class _Setpoint:
+    addr: int
+    value: Any
+    dtype: ModbusDataType
+    endian: Endian
+    regs: List[int]
+
+    @property
+    def end(self) -> int:
+        return self.addr + len(self.regs)
+
+
+@dataclass
+class _Run:
+    """Intervalo contíguo de registradores escrito em uma requisição."""
+
+    addr: int
+    regs: List[int] = field(default_factory=list)
+    members: List[_Setpoint] = field(default_factory=list)
+
+    @property
+    def end(self) -> int:
+        return self.addr + len(self.regs)
+
+
+def parse_setpoint(item: Sequence) -> Tuple[int, Any, ModbusDataType, Endian]:
+    """Aceita ``(addr, value, dtype)`` ou ``(addr, value, dtype, endian)``.
+
+    Formatos, endereços, tipos ou endians inválidos geram ``ModbusConversionError``.
+    """
+    try:
+        if len(item) == 3:
+            addr, value, dtype = item
+            endian = Endian.BE
+        else:
+            addr, value, dtype, endian = item
+        return int(addr), value, ModbusDataType(dtype), Endian(endian)
+    except (TypeError, ValueError) as exc:
+        raise ModbusConversionError(f"Setpoint inválido {item!r}: {exc}") from None
+
+
+def invalid_setpoint(item: Sequence) -> Tuple[Any, Any, Any]:
+    """``(addr, dtype, value)`` de um setpoint inválido, para o relatório."""
+    try:
+        fields = list(item)
+    except TypeError:
+        return None, None, item
+    fields += [None] * (3 - len(fields))
+    return fields[0], fields[2], fields[1]
+
+
+def group_runs(setpoints: List[_Setpoint], limit: int) -> List[_Run]:
+    """Agrupa setpoints contíguos em runs de até ``limit`` registradores.
+
+    Um setpoint nunca é dividido entre duas requisições. Setpoints sobrepostos
+    geram ``ModbusConversionError`` antes de qualquer escrita.
+    """
+    runs: List[_Run] = []
+    current: Optional[_Run] = None
+    for sp in sorted(setpoints, key=lambda s: s.addr):
+        if current is not None and sp.addr < current.end:
+            raise ModbusConversionError(f"Setpoints sobrepostos no endereço {sp.addr}")
+        if current is None or sp.addr != current.end or len(current.regs) + len(sp.regs) > limit:
+            current = _Run(sp.addr)
+            runs.append(current)
+        current.regs.extend(sp.regs)
+        current.members.append(sp)
+    return runs
+
+
+def read_ranges(runs: List[_Run], limit: int = MAX_READ_REGISTERS) -> List[Tuple[int, int]]:
+    """Leituras ``(addr, count)`` mínimas que cobrem os runs (até ``limit`` cada)."""
+    spans: List[List[int]] = []
+    for run in runs:
+        if spans and spans[-1][1] == run.addr:
+            spans[-1][1] = run.end
+        else:
+            spans.append([run.addr, run.end])
+    reads = []
+    for start, end in spans:
+        for addr in range(start, end, limit):
+            reads.append((addr, min(limit, end - addr)))
+    return reads
+
+
+def values_match(expected, actual, dtype: ModbusDataType, rel_tol: float, abs_tol: float) -> bool:
+    """Compara valores; floats com tolerância (NaN confere com NaN)."""
+    if dtype.is_float:
+        expected, actual = float(expected), float(actual)
+        if math.isnan(expected) or math.isnan(actual):
+            return math.isnan(expected) and math.isnan(actual)
+        return math.isclose(expected, actual, rel_tol=rel_tol, abs_tol=abs_tol)
+    return int(expected) == int(actual)
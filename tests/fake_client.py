@@ -0,0 +1,88 @@
+"""In-memory stand-in for ``pyModbusTCP.client.ModbusClient`` used by tests."""
+
+
+class FakeModbusClient:
+    def __init__(self, holding=None, inputs=None, coils=None, discrete=None):
+        self.holding = dict(holding or {})
+        self.inputs = dict(inputs or {})
+        self.coils = dict(coils or {})
+        self.discrete = dict(discrete or {})
+        self.is_open = True
+        self.unit_id = 1
+        self.last_error = 0
+        self.last_except = 0
+        self.requests = []
+        self.dead_units = set()     # respondem com exceção de gateway (0x0B)
+        self.timeout_units = set()  # não respondem (timeout fecha o socket)
+
+    def open(self):
+        self.is_open = True
+        return True
+
+    def close(self):
+        self.is_open = False
+
+    def _unit_failed(self):
+        if self.unit_id in self.dead_units:
+            self.last_error = 7
+            self.last_except = 0x0B
+            return True
+        if self.unit_id in self.timeout_units:
+            self.last_error = 5
+            self.is_open = False
+            return True
+        return False
+
+    def _read(self, table, name, addr, count):
+        self.requests.append((name, addr, count))
+        self.last_error = 0
+        self.last_except = 0
+        if self._unit_failed():
+            return None
+        try:
+            return [table[a] for a in range(addr, addr + count)]
+        except KeyError:
+            self.last_error = 7
+            self.last_except = 2
+            return None
+
+    def read_holding_registers(self, addr, count=1):
+        return self._read(self.holding, "hr", addr, count)
+
+    def read_input_registers(self, addr, count=1):
+        return self._read(self.inputs, "ir", addr, count)
+
+    def read_coils(self, addr, count=1):
+        return self._read(self.coils, "c", addr, count)
+
+    def read_discrete_inputs(self, addr, count=1):
+        return self._read(self.discrete, "di", addr, count)
+
+    def write_single_register(self, addr, value):
+        self.requests.append(("w_hr", addr, 1))
+        self.holding[addr] = value
+        return True
+
+    def write_multiple_registers(self, addr, values):
+        self.requests.append(("w_hr", addr, len(values)))
+        for i, v in enumerate(values):
+            self.holding[addr + i] = v
+        return True
+
+    def write_single_coil(self, addr, value):
+        self.requests.append(("w_c", addr, 1))
+        self.coils[addr] = bool(value)
+        return True
+
+    def write_multiple_coils(self, addr, values):
+        self.requests.append(("w_c", addr, len(values)))
+        for i, v in enumerate(values):
+            self.coils[addr + i] = bool(v)
+        return True
+
+    def write_read_multiple_registers(self, write_addr, write_values, read_addr, read_nb=1):
+        for i, v in enumerate(write_values):
+            self.holding[write_addr + i] = v
+        values = self._read(self.holding, "hr", read_addr, read_nb)
+        self.requests[-1] = ("wr_hr", write_addr, len(write_values))
+        return values
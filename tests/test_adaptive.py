@@ -0,0 +1,102 @@
+import unittest
+
+from fake_client import FakeModbusClient
+
+from pyModbusTCPtools import AdaptivePoller, ModbusTCPResiliente
+from pyModbusTCPtools.tagmap import Tag
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += max(seconds, 0.001)
+
+
+class TestAdaptivePoller(unittest.TestCase):
+    def setUp(self) -> None:
+        self.client = ModbusTCPResiliente(host="127.0.0.1", log_file=None, retry_delay=0.0)
+        self.fake = FakeModbusClient(holding={0: 0, 10: 5, 20: 0}, coils={3: False})
+        self.client.client = self.fake
+        self.clock = FakeClock()
+        self.tags = [Tag("idle", "hr", 10), Tag("busy", "hr", 20), Tag("flag", "c", 3)]
+
+    def poller(self, **kwargs) -> AdaptivePoller:
+        kwargs.setdefault("min_interval", 0.5)
+        kwargs.setdefault("max_interval", 8.0)
+        return AdaptivePoller(self.client, self.tags, clock=self.clock, **kwargs)
+
+    def test_idle_tags_slow_down_and_changing_tags_speed_up(self) -> None:
+        poller = self.poller()
+        for _ in range(200):
+            self.fake.holding[20] += 1
+            poller.poll()
+            self.clock.sleep(poller.next_poll_in())
+
+        stats = poller.stats()
+        self.assertEqual(8.0, stats["tags"]["idle"]["interval"])
+        self.assertEqual(0.5, stats["tags"]["busy"]["interval"])
+        self.assertGreater(stats["tags"]["busy"]["effective_rate"], 1.5)
+        self.assertLess(stats["tags"]["idle"]["effective_rate"], 0.3)
+        self.assertGreater(stats["tags"]["busy"]["change_rate"], 0.9)
+        self.assertEqual(0, stats["tags"]["idle"]["changes"])
+        self.assertGreater(stats["requests_saved"], 0)
+        self.assertGreater(stats["bytes_saved"], 0)
+
+    def test_request_budget_is_enforced(self) -> None:
+        self.tags = [Tag(f"t{i}", "hr", 10, scan_rate=0.1) for i in range(20)]
+        poller = self.poller(min_interval=0.1, max_interval=0.1, max_rps=5)
+        poller.run(10.0, sleep=self.clock.sleep)
+        stats = poller.stats()
+        # o orçamento conta o ping de is_connected que precede cada leitura
+        self.assertLessEqual(len(self.fake.requests), 5 * 10 + 5)
+        self.assertLessEqual(stats["device_rps"], 5.5)
+        self.assertGreater(stats["throttled"], 0)
+        # todas as tags são atendidas (as mais atrasadas primeiro)
+        self.assertTrue(all(t["reads"] > 0 for t in stats["tags"].values()))
+
+    def test_budget_is_shared_per_device(self) -> None:
+        self.tags = [Tag(f"t{i}", "hr", 10, scan_rate=0.1) for i in range(10)]
+        first = self.poller(min_interval=0.1, max_interval=0.1, max_rps=8)
+        second = self.poller(min_interval=0.1, max_interval=0.1, max_rps=4)
+        self.assertIs(first.budget, second.budget)
+        for i in range(100):
+            for poller in (first, second) if i % 2 else (second, first):
+                poller.poll()
+            self.clock.sleep(0.1)
+        self.assertLessEqual(len(self.fake.requests), 4 * 10 + 4)
+        self.assertGreater(first.requests, 0)
+        self.assertGreater(second.requests, 0)
+
+    def test_change_after_max_interval_reschedules_at_min(self) -> None:
+        self.tags = [Tag("slow", "hr", 10, scan_rate=60.0)]
+        poller = self.poller(min_interval=0.1, max_interval=60.0)
+        poller.poll()
+        self.assertEqual(60.0, poller.states["slow"].next_due)
+        self.clock.now = 60.0
+        self.fake.holding[10] = 500
+        self.assertEqual({"slow": 500}, poller.poll())
+        state = poller.states["slow"]
+        self.assertEqual(0.1, state.interval)
+        self.assertAlmostEqual(60.1, state.next_due)
+
+    def test_failed_read_keeps_interval(self) -> None:
+        self.tags = [Tag("missing", "hr", 99, scan_rate=2.0)]
+        poller = self.poller()
+        self.assertEqual({"missing": None}, poller.poll())
+        self.assertEqual(2.0, poller.stats()["tags"]["missing"]["interval"])
+        self.assertEqual(1, poller.stats()["tags"]["missing"]["failures"])
+
+    def test_invalid_bounds(self) -> None:
+        with self.assertRaises(ValueError):
+            self.poller(min_interval=5.0, max_interval=1.0)
+        with self.assertRaises(ValueError):
+            self.poller(max_rps=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
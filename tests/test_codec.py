@@ -0,0 +1,143 @@
+import math
+import random
+import unittest
+
+from fake_client import FakeModbusClient
+
+from pyModbusTCPtools import Endian, ModbusConversionError, ModbusDataType, ModbusTCPResiliente
+from pyModbusTCPtools.codec import decode_values, encode_entries, encode_values
+
+
+class TestCodec(unittest.TestCase):
+    def setUp(self) -> None:
+        self.client = ModbusTCPResiliente(host="127.0.0.1", log_file=None)
+
+    def test_matches_scalar_converters(self) -> None:
+        rng = random.Random(7)
+        samples = {
+            ModbusDataType.INT16: [-32768, -1, 0, 1234, 32767],
+            ModbusDataType.UINT16: [0, 1, 0xFFFF],
+            ModbusDataType.INT32: [-(1 << 31), -5, 0, (1 << 31) - 1, rng.randint(-(1 << 31), 1 << 30)],
+            ModbusDataType.UINT32: [0, 1, 0xFFFFFFFF, rng.randint(0, 0xFFFFFFFF)],
+            ModbusDataType.INT64: [-(1 << 63), -1, (1 << 63) - 1, rng.randint(-(1 << 62), 1 << 62)],
+            ModbusDataType.UINT64: [0, 0x0102030405060708, 0xFFFFFFFFFFFFFFFF],
+            ModbusDataType.FLOAT32: [0.0, -1.5, 3.25, 1e10],
+            ModbusDataType.FLOAT64: [0.0, -1.5, math.pi, 1e300],
+        }
+        for dtype, values in samples.items():
+            for endian in Endian:
+                regs = encode_values(values, dtype, endian)
+                scalar = [r for v in values for r in self.client._encode_typed(v, dtype, endian)]
+                self.assertEqual(scalar, regs, (dtype, endian))
+                decoded = decode_values(regs, dtype, endian)
+                width = dtype.registers
+                expected = [
+                    self.client._decode_typed(regs[i:i + width], dtype, endian)
+                    for i in range(0, len(regs), width)
+                ]
+                self.assertEqual(expected, decoded, (dtype, endian))
+
+    def test_range_validation(self) -> None:
+        with self.assertRaisesRegex(ModbusConversionError, "UINT32 fora do range"):
+            encode_values([1, 0x100000000], ModbusDataType.UINT32)
+        with self.assertRaisesRegex(ModbusConversionError, "FLOAT32 fora do range"):
+            encode_values([1.0, 1e40], ModbusDataType.FLOAT32)
+        with self.assertRaises(ModbusConversionError):
+            encode_values([1.5], ModbusDataType.INT16)
+        with self.assertRaises(ModbusConversionError):
+            decode_values([1, 2, 3], ModbusDataType.UINT32)
+
+    def test_entries_keep_order(self) -> None:
+        out = encode_entries([(10, 1, ModbusDataType.UINT16), (0, 1, ModbusDataType.UINT32, Endian.LE),
+                              (20, 2, ModbusDataType.UINT16)])
+        self.assertEqual([(10, [1]), (0, [1, 0]), (20, [2])], out)
+
+
+class TestWriteTypedBatch(unittest.TestCase):
+    def setUp(self) -> None:
+        self.client = ModbusTCPResiliente(host="127.0.0.1", log_file=None, retry_delay=0.0)
+        self.fake = FakeModbusClient(holding={0: 0})
+        self.client.client = self.fake
+
+    def writes(self):
+        return [r for r in self.fake.requests if r[0] == "w_hr"]
+
+    def test_recipe_in_minimal_requests(self) -> None:
+        entries = []
+        addr = 100
+        for i in range(200):
+            dtype = (ModbusDataType.INT32, ModbusDataType.FLOAT32, ModbusDataType.FLOAT64)[i % 3]
+            value = float(i) if dtype.is_float else -i
+            entries.append((addr, value, dtype, Endian.LE))
+            addr += dtype.registers
+        total = addr - 100
+        self.assertTrue(self.client.write_typed_batch_safe(entries))
+
+        writes = self.writes()
+        self.assertEqual(-(-total // 123), len(writes))
+        self.assertEqual(total, sum(n for _, _, n in writes))
+        for a, value, dtype, endian in entries[::17]:
+            self.assertEqual(value, self.client.read_holding_typed_safe(a, dtype, endian))
+
+    def test_separate_ranges_and_no_split_values(self) -> None:
+        entries = [(i * 2, 1.0, ModbusDataType.FLOAT32) for i in range(62)]  # 124 registradores
+        entries.append((500, 7, ModbusDataType.UINT16))
+        self.assertTrue(self.client.write_typed_batch_safe(entries))
+        self.assertEqual([("w_hr", 0, 122), ("w_hr", 122, 2), ("w_hr", 500, 1)], self.writes())
+
+    def test_invalid_value_sends_nothing(self) -> None:
+        entries = [(10, 5, ModbusDataType.UINT32), (12, -1, ModbusDataType.UINT32), (14, 2.0, ModbusDataType.FLOAT32)]
+        self.assertFalse(self.client.write_typed_batch_safe(entries))
+        self.assertEqual([], self.writes())
+        self.assertEqual(1, self.client.error_policy.by_error["ModbusConversionError"])
+
+    def test_overlap_rejected(self) -> None:
+        self.assertFalse(self.client.write_typed_batch_safe([(10, 5, ModbusDataType.UINT32), (11, 1, ModbusDataType.UINT16)]))
+        self.assertEqual([], self.writes())
+        self.assertEqual(1, self.client.error_policy.by_error["ModbusConversionError"])
+
+
+    def test_invalid_address_or_entry_sends_nothing(self) -> None:
+        class AddressCheckingClient(FakeModbusClient):
+            # como o pyModbusTCP, rejeita escritas além do espaço de endereços
+            def write_multiple_registers(self, addr, values):
+                if addr + len(values) > 0x10000:
+                    raise ValueError("write after end of modbus address space")
+                return super().write_multiple_registers(addr, values)
+
+        self.client.client = self.fake = AddressCheckingClient(holding={0: 0})
+        bad_batches = [
+            [(0, 7, ModbusDataType.UINT16), (65535, 1.5, ModbusDataType.FLOAT32)],
+            [(0, 7, ModbusDataType.UINT16), (-1, 1, ModbusDataType.UINT16)],
+            [(0, 1)],
+            [(0, 1, "foo")],
+            [(0, 1, ModbusDataType.UINT32, "xx")],
+            [("a", 1, ModbusDataType.UINT16)],
+            [7],
+        ]
+        for entries in bad_batches:
+            self.assertFalse(self.client.write_typed_batch_safe(entries), entries)
+        self.assertEqual([], self.writes())
+        self.assertEqual(len(bad_batches), self.client.error_policy.by_error["ModbusConversionError"])
+        self.assertTrue(self.client.write_typed_batch_safe([(65535, 7, ModbusDataType.UINT16)]))
+
+    def test_partial_write_logs_unsent_ranges(self) -> None:
+        class FailAt500(FakeModbusClient):
+            def write_multiple_registers(self, addr, values):
+                if addr >= 500:
+                    self.requests.append(("w_hr", addr, len(values)))
+                    self.last_except = 2
+                    return None
+                return super().write_multiple_registers(addr, values)
+
+        self.client.client = self.fake = FailAt500(holding={0: 0})
+        entries = [(0, 1, ModbusDataType.UINT16), (500, 2, ModbusDataType.UINT32), (900, 3, ModbusDataType.UINT16)]
+        with self.assertLogs(self.client.logger, level="ERROR") as logs:
+            self.assertFalse(self.client.write_typed_batch_safe(entries))
+        self.assertEqual([("w_hr", 0, 1), ("w_hr", 500, 2)], self.writes())
+        self.assertIn("1/3", logs.output[-1])
+        self.assertIn("500-501, 900-900", logs.output[-1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -6,7 +6,7 @@ from pyModbusTCPtools import Endian, ModbusTCPResiliente
 
 class TestModbusConversions(unittest.TestCase):
     def setUp(self) -> None:
-        self.client = ModbusTCPResiliente(host="127.0.0.1")
+        self.client = ModbusTCPResiliente(host="127.0.0.1", log_file=None)
 
     def test_int16_roundtrip(self) -> None:
         value = -12345
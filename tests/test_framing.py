@@ -0,0 +1,123 @@
+import socket
+import threading
+import unittest
+
+from pyModbusTCP.server import DataBank, ModbusServer
+
+from pyModbusTCPtools import Endian, ModbusDataType, ModbusTCPResiliente
+from pyModbusTCPtools.framing import NativeModbusClient
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class TestNativeFraming(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.port = free_port()
+        cls.bank = DataBank(h_regs_size=200, i_regs_size=200, coils_size=200, d_inputs_size=200)
+        cls.server = ModbusServer(host="127.0.0.1", port=cls.port, no_block=True, data_bank=cls.bank)
+        cls.server.start()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.server.stop()
+
+    def setUp(self) -> None:
+        self.native = NativeModbusClient("127.0.0.1", self.port, timeout=2.0)
+
+    def tearDown(self) -> None:
+        self.native.close()
+
+    def test_socket_tuning(self) -> None:
+        self.assertTrue(self.native.open())
+        sock = self.native._sock
+        self.assertEqual(1, sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY))
+        self.assertEqual(1, sock.getsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE))
+
+    def test_registers_roundtrip(self) -> None:
+        self.assertTrue(self.native.write_multiple_registers(10, [1, 2, 0xFFFF]))
+        self.assertEqual([1, 2, 0xFFFF], self.native.read_holding_registers(10, 3))
+        self.assertTrue(self.native.write_single_register(20, 1234))
+        self.assertEqual([1234], self.native.read_holding_registers(20))
+        self.bank.set_input_registers(5, [7, 8])
+        self.assertEqual([7, 8], self.native.read_input_registers(5, 2))
+        self.assertEqual([9, 9], self.native.write_read_multiple_registers(30, [9, 9], 30, 2))
+        self.assertEqual((0, 0), self.native.last_result)
+
+    def test_bits_roundtrip(self) -> None:
+        bits = [True, False, True, True, False, False, False, True, True]
+        self.assertTrue(self.native.write_multiple_coils(40, bits))
+        self.assertEqual(bits, self.native.read_coils(40, len(bits)))
+        self.assertTrue(self.native.write_single_coil(60, True))
+        self.assertEqual([True], self.native.read_coils(60))
+        self.bank.set_discrete_inputs(3, [True, True])
+        self.assertEqual([True, True, False], self.native.read_discrete_inputs(3, 3))
+
+    def test_address_range_matches_pymodbustcp(self) -> None:
+        calls = [
+            lambda: self.native.write_multiple_registers(65535, [1, 2]),
+            lambda: self.native.write_multiple_registers(65536, [1]),
+            lambda: self.native.write_single_register(-1, 1),
+            lambda: self.native.write_single_coil(65536, True),
+            lambda: self.native.write_multiple_coils(65530, [True] * 7),
+            lambda: self.native.read_holding_registers(65500, 100),
+            lambda: self.native.read_coils(0x10000, 1),
+            lambda: self.native.write_read_multiple_registers(0, [1], 65535, 2),
+            lambda: self.native.write_read_multiple_registers(65535, [1, 2], 0, 1),
+        ]
+        for call in calls:
+            with self.assertRaises(ValueError):
+                call()
+        self.assertIsNone(self.native._sock)  # nada foi enviado
+        self.assertIsNone(self.native.read_holding_registers(65535, 1))  # fora do DataBank: exceção Modbus
+        self.assertEqual(2, self.native.last_except)
+
+    def test_exception_reply_keeps_socket(self) -> None:
+        self.assertIsNone(self.native.read_holding_registers(500, 2))
+        self.assertEqual((7, 2), self.native.last_result)
+        self.assertTrue(self.native.is_open)
+
+    def test_connect_error(self) -> None:
+        client = NativeModbusClient("127.0.0.1", free_port(), timeout=0.5)
+        self.assertIsNone(client.read_holding_registers(0))
+        self.assertEqual(2, client.last_error)
+        self.assertFalse(client.is_open)
+
+    def test_resilient_client_with_native_backend(self) -> None:
+        client = ModbusTCPResiliente(host="127.0.0.1", port=self.port, log_file=None, backend="native")
+        self.assertTrue(client.write_holding_typed_safe(100, -1.5, ModbusDataType.FLOAT32, Endian.LE))
+        self.assertEqual(-1.5, client.read_holding_typed_safe(100, ModbusDataType.FLOAT32, Endian.LE))
+        self.assertIsNone(client.read_holding_registers_safe(300, 1))
+        self.assertEqual(1, len(client.get_invalid_cache_snapshot()))
+        self.assertEqual(2 * 260, client.get_memory_usage()["buffers"])
+        client.close()
+
+    def test_timeout_is_reported(self) -> None:
+        listener = socket.socket()
+        listener.bind(("127.0.0.1", 0))
+        listener.listen(1)
+        accepted = []
+        t = threading.Thread(target=lambda: accepted.append(listener.accept()))
+        t.start()
+        client = NativeModbusClient("127.0.0.1", listener.getsockname()[1], timeout=0.2)
+        try:
+            self.assertIsNone(client.read_holding_registers(0))
+            self.assertEqual(5, client.last_error)
+            self.assertFalse(client.is_open)
+        finally:
+            t.join()
+            for conn, _ in accepted:
+                conn.close()
+            listener.close()
+
+    def test_invalid_backend(self) -> None:
+        with self.assertRaises(ValueError):
+            ModbusTCPResiliente(host="127.0.0.1", log_file=None, backend="serial")
+
+
+if __name__ == "__main__":
+    unittest.main()
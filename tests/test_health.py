@@ -0,0 +1,93 @@
+import unittest
+
+from fake_client import FakeModbusClient
+
+from pyModbusTCPtools import FleetHealth, ModbusTCPResiliente
+from pyModbusTCPtools.health import ClientHealth, Histogram
+
+
+class TestHistogram(unittest.TestCase):
+    def test_percentiles_and_merge(self) -> None:
+        a, b = Histogram(), Histogram()
+        for _ in range(90):
+            a.add(0.002)
+        for _ in range(10):
+            b.add(0.5)
+        a.merge(b)
+        self.assertEqual(100, a.count)
+        self.assertLess(a.percentile(50), 0.004)
+        self.assertGreaterEqual(a.percentile(50), 0.002)
+        self.assertEqual(0.5, a.percentile(99))
+        self.assertEqual(0.5, a.max)
+        self.assertEqual(len(a.counts), len(b.counts))
+
+
+class TestClientHealth(unittest.TestCase):
+    def test_bounded_time_series_and_rates(self) -> None:
+        health = ClientHealth(interval=10.0, history=3)
+        for t in range(0, 100, 2):
+            health.record_request(0.01, ok=t % 10 != 0, now=1000.0 + t)
+        self.assertEqual(3, len(health.buckets))
+        rates = health.rates(window=30.0, now=1100.0)
+        self.assertAlmostEqual(15 / 30.0, rates["request_rate"])
+        self.assertAlmostEqual(3 / 30.0, rates["error_rate"])
+        self.assertEqual(50, health.requests)
+
+    def test_transitions_only_on_change(self) -> None:
+        health = ClientHealth(max_transitions=2)
+        for state in ("connected", "connected", "disconnected", "connected"):
+            health.set_state(state)
+        self.assertEqual(["disconnected", "connected"], [s for _, s in health.transitions])
+
+
+class TestClientIntegration(unittest.TestCase):
+    def make(self, port, **kwargs):
+        client = ModbusTCPResiliente(host="127.0.0.1", port=port, log_file=None, retry_delay=0.0, **kwargs)
+        client.client = FakeModbusClient(holding={0: 0, 1: 5})
+        return client
+
+    def test_client_records_requests_errors_and_state(self) -> None:
+        client = self.make(502)
+        self.assertIsNone(client.health)
+        client.read_holding_registers_safe(1, 1)
+        client.read_holding_registers_safe(50, 1)
+        snap = client.get_health_snapshot()
+        self.assertEqual("connected", snap["state"])
+        self.assertEqual((2, 1), (snap["requests"], snap["failures"]))
+        self.assertEqual({"ModbusProtocolError": 1}, snap["errors"])
+        self.assertGreater(client.get_memory_usage()["health"], 0)
+
+        client.client.timeout_units.add(1)
+        client.read_holding_registers_safe(1, 1)
+        client.client.timeout_units.clear()
+        self.assertEqual("disconnected", client.health.state)
+        client.read_holding_registers_safe(1, 1)
+        snap = client.get_health_snapshot()
+        self.assertEqual(1, snap["reconnects"])
+        self.assertEqual(["connected", "disconnected", "connected"], [s for _, s in snap["transitions"]])
+
+    def test_disabled(self) -> None:
+        client = self.make(502, track_health=False)
+        client.read_holding_registers_safe(1, 1)
+        self.assertIsNone(client.health)
+        self.assertEqual({}, client.get_health_snapshot())
+
+    def test_fleet_snapshot(self) -> None:
+        clients = [self.make(1000 + i) for i in range(5)]
+        for i, client in enumerate(clients[:4]):
+            for _ in range(i + 1):
+                client.read_holding_registers_safe(50 + i, 1)  # erro de protocolo
+            client.read_holding_registers_safe(1, 1)
+        snap = FleetHealth(clients).snapshot(window=60.0, top=2, per_client=True)
+        self.assertEqual(5, snap["clients"])
+        self.assertEqual({"connected": 4, "idle": 1}, snap["states"])
+        # leituras de endereços em quarentena não chegam ao dispositivo
+        self.assertEqual(4 + 4, snap["latency"]["count"])
+        # e também não contam como erro
+        self.assertEqual({"ModbusProtocolError": 4}, snap["errors"])
+        self.assertEqual(["127.0.0.1:1003", "127.0.0.1:1002"], [w["client"] for w in snap["worst"]])
+        self.assertEqual(4, len(snap["per_client"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import logging
+import os
+import tempfile
+import unittest
+
+from fake_client import FakeModbusClient
+
+from pyModbusTCPtools import ModbusTCPResiliente
+from pyModbusTCPtools.modbustools import SHARED_LOGGER_NAME
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+class TestLightweight(unittest.TestCase):
+    def test_modbus_client_is_created_lazily(self) -> None:
+        client = ModbusTCPResiliente(host="127.0.0.1", port=1502, unit_id=3, log_file=None)
+        self.assertIsNone(client._client)
+        client.close()
+        self.assertIsNone(client._client)
+
+        inner = client.client
+        self.assertEqual(("127.0.0.1", 1502, 3), (inner.host, inner.port, inner.unit_id))
+        self.assertIs(inner, client.client)
+
+    def test_lightweight_clients_share_one_logger(self) -> None:
+        a = ModbusTCPResiliente(host="10.0.0.1", log_file=None, lightweight=True)
+        b = ModbusTCPResiliente(host="10.0.0.2", log_file=None, lightweight=True)
+        self.assertIs(a.logger, b.logger)
+        self.assertEqual(SHARED_LOGGER_NAME, a.logger.name)
+
+        handler = ListHandler()
+        a.logger.addHandler(handler)
+        try:
+            b.client = FakeModbusClient()
+            b.close()
+        finally:
+            a.logger.removeHandler(handler)
+        self.assertEqual(["[10.0.0.2:502] Conexão encerrada"], handler.messages)
+
+    def test_shared_logger_targets_are_per_config(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "a.log")
+            with_file = ModbusTCPResiliente(host="10.0.0.4", log_file=path, lightweight=True)
+            silent = ModbusTCPResiliente(host="10.0.0.5", log_file=None, lightweight=True)
+            self.assertIsNot(with_file.logger, silent.logger)
+
+            handler = ListHandler()
+            silent.logger.addHandler(handler)
+            try:
+                silent._log_and_print("info", "silencioso")
+                with_file._log_and_print("info", "com arquivo")
+            finally:
+                silent.logger.removeHandler(handler)
+            for h in list(with_file.logger.handlers):
+                h.close()
+                with_file.logger.removeHandler(h)
+
+            with open(path) as fh:
+                text = fh.read()
+            self.assertIn("[10.0.0.4:502] com arquivo", text)
+            self.assertNotIn("silencioso", text)
+            # handlers do logger base continuam vendo todos os clientes
+            self.assertEqual(["[10.0.0.5:502] silencioso", "[10.0.0.4:502] com arquivo"], handler.messages)
+
+    def test_default_mode_keeps_per_device_logger(self) -> None:
+        client = ModbusTCPResiliente(host="10.0.0.3", log_file=None)
+        self.assertEqual("ModbusTCP.10.0.0.3:502", client.logger.name)
+        self.assertEqual("", client._log_prefix)
+
+
+if __name__ == "__main__":
+    unittest.main()
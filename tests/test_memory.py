@@ -0,0 +1,77 @@
+import sys
+import unittest
+
+from pyModbusTCPtools import ErrorAction, ErrorPolicy, ModbusReadError, ModbusTCPResiliente
+from pyModbusTCPtools.memory import MemoryBudget, fleet_memory_usage
+
+
+def make_client(host="127.0.0.1", **kwargs):
+    return ModbusTCPResiliente(host=host, log_file=None, lightweight=True, **kwargs)
+
+
+class TestMemory(unittest.TestCase):
+    def fill_quarantine(self, client, n):
+        for addr in range(n):
+            client._mark_invalid_cached(client._cache_key("hr", addr, 1))
+
+    def test_state_uses_slots(self) -> None:
+        client = make_client()
+        self.assertIn("current_retry_delay", ModbusTCPResiliente.__slots__)
+
+        # mesmo estado em um objeto comum (com __dict__) ocupa mais memória
+        class Plain:
+            pass
+
+        plain = Plain()
+        for name in ModbusTCPResiliente.__slots__:
+            if name not in ("__dict__", "__weakref__") and hasattr(client, name):
+                setattr(plain, name, getattr(client, name))
+        state = client.get_memory_usage()["state"]
+        self.assertLess(sys.getsizeof(client), sys.getsizeof(plain) + sys.getsizeof(plain.__dict__))
+
+        client.extra = 1  # atributos extras continuam permitidos (o __dict__ é criado sob demanda)
+        self.assertEqual(1, client.extra)
+        self.assertGreater(client.get_memory_usage()["state"], state)
+
+    def test_default_rules_are_shared_until_changed(self) -> None:
+        a, b = ErrorPolicy(), ErrorPolicy()
+        self.assertIs(a._rules, b._rules)
+        a.set_rule(ModbusReadError, ErrorAction.RECONNECT)
+        self.assertEqual(ErrorAction.RETRY, b.rule_for(ModbusReadError("x")).action)
+
+    def test_usage_grows_with_quarantine_and_trim(self) -> None:
+        client = make_client()
+        empty = client.get_memory_usage()
+        self.fill_quarantine(client, 200)
+        full = client.get_memory_usage()
+        self.assertGreater(full["invalid_cache"], empty["invalid_cache"])
+        self.assertEqual(full["total"], sum(v for k, v in full.items() if k != "total"))
+
+        freed = client.trim_memory(empty["total"] + 2000)
+        self.assertGreater(freed, 0)
+        self.assertLess(len(client._invalid_addr_cache), 200)
+        # as entradas mais recentes são mantidas
+        self.assertIn(client._cache_key("hr", 199, 1), client._invalid_addr_cache)
+
+    def test_unit_states_cap(self) -> None:
+        client = make_client(unit_states_max=4, retry_delay=0.0)
+        for unit in range(10):
+            client._mark_unit_failure(unit)
+        self.assertEqual(4, len(client._unit_states))
+        self.assertIn(9, client._unit_states)
+
+    def test_fleet_usage_and_budget(self) -> None:
+        clients = [make_client(host=f"10.0.0.{i}") for i in range(5)]
+        self.fill_quarantine(clients[2], 300)
+        report = fleet_memory_usage(clients, top=2)
+        self.assertEqual(5, report["clients"])
+        self.assertEqual("10.0.0.2:502", report["top"][0]["device"])
+        self.assertEqual(report["total"], report["by_category"]["total"])
+
+        budget = MemoryBudget(max_fleet_bytes=report["total"] // 2)
+        self.assertGreater(budget.enforce(clients), 0)
+        self.assertLessEqual(fleet_memory_usage(clients)["total"], budget.max_fleet_bytes)
+
+
+if __name__ == "__main__":
+    unittest.main()
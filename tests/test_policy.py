@@ -0,0 +1,102 @@
+import unittest
+
+from fake_client import FakeModbusClient
+
+from pyModbusTCPtools import (
+    ErrorAction,
+    ErrorPolicy,
+    ModbusDataType,
+    ModbusReadError,
+    ModbusTCPResiliente,
+)
+
+
+class FlakyClient(FakeModbusClient):
+    """Falha as primeiras ``fail`` leituras de dados (o ping no endereço 0 responde)."""
+
+    def __init__(self, fail, code=0, error=7, **kwargs):
+        super().__init__(**kwargs)
+        self.fail = fail
+        self.code = code
+        self.error = error
+
+    def read_holding_registers(self, addr, count=1):
+        if addr != 0 and self.fail > 0:
+            self.fail -= 1
+            self.requests.append(("hr", addr, count))
+            self.last_error = self.error
+            self.last_except = self.code
+            if not self.code:
+                self.is_open = False
+            return None
+        return super().read_holding_registers(addr, count)
+
+
+class TestErrorPolicy(unittest.TestCase):
+    def setUp(self) -> None:
+        self.client = ModbusTCPResiliente(host="127.0.0.1", log_file=None)
+        self.fake = FakeModbusClient(holding={0: 1, 10: 0xFFFF, 11: 0xFFFF})
+        self.client.client = self.fake
+
+    def test_conversion_error_keeps_connection(self) -> None:
+        self.client._regs_to_float32 = lambda regs, endian: self.client._decode_typed([], ModbusDataType.UINT32, endian)
+        self.assertIsNone(self.client.read_holding_typed_safe(10, ModbusDataType.FLOAT32))
+        self.assertTrue(self.fake.is_open)
+        self.assertEqual(self.client.base_retry_delay, self.client.current_retry_delay)
+        stats = self.client.error_policy.stats()
+        self.assertEqual(1, stats["reconnects_avoided"])
+        self.assertEqual(0, stats["reconnects"])
+        self.assertEqual({"ModbusConversionError": 1}, stats["by_error"])
+
+    def test_busy_slave_is_retried_in_place(self) -> None:
+        self.fake = FlakyClient(fail=2, code=0x06, holding={0: 1, 10: 5})
+        self.client.client = self.fake
+        self.assertEqual([5], self.client.read_holding_registers_safe(10, 1))
+        self.assertEqual(3, self.fake.requests.count(("hr", 10, 1)))
+        self.assertEqual([], self.client.get_invalid_cache_snapshot())
+        stats = self.client.error_policy.stats()
+        self.assertEqual((2, 1), (stats["retries"], stats["retries_recovered"]))
+
+    def test_illegal_address_is_quarantined(self) -> None:
+        self.assertIsNone(self.client.read_holding_registers_safe(300, 1))
+        self.assertEqual(1, len(self.client.get_invalid_cache_snapshot()))
+        self.assertTrue(self.fake.is_open)
+
+    def test_rejected_requests_are_not_counted(self) -> None:
+        self.client.base_retry_delay = 60.0
+        self.fake.dead_units.add(3)
+        for _ in range(3):
+            self.assertIsNone(self.client.read_holding_registers_safe(300, 1))  # quarentena
+            self.assertIsNone(self.client.unit(3).read_holding_registers_safe(10, 1))  # backoff
+        stats = self.client.error_policy.stats()
+        self.assertEqual((1, 1), (stats["quarantined"], stats["backoffs"]))
+        self.assertEqual({"ModbusProtocolError": 1, "ModbusUnitError": 1}, stats["by_error"])
+        self.assertEqual({"ModbusProtocolError": 1, "ModbusUnitError": 1}, self.client.get_health_snapshot()["errors"])
+
+    def test_transport_error_reconnects(self) -> None:
+        self.client.client = FlakyClient(fail=1, error=5, holding={0: 1})
+        self.assertIsNone(self.client.read_holding_registers_safe(10, 1))
+        self.assertEqual(1, self.client.error_policy.reconnects)
+        self.assertEqual(self.client.base_retry_delay * 2, self.client.current_retry_delay)
+
+    def test_per_unit_rule_overrides_global(self) -> None:
+        policy = ErrorPolicy()
+        policy.set_rule(ModbusReadError, ErrorAction.BACKOFF, unit_id=7)
+        self.assertEqual(ErrorAction.BACKOFF, policy.rule_for(ModbusReadError("x"), 7).action)
+        self.assertEqual(ErrorAction.RETRY, policy.rule_for(ModbusReadError("x"), 1).action)
+
+        exc = ModbusReadError("x")
+        exc.exception_code = 0x06
+        self.assertEqual(2, policy.rule_for(exc).retries)
+
+    def test_time_saved_uses_measured_reconnect_cost(self) -> None:
+        policy = self.client.error_policy
+        policy.record_reconnect_time(0.5)
+        policy.record(ModbusReadError("x"), ErrorAction.RETRY)
+        self.assertAlmostEqual(0.5, policy.stats()["time_saved"])
+        policy.reset_stats()
+        self.assertEqual(0, policy.stats()["reconnects_avoided"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+import unittest
+
+from fake_client import FakeModbusClient
+
+from pyModbusTCPtools import ModbusDataType, ModbusTCPResiliente
+from pyModbusTCPtools.profiling import PHASES, fleet_profile, format_profile
+
+
+class DeadClient(FakeModbusClient):
+    def __init__(self):
+        super().__init__()
+        self.is_open = False
+
+    def open(self):
+        return False
+
+
+class TestProfiling(unittest.TestCase):
+    def make(self, host="10.0.0.1", **kwargs) -> ModbusTCPResiliente:
+        client = ModbusTCPResiliente(host=host, log_file=None, retry_delay=0.001, **kwargs)
+        client.client = FakeModbusClient(holding={a: a for a in range(20)})
+        return client
+
+    def test_disabled_by_default(self) -> None:
+        client = self.make()
+        self.assertIs(ModbusTCPResiliente, type(client))
+        self.assertEqual({}, client.get_profile_snapshot())
+
+    def test_phases_of_typed_read(self) -> None:
+        client = self.make(profile_sample_rate=1.0)
+        self.assertIs(ModbusTCPResiliente, type(client))
+        for _ in range(5):
+            self.assertIsNotNone(client.read_holding_typed_safe(2, ModbusDataType.FLOAT32))
+
+        snap = client.get_profile_snapshot()
+        # chamadas internas (read_holding_registers_safe, is_connected) ficam na operação externa
+        self.assertEqual(["read_holding_typed_safe"], list(snap["operations"]))
+        op = snap["operations"]["read_holding_typed_safe"]
+        self.assertEqual((5, 5), (op["calls"], op["sampled"]))
+        for name in ("ping", "request", "conversion", "other"):
+            self.assertGreater(op["phases"][name], 0.0, name)
+        self.assertEqual(0.0, op["phases"]["backoff"])
+        self.assertAlmostEqual(op["estimated_total"], sum(op["phases"].values()), places=9)
+
+    def test_backoff_and_logging(self) -> None:
+        client = self.make(profile_sample_rate=1.0)
+        client.client = DeadClient()
+        self.assertIsNone(client.read_holding_registers_safe(0, 1))
+        phases = client.get_profile_snapshot()["operations"]["read_holding_registers_safe"]["phases"]
+        self.assertGreaterEqual(phases["backoff"], 0.0008)
+        self.assertGreater(phases["logging"], 0.0)
+        self.assertGreater(phases["connect"], 0.0)
+        self.assertEqual(0.0, phases["request"])
+
+    def test_sampling_extrapolates(self) -> None:
+        client = self.make()
+        client.enable_profiling(sample_rate=0.25)
+        for _ in range(8):
+            client.read_holding_registers_safe(0, 4)
+        op = client.profiler.operations["read_holding_registers_safe"]
+        self.assertEqual((8, 2), (op.calls, op.sampled))
+        self.assertAlmostEqual(op.total * 4, op.summary()["estimated_total"])
+
+        client.disable_profiling()
+        self.assertIsNotNone(client.read_holding_registers_safe(0, 4))
+        self.assertEqual({}, client.get_profile_snapshot())
+
+    def test_interleaved_operations_are_all_sampled(self) -> None:
+        client = self.make(profile_sample_rate=0.25)
+        # ciclo de polling com 4 operações: um contador único amostraria sempre a mesma
+        for _ in range(8):
+            client.read_holding_registers_safe(0, 4)
+            client.read_coils_safe(0, 2)
+            client.read_holding_typed_safe(2, ModbusDataType.FLOAT32)
+            client.write_single_register_safe(5, 1)
+        ops = client.profiler.operations
+        self.assertEqual(4, len(ops))
+        for name, op in ops.items():
+            self.assertEqual((8, 2), (op.calls, op.sampled), name)
+
+    def test_unit_view_is_profiled(self) -> None:
+        client = self.make(profile_sample_rate=1.0)
+        self.assertIsNotNone(client.unit(3).read_holding_registers_safe(0, 2))
+        self.assertEqual(1, client.profiler.operations["read_holding_registers_safe"].calls)
+
+    def test_fleet_report(self) -> None:
+        busy = self.make("10.0.0.1", profile_sample_rate=1.0)
+        idle = self.make("10.0.0.2", profile_sample_rate=1.0)
+        plain = self.make("10.0.0.3")
+        for _ in range(20):
+            busy.read_holding_typed_safe(0, ModbusDataType.FLOAT64)
+        idle.write_holding_typed_safe(0, 1, ModbusDataType.UINT16)
+
+        report = fleet_profile([idle, busy, plain], top=5)
+        self.assertEqual(2, report["clients"])
+        self.assertEqual(set(PHASES), set(report["phases"]))
+        self.assertEqual("10.0.0.1:502", report["top_devices"][0]["device"])
+        top = report["top_operations"][0]
+        self.assertEqual(("10.0.0.1:502", "read_holding_typed_safe", 20), (top["device"], top["operation"], top["calls"]))
+
+        text = format_profile(report)
+        self.assertIn("10.0.0.1:502 read_holding_typed_safe", text)
+        self.assertIn("10.0.0.2:502 write_holding_typed_safe", text)
+
+    def test_invalid_sample_rate(self) -> None:
+        with self.assertRaises(ValueError):
+            self.make(profile_sample_rate=0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
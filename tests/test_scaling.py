@@ -0,0 +1,134 @@
+import json
+import os
+import tempfile
+import unittest
+
+from fake_client import FakeModbusClient
+
+from pyModbusTCPtools import (
+    ModbusDataType,
+    ModbusTCPResiliente,
+    ModbusTagMapError,
+    Scaling,
+    Tag,
+    compile_read_plan,
+    load_read_plan,
+)
+from pyModbusTCPtools.tagmap import tag_from_dict
+
+
+class TestScaling(unittest.TestCase):
+    def test_linear_and_clamp(self) -> None:
+        s = Scaling(0, 27648, 0.0, 10.0)
+        self.assertEqual([0.0, 5.0, 10.0, 0.0, 10.0], s.to_eu([0, 13824, 27648, -100, 32000]))
+        raw = Scaling(0, 27648, 0.0, 10.0, clamp=False).to_eu([-2764.8])
+        self.assertAlmostEqual(-1.0, raw[0])
+
+    def test_sqrt_extraction(self) -> None:
+        s = Scaling(0, 10000, 0.0, 100.0, sqrt=True)
+        eu = s.to_eu([0, 2500, 10000, -5])
+        self.assertEqual([0.0, 50.0, 100.0, 0.0], eu)
+        self.assertEqual([0, 2500, 10000], s.to_raw([0.0, 50.0, 100.0], integer=True))
+
+    def test_inverse_roundtrip(self) -> None:
+        s = Scaling(4000, 20000, -50.0, 150.0)
+        values = [-50.0, 0.0, 37.5, 150.0]
+        raws = s.to_raw(values, integer=True)
+        self.assertEqual([4000, 8000, 11000, 20000], raws)
+        self.assertEqual(values, s.to_eu(raws))
+        self.assertEqual([20000], s.to_raw([999.0], integer=True))
+
+    def test_reversed_range(self) -> None:
+        s = Scaling(0, 1000, 100.0, 0.0)
+        self.assertEqual([100.0, 75.0, 0.0], s.to_eu([0, 250, 1000]))
+        self.assertEqual([250], s.to_raw([75.0], integer=True))
+
+    def test_invalid_range(self) -> None:
+        with self.assertRaises(ValueError):
+            Scaling(0, 0, 0.0, 1.0)
+
+
+class TestScaledClient(unittest.TestCase):
+    def setUp(self) -> None:
+        self.client = ModbusTCPResiliente(host="127.0.0.1", log_file=None, retry_delay=0.0)
+        holding = {a: 0 for a in range(400)}
+        holding.update({10: 13824, 11: 0xFFFF, 12: 27648})
+        self.fake = FakeModbusClient(holding=holding)
+        self.client.client = self.fake
+        self.scaling = Scaling(0, 27648, 0.0, 10.0)
+
+    def test_typed_read(self) -> None:
+        self.assertEqual(5.0, self.client.read_holding_typed_safe(10, ModbusDataType.UINT16, scaling=self.scaling))
+        # INT16 -1 fica abaixo de raw_min e é limitado a eu_min
+        self.assertEqual(0.0, self.client.read_holding_typed_safe(11, ModbusDataType.INT16, scaling=self.scaling))
+
+    def test_array_read_is_chunked(self) -> None:
+        values = self.client.read_holding_array_safe(10, 3, ModbusDataType.INT16, scaling=self.scaling)
+        self.assertEqual([5.0, 0.0, 10.0], values)
+
+        self.fake.requests.clear()
+        floats = self.client.read_holding_array_safe(0, 100, ModbusDataType.FLOAT32)
+        self.assertEqual(100, len(floats))
+        reads = [(a, n) for name, a, n in self.fake.requests if name == "hr" and n > 1]
+        self.assertEqual([(0, 124), (124, 76)], reads)
+
+    def test_array_read_failure(self) -> None:
+        self.assertIsNone(self.client.read_holding_array_safe(390, 20))
+
+    def test_scaled_writes(self) -> None:
+        self.assertTrue(self.client.write_holding_typed_safe(20, 2.5, ModbusDataType.INT16, scaling=self.scaling))
+        self.assertEqual(6912, self.fake.holding[20])
+        entries = [(30 + i, float(i), ModbusDataType.UINT16, "be", self.scaling) for i in range(11)]
+        self.assertTrue(self.client.write_typed_batch_safe(entries))
+        self.assertEqual([round(i * 2764.8) for i in range(11)], [self.fake.holding[30 + i] for i in range(11)])
+        self.assertFalse(self.client.write_typed_batch_safe([(50, "x", ModbusDataType.UINT16, "be", self.scaling)]))
+
+    def test_read_plan_applies_scaling_per_tag(self) -> None:
+        self.fake.holding[13] = 27648
+        flow = Scaling(0, 27648, 0.0, 400.0, sqrt=True)
+        plan = compile_read_plan([
+            Tag("level", "hr", 10, ModbusDataType.UINT16, scaling=self.scaling),
+            Tag("flow", "hr", 12, ModbusDataType.UINT16, scaling=flow),
+            Tag("temp", "hr", 13, ModbusDataType.UINT16, scaling=self.scaling, scale=10.0, offset=1.0, scan_rate=2.0),
+            Tag("raw", "hr", 11),
+        ])
+        values = self.client.read_plan_safe(plan)
+        self.assertEqual({"level": 5.0, "flow": 400.0, "temp": 101.0, "raw": 0xFFFF}, values)
+
+
+class TestScalingTagMap(unittest.TestCase):
+    def test_csv_and_plan_cache(self) -> None:
+        text = (
+            "name,area,addr,dtype,raw_min,raw_max,eu_min,eu_max,clamp,sqrt\n"
+            "level,hr,0,int16,0,27648,0,10,,\n"
+            "flow,hr,1,uint16,0,10000,0,50,false,true\n"
+            "raw,hr,2,,,,,,,\n"
+        )
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "tags.csv")
+            with open(path, "w") as fh:
+                fh.write(text)
+            plan = load_read_plan(path, cache_dir=tmp)
+            self.assertEqual(Scaling(0, 27648, 0.0, 10.0), plan.tags["level"].scaling)
+            self.assertEqual(Scaling(0, 10000, 0.0, 50.0, clamp=False, sqrt=True), plan.tags["flow"].scaling)
+            self.assertIsNone(plan.tags["raw"].scaling)
+            cached = load_read_plan(path, cache_dir=tmp)
+            self.assertEqual(plan.tags, cached.tags)
+            json.dumps(cached.to_dict())
+
+            with open(path, "w") as fh:
+                fh.write("name,area,addr,raw_min,raw_max\nx,hr,0,0,10\n")
+            with self.assertRaises(ModbusTagMapError):
+                load_read_plan(path, cache_dir=None)
+
+    def test_boolean_columns_are_strict(self) -> None:
+        row = {"name": "flow", "area": "hr", "addr": 0, "raw_min": 0, "raw_max": 10, "eu_min": 0, "eu_max": 1}
+        self.assertEqual(Scaling(0, 10, 0.0, 1.0, clamp=False, sqrt=True),
+                         tag_from_dict({**row, "clamp": "Não", "sqrt": " SIM "}).scaling)
+        for field in ("clamp", "sqrt"):
+            with self.assertRaisesRegex(ModbusTagMapError, field):
+                tag_from_dict({**row, field: "talvez"})
+
+
+if __name__ == "__main__":
+    unittest.main()
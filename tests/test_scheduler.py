@@ -0,0 +1,95 @@
+import threading
+import unittest
+
+from fake_client import FakeModbusClient
+
+from pyModbusTCPtools import (
+    ModbusDataType,
+    ModbusDeadlineError,
+    ModbusTCPResiliente,
+    Priority,
+    RequestScheduler,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestRequestScheduler(unittest.TestCase):
+    def setUp(self) -> None:
+        self.client = ModbusTCPResiliente(host="127.0.0.1", log_file=None, retry_delay=0.0)
+        self.fake = FakeModbusClient(holding={i: i for i in range(200)}, coils={5: False})
+        self.client.client = self.fake
+        self.clock = FakeClock()
+        self.scheduler = RequestScheduler(self.client, clock=self.clock)
+
+    def data_requests(self):
+        return [r for r in self.fake.requests if r[1] != 0]
+
+    def test_urgent_writes_jump_ahead_of_bulk_reads(self) -> None:
+        reads = [self.scheduler.bulk("read_holding_registers_safe", 10 * i + 10, 10) for i in range(5)]
+        alarm = self.scheduler.submit("read_coils_safe", 5, 1, priority=Priority.ALARM)
+        write = self.scheduler.urgent("write_holding_typed_safe", 150, 7, ModbusDataType.UINT16)
+
+        self.assertEqual(7, self.scheduler.run_pending())
+        self.assertTrue(write.result())
+        self.assertEqual([False], alarm.result())
+        self.assertEqual(list(range(20, 30)), reads[1].result())
+        order = [r[0] for r in self.data_requests()]
+        self.assertEqual(["w_hr", "c"] + ["hr"] * 5, order)
+
+    def test_expired_requests_are_dropped(self) -> None:
+        stale = self.scheduler.bulk("read_holding_registers_safe", 40, 10, timeout=1.0)
+        fresh = self.scheduler.bulk("read_holding_registers_safe", 20, 10, timeout=10.0)
+        self.clock.now += 2.0
+
+        self.assertEqual(1, self.scheduler.run_pending())
+        with self.assertRaises(ModbusDeadlineError):
+            stale.result()
+        self.assertEqual(list(range(20, 30)), fresh.result())
+        self.assertEqual([("hr", 20, 10)], self.data_requests())
+
+        bulk = self.scheduler.stats()["classes"]["bulk"]
+        self.assertEqual((2, 1, 1), (bulk["submitted"], bulk["executed"], bulk["dropped"]))
+        self.assertAlmostEqual(2.0, bulk["avg_delay"])
+        self.assertAlmostEqual(2.0, bulk["max_delay"])
+
+    def test_worker_thread_serializes_requests(self) -> None:
+        self.scheduler = RequestScheduler(self.client)
+        active = []
+        overlap = []
+        lock = threading.Lock()
+        read = self.fake.read_holding_registers
+
+        def tracked(addr, count=1):
+            with lock:
+                active.append(addr)
+                if len(active) > 1:
+                    overlap.append(addr)
+            try:
+                return read(addr, count)
+            finally:
+                with lock:
+                    active.remove(addr)
+
+        self.fake.read_holding_registers = tracked
+        with self.scheduler:
+            futures = [self.scheduler.submit("read_holding_registers_safe", i, 1) for i in range(50)]
+            results = [f.result(timeout=5) for f in futures]
+        self.assertEqual([[i] for i in range(50)], results)
+        self.assertEqual([], overlap)
+
+    def test_stop_cancels_pending(self) -> None:
+        future = self.scheduler.submit("read_holding_registers_safe", 0, 1)
+        self.scheduler.stop()
+        self.assertTrue(future.cancelled())
+        self.assertEqual(0, self.scheduler.stats()["queued"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+import socket
+import struct
+import time
+import unittest
+
+from pyModbusTCPtools import ModbusDataType, ModbusTCPResiliente
+from pyModbusTCPtools.simulator import Fault, ModbusSimulator, SimulatedDevice
+
+
+class TestModbusSimulator(unittest.TestCase):
+    def setUp(self) -> None:
+        self.sim = ModbusSimulator()
+
+    def tearDown(self) -> None:
+        self.sim.stop()
+
+    def client_for(self, device, **kwargs):
+        kwargs.setdefault("timeout", 0.3)
+        return ModbusTCPResiliente(
+            host=device.host, port=device.port, log_file=None,
+            retry_delay=0.02, max_retry_delay=0.05, **kwargs
+        )
+
+    def read_until_ok(self, client, deadline=3.0):
+        end = time.monotonic() + deadline
+        while time.monotonic() < end:
+            if client.read_holding_registers_safe(10, 2) is not None:
+                return time.monotonic()
+        self.fail("cliente não se recuperou")
+
+    def test_roundtrip_with_both_backends(self) -> None:
+        device = self.sim.add_device(size=200)
+        self.sim.start()
+        for backend in ("pymodbustcp", "native"):
+            client = self.client_for(device, backend=backend)
+            self.assertTrue(client.write_holding_typed_safe(20, 3.5, ModbusDataType.FLOAT32))
+            self.assertEqual(3.5, client.read_holding_typed_safe(20, ModbusDataType.FLOAT32))
+            self.assertTrue(client.write_multiple_coils_safe(5, [True, False, True]))
+            self.assertEqual([True, False, True], client.read_coils_safe(5, 3))
+            self.assertEqual([9, 8], client.write_read_multiple_registers_safe(30, [9, 8], 30, 2))
+            client.close()
+        self.assertEqual(2, device.stats.connections)
+        self.assertGreater(device.stats.pings, 0)
+
+    def test_illegal_address_is_quarantined(self) -> None:
+        device = self.sim.add_device(size=100, faults=[Fault("illegal_address", 0, 60, addr_range=(40, 50))])
+        self.sim.start()
+        client = self.client_for(device)
+        for _ in range(5):
+            self.assertIsNone(client.read_holding_registers_safe(45, 1))
+        self.assertEqual(1, device.stats.exceptions)
+        self.assertEqual(1, device.stats.connections)
+
+    def test_outage_recovery(self) -> None:
+        device = self.sim.add_device(faults=[Fault("outage", 0.0, 0.4)])
+        self.sim.start()
+        client = self.client_for(device)
+        self.assertIsNone(client.read_holding_registers_safe(10, 2))
+        recovered = self.read_until_ok(client) - self.sim.started_at
+        self.assertGreaterEqual(recovered, 0.4)
+        self.assertLess(recovered, 1.5)
+        self.assertEqual(1, device.stats.connections)
+
+    def test_half_open_socket_times_out_and_reconnects(self) -> None:
+        device = self.sim.add_device(faults=[Fault("half_open", 0.0, 0.5)])
+        self.sim.start()
+        client = self.client_for(device, timeout=0.2)
+        self.assertIsNone(client.read_holding_registers_safe(10, 2))
+        self.read_until_ok(client)
+        self.assertGreater(device.stats.discarded, 0)
+        self.assertGreaterEqual(device.stats.connections, 2)
+
+    def test_slow_responses(self) -> None:
+        device = self.sim.add_device(faults=[Fault("slow", 0.0, 60.0, delay=0.05)])
+        self.sim.start()
+        client = self.client_for(device)
+        started = time.monotonic()
+        self.assertEqual([0, 0], client.read_holding_registers_safe(10, 2))
+        self.assertGreaterEqual(time.monotonic() - started, 0.1)  # ping + leitura
+        self.assertEqual(2, device.stats.delayed)
+
+    def test_truncated_mbap_drops_connection(self) -> None:
+        device = self.sim.add_device()
+        self.sim.start()
+        for length in (0, 1):
+            with socket.create_connection((device.host, device.port), timeout=1.0) as sock:
+                sock.sendall(struct.pack(">HHHB", 1, 0, length, 1))
+                self.assertEqual(b"", sock.recv(64))
+        self.assertEqual(2, device.stats.discarded)
+        # o servidor continua atendendo
+        client = self.client_for(device)
+        self.assertEqual([0, 0], client.read_holding_registers_safe(10, 2))
+        self.assertEqual(b"\x80\x01", device.handle(b"", 0.0))
+
+    def test_malformed_write_pdus_get_exception_03(self) -> None:
+        device = SimulatedDevice(size=100)
+        frames = [
+            bytes((15, 0, 0, 0, 16, 2)),                     # FC15 sem os 2 bytes de dados
+            bytes((15, 0, 0, 0, 16, 1, 0xFF, 0xFF)),          # byte count menor que a quantidade
+            bytes((16, 0, 0, 0, 2, 4, 0, 1)),                 # FC16 com dados truncados
+            bytes((23, 0, 0, 0, 1, 0, 0, 0, 2, 4, 0, 1)),     # FC23 com dados truncados
+        ]
+        for pdu in frames:
+            self.assertEqual(bytes((pdu[0] | 0x80, 3)), device.handle(pdu, 0.0), pdu)
+        self.assertEqual(bytes((15, 0, 0, 0, 9)), device.handle(bytes((15, 0, 0, 0, 9, 2, 0xFF, 0x01)), 0.0))
+        self.assertEqual([1] * 9, list(device.coils[:9]))
+
+    def test_handler_error_drops_only_that_connection(self) -> None:
+        broken = self.sim.add_device()
+        healthy = self.sim.add_device()
+        broken.handle = lambda pdu, elapsed: pdu[99]
+        self.sim.start()
+        with socket.create_connection((broken.host, broken.port), timeout=1.0) as sock:
+            sock.sendall(struct.pack(">HHHBBHH", 1, 0, 6, 1, 3, 0, 1))
+            self.assertEqual(b"", sock.recv(64))
+        self.assertEqual(1, broken.stats.discarded)
+        client = self.client_for(healthy)
+        self.assertEqual([0, 0], client.read_holding_registers_safe(10, 2))
+
+    def test_unknown_fault(self) -> None:
+        with self.assertRaises(ValueError):
+            SimulatedDevice(faults=[Fault("meteor", 0, 1)])
+
+
+if __name__ == "__main__":
+    unittest.main()
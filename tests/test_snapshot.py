@@ -0,0 +1,93 @@
+import unittest
+
+from fake_client import FakeModbusClient
+
+from pyModbusTCPtools import ModbusTCPResiliente, compile_read_plan
+from pyModbusTCPtools.tagmap import Tag
+
+SEQ = 500
+
+
+class ScanningClient(FakeModbusClient):
+    """Incrementa o contador de ciclo antes das leituras de dados indicadas."""
+
+    def __init__(self, scan_before=(), **kwargs):
+        super().__init__(**kwargs)
+        self.scan_before = set(scan_before)
+        self.data_reads = 0
+
+    def _read(self, table, name, addr, count):
+        if addr not in (0, SEQ):
+            self.data_reads += 1
+            if self.data_reads in self.scan_before:
+                self.holding[SEQ] += 1
+        return super()._read(table, name, addr, count)
+
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self) -> None:
+        self.client = ModbusTCPResiliente(host="127.0.0.1", log_file=None, retry_delay=0.0)
+        self.holding = {0: 0, SEQ: 10, 10: 1, 11: 2, 20: 3, 30: 4}
+        self.blocks = [("hr", 10, 2), ("hr", 20, 1), ("hr", 30, 1)]
+
+    def use(self, fake):
+        self.client.client = fake
+        return fake
+
+    def test_timestamps_and_latency_without_counter(self) -> None:
+        fake = self.use(FakeModbusClient(holding=self.holding))
+        snap = self.client.read_snapshot_safe(self.blocks)
+        self.assertTrue(snap.consistent)
+        self.assertEqual(3, snap.requests)
+        self.assertEqual([[1, 2], [3], [4]], [b.data for b in snap.blocks])
+        self.assertTrue(all(b.timestamp > 0 and b.latency >= 0 for b in snap.blocks))
+        self.assertGreaterEqual(snap.spread, 0.0)
+        self.assertEqual(3, len([r for r in fake.requests if r[1] != 0]))
+
+    def test_counter_brackets_blocks(self) -> None:
+        self.use(ScanningClient(holding=self.holding))
+        snap = self.client.read_snapshot_safe(self.blocks, seq_addr=SEQ)
+        self.assertTrue(snap.consistent)
+        self.assertEqual(10, snap.sequence)
+        self.assertEqual(0, snap.retried_blocks)
+        self.assertEqual(3 + 4, snap.requests)
+
+    def test_only_stale_blocks_are_reread(self) -> None:
+        # ciclo do CLP termina durante o primeiro bloco: só ele é relido
+        fake = self.use(ScanningClient(scan_before={1}, holding=self.holding))
+        snap = self.client.read_snapshot_safe(self.blocks, seq_addr=SEQ)
+        self.assertTrue(snap.consistent)
+        self.assertEqual(11, snap.sequence)
+        self.assertEqual(1, snap.retried_blocks)
+        self.assertEqual([2, 1, 1], [b.attempts for b in snap.blocks])
+        self.assertTrue(snap.blocks[0].matches(11))
+        data_reads = [r[1] for r in fake.requests if r[1] not in (0, SEQ)]
+        self.assertEqual([10, 20, 30, 10], data_reads)
+
+    def test_stale_blocks_before_boundary_are_reread(self) -> None:
+        fake = self.use(ScanningClient(scan_before={3}, holding=self.holding))
+        snap = self.client.read_snapshot_safe(self.blocks, seq_addr=SEQ)
+        self.assertTrue(snap.consistent)
+        self.assertEqual([2, 2, 2], [b.attempts for b in snap.blocks])
+        self.assertEqual(6, len([r for r in fake.requests if r[1] not in (0, SEQ)]))
+
+    def test_gives_up_after_max_retries(self) -> None:
+        self.use(ScanningClient(scan_before=set(range(1, 50)), holding=self.holding))
+        snap = self.client.read_snapshot_safe(self.blocks, seq_addr=SEQ, max_retries=1)
+        self.assertFalse(snap.consistent)
+        self.assertTrue(all(b.torn for b in snap.blocks))
+        self.assertEqual(3, len(snap.inconsistent_blocks))
+
+    def test_failed_block_and_plan_values(self) -> None:
+        self.use(ScanningClient(holding=self.holding))
+        plan = compile_read_plan([Tag("a", "hr", 10), Tag("b", "hr", 11, scale=0.5), Tag("x", "hr", 40)])
+        snap = self.client.read_snapshot_safe(plan, seq_addr=SEQ)
+        self.assertFalse(snap.ok)
+        self.assertFalse(snap.consistent)
+        self.assertEqual({"a": 1, "b": 1.0, "x": None}, snap.values)
+        self.assertEqual([], snap.inconsistent_blocks)
+        self.assertEqual(2, len(snap.to_dict()["blocks"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
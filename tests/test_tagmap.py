@@ -0,0 +1,129 @@
+import json
+import os
+import tempfile
+import unittest
+
+from fake_client import FakeModbusClient
+
+from pyModbusTCPtools import (
+    Endian,
+    ModbusDataType,
+    ModbusTagMapError,
+    ModbusTCPResiliente,
+    Tag,
+    compile_read_plan,
+    load_read_plan,
+    load_tag_map,
+)
+
+CSV_MAP = """name,area,addr,dtype,endian,scale,offset,scan_rate
+temp,hr,0,int16,be,0.1,,1
+flow,hr,1,float32,be,,,1
+total,hr,3,uint32,le,,,1
+alarm,c,10,,,,,0.5
+speed,ir,5,uint16,,2,1,1
+"""
+
+
+class TestTagMap(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "tags.csv")
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(CSV_MAP)
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_load_csv(self) -> None:
+        tags = load_tag_map(self.path)
+        self.assertEqual(5, len(tags))
+        flow = tags[1]
+        self.assertEqual(ModbusDataType.FLOAT32, flow.dtype)
+        self.assertEqual(2, flow.count)
+        self.assertEqual(Endian.LE, tags[2].endian)
+
+    def test_load_json(self) -> None:
+        path = os.path.join(self.tmp.name, "tags.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"tags": [{"name": "a", "area": "hr", "addr": 4, "dtype": "FLOAT64"}]}, f)
+        tags = load_tag_map(path)
+        self.assertEqual(ModbusDataType.FLOAT64, tags[0].dtype)
+
+    def test_contiguous_blocks_are_merged(self) -> None:
+        plan = compile_read_plan(load_tag_map(self.path))
+        hr = [b for b in plan.blocks if b.area == "hr"]
+        self.assertEqual(1, len(hr))
+        self.assertEqual((0, 5), (hr[0].addr, hr[0].count))
+        self.assertEqual(3, len(plan.blocks))
+
+    def test_gap_and_block_limit(self) -> None:
+        tags = [Tag("a", "hr", 0), Tag("b", "hr", 3), Tag("c", "hr", 124), Tag("d", "hr", 125)]
+        self.assertEqual(3, len(compile_read_plan(tags).blocks))
+        merged = compile_read_plan(tags, max_gap=200)
+        self.assertEqual([(0, 125), (125, 1)], [(b.addr, b.count) for b in merged.blocks])
+
+    def test_scan_rates_are_not_merged(self) -> None:
+        plan = compile_read_plan([Tag("a", "hr", 0, scan_rate=1), Tag("b", "hr", 1, scan_rate=5)])
+        self.assertEqual([1, 5], plan.scan_rates)
+        self.assertEqual(1, len(plan.blocks_for(5)))
+
+    def test_overlap_is_rejected(self) -> None:
+        tags = [Tag("a", "hr", 0, ModbusDataType.FLOAT32), Tag("b", "hr", 1)]
+        with self.assertRaises(ModbusTagMapError):
+            compile_read_plan(tags)
+
+    def test_duplicate_and_invalid_fields(self) -> None:
+        with self.assertRaises(ModbusTagMapError):
+            compile_read_plan([Tag("a", "hr", 0), Tag("a", "ir", 0)])
+        path = os.path.join(self.tmp.name, "bad.csv")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("name,area,addr,dtype\nx,hr,1,float16\n")
+        with self.assertRaises(ModbusTagMapError):
+            load_tag_map(path)
+
+    def test_plan_cache_roundtrip(self) -> None:
+        cache_dir = os.path.join(self.tmp.name, "cache")
+        plan = load_read_plan(self.path, cache_dir=cache_dir)
+        self.assertEqual(1, len(os.listdir(cache_dir)))
+        cached = load_read_plan(self.path, cache_dir=cache_dir)
+        self.assertEqual(plan.to_dict(), cached.to_dict())
+
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("extra,hr,50,,,,,1\n")
+        self.assertIn("extra", load_read_plan(self.path, cache_dir=cache_dir).tags)
+        self.assertEqual(2, len(os.listdir(cache_dir)))
+
+    def test_unwritable_cache_dir_still_returns_plan(self) -> None:
+        blocker = os.path.join(self.tmp.name, "not_a_dir")
+        with open(blocker, "w") as fh:
+            fh.write("x")
+        plan = load_read_plan(self.path, cache_dir=os.path.join(blocker, "cache"))
+        self.assertEqual(load_read_plan(self.path).to_dict(), plan.to_dict())
+
+    def test_read_plan_safe_decodes_and_scales(self) -> None:
+        client = ModbusTCPResiliente(host="127.0.0.1", log_file=None)
+        flow = client._float32_to_regs(12.5, Endian.BE)
+        total = client._uint32_to_regs(70000, Endian.LE)
+        client.client = FakeModbusClient(
+            holding={0: client._int16_to_reg(-250), 1: flow[0], 2: flow[1], 3: total[0], 4: total[1]},
+            inputs={5: 10},
+            coils={10: True},
+        )
+        plan = compile_read_plan(load_tag_map(self.path))
+
+        values = client.read_plan_safe(plan)
+        self.assertAlmostEqual(-25.0, values["temp"])
+        self.assertEqual(12.5, values["flow"])
+        self.assertEqual(70000, values["total"])
+        self.assertEqual(21.0, values["speed"])
+        self.assertIs(True, values["alarm"])
+
+        data_requests = [r for r in client.client.requests if r != ("hr", 0, 1)]
+        self.assertIn(("hr", 0, 5), data_requests)
+
+        self.assertEqual({"alarm"}, set(client.read_plan_safe(plan, scan_rate=0.5)))
+
+
+if __name__ == "__main__":
+    unittest.main()
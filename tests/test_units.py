@@ -0,0 +1,76 @@
+import unittest
+
+from fake_client import FakeModbusClient
+
+from pyModbusTCPtools import ModbusDataType, ModbusTCPResiliente
+
+
+class TestUnitIds(unittest.TestCase):
+    def setUp(self) -> None:
+        self.client = ModbusTCPResiliente(host="127.0.0.1", log_file=None, retry_delay=0.0)
+        self.fake = FakeModbusClient(holding={0: 1, 10: 42, 11: 7})
+        self.client.client = self.fake
+
+    def test_unit_view_shares_connection(self) -> None:
+        seen = []
+        read = self.fake.read_holding_registers
+
+        def spy(addr, count=1):
+            seen.append(self.fake.unit_id)
+            return read(addr, count)
+
+        self.fake.read_holding_registers = spy
+        self.assertEqual(42, self.client.unit(5).read_holding_typed_safe(10, ModbusDataType.UINT16))
+        # ping no unit padrão, requisição no unit da visão, unit restaurado depois
+        self.assertEqual([1, 5], seen)
+        self.assertEqual(1, self.fake.unit_id)
+        self.assertIs(self.client.client, self.client.unit(5).client)
+
+    def test_dead_unit_does_not_close_socket_or_throttle_others(self) -> None:
+        self.fake.dead_units.add(3)
+        self.client.base_retry_delay = 60.0
+        dead = self.client.unit(3)
+
+        self.assertIsNone(dead.read_holding_registers_safe(10, 1))
+        self.assertTrue(self.fake.is_open)
+        self.assertEqual(0, self.client.failure_count)
+        self.assertEqual(1, self.client.get_unit_states_snapshot()[3]["failure_count"])
+        self.assertEqual([], self.client.get_invalid_cache_snapshot())
+
+        # em backoff: nenhuma requisição é enviada ao unit morto
+        sent = len(self.fake.requests)
+        self.assertIsNone(dead.read_holding_registers_safe(10, 1))
+        self.assertEqual(sent, len(self.fake.requests))
+
+        self.assertEqual([42, 7], self.client.unit(4).read_holding_registers_safe(10, 2))
+
+    def test_timeout_on_unit_keeps_connection_backoff(self) -> None:
+        self.fake.timeout_units.add(9)
+        self.assertIsNone(self.client.unit(9).read_holding_registers_safe(10, 1))
+        self.assertEqual(self.client.base_retry_delay, self.client.current_retry_delay)
+        self.assertIn(9, self.client.get_unit_states_snapshot())
+
+    def test_unit_recovers_after_backoff(self) -> None:
+        self.fake.dead_units.add(3)
+        self.assertIsNone(self.client.unit(3).read_holding_registers_safe(10, 1))
+        self.fake.dead_units.clear()
+        self.assertEqual([42], self.client.unit(3).read_holding_registers_safe(10, 1))
+        self.assertEqual(0, self.client.get_unit_states_snapshot()[3]["failure_count"])
+
+    def test_invalid_address_quarantine_is_per_unit(self) -> None:
+        self.assertIsNone(self.client.unit(2).read_holding_registers_safe(500, 1))
+        self.assertEqual([(2, "hr", 500, 1)], [k for k, _ in self.client.get_invalid_cache_snapshot()])
+        self.fake.holding[500] = 9
+        self.assertEqual([9], self.client.unit(4).read_holding_registers_safe(500, 1))
+        self.assertIsNone(self.client.unit(2).read_holding_registers_safe(500, 1))
+
+        self.client.clear_invalid_cache(unit_id=2)
+        self.assertEqual([9], self.client.unit(2).read_holding_registers_safe(500, 1))
+
+    def test_invalid_unit_id(self) -> None:
+        with self.assertRaises(ValueError):
+            self.client.unit(256)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,150 @@
+import unittest
+
+from fake_client import FakeModbusClient
+
+from pyModbusTCPtools import Endian, ModbusDataType, ModbusTCPResiliente
+
+
+class NoFC23Client(FakeModbusClient):
+    def write_read_multiple_registers(self, write_addr, write_values, read_addr, read_nb=1):
+        self.requests.append(("wr_hr", write_addr, len(write_values)))
+        self.last_error = 7
+        self.last_except = 1
+        return None
+
+
+class ClampingClient(FakeModbusClient):
+    """Dispositivo que limita o registrador 20 a 100."""
+
+    def write_multiple_registers(self, addr, values):
+        ok = super().write_multiple_registers(addr, values)
+        if 20 in self.holding:
+            self.holding[20] = min(self.holding[20], 100)
+        return ok
+
+
+class TestVerifiedWrite(unittest.TestCase):
+    def setUp(self) -> None:
+        self.client = ModbusTCPResiliente(host="127.0.0.1", log_file=None, retry_delay=0.0)
+        self.setpoints = [
+            (10, 1.25, ModbusDataType.FLOAT32),
+            (12, -7, ModbusDataType.INT16),
+            (13, 70000, ModbusDataType.UINT32, Endian.LE),
+            (20, 150, ModbusDataType.UINT16),
+        ]
+
+    def use(self, fake):
+        fake.holding.update({0: 0})
+        self.client.client = fake
+        return fake
+
+    def data_requests(self, fake):
+        return [r for r in fake.requests if r[1] != 0]
+
+    def test_fc23_single_round_trip_per_contiguous_run(self) -> None:
+        fake = self.use(FakeModbusClient())
+        report = self.client.write_verified_safe(self.setpoints)
+        self.assertTrue(report.ok)
+        self.assertEqual(("fc23", 4, 2), (report.method, report.verified, report.requests))
+        self.assertEqual([("wr_hr", 10, 5), ("wr_hr", 20, 1)], self.data_requests(fake))
+        self.assertTrue(self.client.fc23_supported)
+
+    def test_fallback_to_fc16_with_batched_readback(self) -> None:
+        fake = self.use(NoFC23Client())
+        report = self.client.write_verified_safe(self.setpoints)
+        self.assertTrue(report.ok)
+        self.assertEqual("fc23+fc16", report.method)
+        self.assertFalse(self.client.fc23_supported)
+        self.assertEqual(
+            [("wr_hr", 10, 5), ("w_hr", 10, 5), ("w_hr", 20, 1), ("hr", 10, 5), ("hr", 20, 1)],
+            self.data_requests(fake),
+        )
+
+        # suporte já conhecido: FC23 não é tentado de novo
+        fake.requests.clear()
+        self.assertTrue(self.client.write_verified_safe([(10, 2, ModbusDataType.UINT16),
+                                                         (11, 3, ModbusDataType.UINT16)]))
+        self.assertEqual([("w_hr", 10, 2), ("hr", 10, 2)], self.data_requests(fake))
+
+    def test_adjacent_runs_share_one_readback(self) -> None:
+        fake = self.use(FakeModbusClient())
+        setpoints = [(100 + i, i, ModbusDataType.UINT16) for i in range(130)]
+        report = self.client.write_verified_safe(setpoints, use_fc23=False)
+        self.assertTrue(report.ok)
+        self.assertEqual(
+            [("w_hr", 100, 123), ("w_hr", 223, 7), ("hr", 100, 125), ("hr", 225, 5)],
+            self.data_requests(fake),
+        )
+
+    def test_single_report_with_mismatches_and_failures(self) -> None:
+        self.use(ClampingClient())
+        setpoints = self.setpoints + [(30, 70000, ModbusDataType.INT16)]
+        report = self.client.write_verified_safe(setpoints, use_fc23=False)
+        self.assertFalse(report.ok)
+        self.assertEqual((5, 3), (report.total, report.verified))
+        self.assertEqual([(20, 150, 100)], [(m.addr, m.expected, m.actual) for m in report.mismatches])
+        self.assertEqual([30], [m.addr for m in report.failed])
+        self.assertEqual(1, len(report.to_dict()["failed"]))
+
+    def test_float_tolerance(self) -> None:
+        self.use(FakeModbusClient())
+        self.assertTrue(self.client.write_verified_safe([(10, 0.1, ModbusDataType.FLOAT32)]))
+        strict = self.client.write_verified_safe([(10, 0.1, ModbusDataType.FLOAT32)], rel_tol=0, abs_tol=0)
+        self.assertEqual(1, len(strict.mismatches))
+
+    def test_overlapping_setpoints_rejected_before_writing(self) -> None:
+        fake = self.use(FakeModbusClient())
+        report = self.client.write_verified_safe([(10, 1.0, ModbusDataType.FLOAT32), (11, 1, ModbusDataType.UINT16)])
+        self.assertFalse(report.ok)
+        self.assertEqual([10, 11], [m.addr for m in report.failed])
+        self.assertIn("sobrepostos", report.failed[0].reason)
+        self.assertEqual([], self.data_requests(fake))
+        self.assertEqual(1, self.client.error_policy.by_error["ModbusConversionError"])
+
+    def test_invalid_setpoint_is_reported(self) -> None:
+        fake = self.use(FakeModbusClient())
+        report = self.client.write_verified_safe([(10, 1, "nope"), (11, 2, ModbusDataType.UINT16), (12,)])
+        self.assertEqual((3, 1), (report.total, report.verified))
+        self.assertEqual([(10, "nope"), (12, None)], [(m.addr, m.dtype) for m in report.failed])
+        self.assertEqual("nope", report.to_dict()["failed"][0]["dtype"])
+        self.assertEqual(2, fake.holding[11])
+
+    def test_dead_device_gives_up_after_first_connection_failure(self) -> None:
+        class DeadClient(FakeModbusClient):
+            opens = 0
+
+            def open(self):
+                self.opens += 1
+                self.is_open = False
+                return False
+
+        setpoints = [(10 * i, i, ModbusDataType.UINT16) for i in range(8)]  # 8 intervalos
+        for use_fc23 in (None, False):
+            fake = self.use(DeadClient())
+            fake.is_open = False
+            report = self.client.write_verified_safe(setpoints, use_fc23=use_fc23)
+            self.assertEqual((1, 8), (report.requests, len(report.failed)), use_fc23)
+            self.assertEqual(1, fake.opens)
+            self.assertEqual(["conexão indisponível"] * 7, [m.reason for m in report.failed[1:]])
+
+    def test_fc23_support_is_per_unit(self) -> None:
+        class MixedGateway(FakeModbusClient):
+            def write_read_multiple_registers(self, write_addr, write_values, read_addr, read_nb=1):
+                if self.unit_id == 7:
+                    return NoFC23Client.write_read_multiple_registers(self, write_addr, write_values, read_addr, read_nb)
+                self.requests.append(("wr_hr", write_addr, len(write_values)))
+                self.write_multiple_registers(write_addr, write_values)
+                return [self.holding[a] for a in range(read_addr, read_addr + read_nb)]
+
+        self.use(MixedGateway())
+        setpoint = [(10, 5, ModbusDataType.UINT16)]
+        self.assertEqual("fc23+fc16", self.client.unit(7).write_verified_safe(setpoint).method)
+        self.assertEqual("fc23", self.client.write_verified_safe(setpoint).method)
+        self.assertEqual("fc16", self.client.unit(7).write_verified_safe(setpoint).method)
+        self.assertTrue(self.client.fc23_supported)
+        self.assertFalse(self.client.unit(7).fc23_supported)
+        self.assertFalse(self.client.get_unit_states_snapshot()[7]["fc23_supported"])
+
+
+if __name__ == "__main__":
+    unittest.main()